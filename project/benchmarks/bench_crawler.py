@@ -0,0 +1,87 @@
+"""``Crawler`` throughput and memory on a generated site far larger than the page budget.
+
+    python -m benchmarks.bench_crawler --pages 200000 --max-pages 2000 --concurrency 8
+
+The site (``benchmarks.stubs.GeneratedSite``) runs on loopback in its own
+process: every page links to ``--fanout`` further pages, and the home page
+carries a script with API calls, forms and a link to a backup archive. The
+crawl is run with the budgets given on the command line; the report shows
+pages per second, what was found, the size of the duplicate filter and how
+much the process grew while crawling.
+"""
+import argparse
+import asyncio
+import resource
+import sys
+import tempfile
+import time
+
+from benchmarks.stubs import GeneratedSite, make_self_signed_cert, start_targets_process
+
+
+def rss_mib() -> float:
+    """Current resident set size, read from /proc where available (peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return round(int(statm.read().split()[1]) * resource.getpagesize() / 1024 / 1024, 1)
+    except OSError:
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(usage / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+async def crawl(port: int, args) -> dict:
+    from src.services.crawler import Crawler
+    from src.services.http_client import http_client
+
+    crawler = Crawler("127.0.0.1", max_pages=args.max_pages, max_depth=args.max_depth, concurrency=args.concurrency,
+                      seen_capacity=args.seen_capacity, time_budget=args.time_budget)
+    await http_client.start()
+    before = rss_mib()
+    started = time.perf_counter()
+    result = await crawler.crawl([f"http://127.0.0.1:{port}/"])
+    elapsed = time.perf_counter() - started
+    after = rss_mib()
+    await http_client.close()
+    return {
+        "pages": result.pages,
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(result.pages / elapsed, 1),
+        "urls_seen": result.urls_seen,
+        "out_of_budget": result.out_of_budget,
+        "api_endpoints": len(result.api_endpoints),
+        "file_exposure": [item["url"] for item in result.file_exposure],
+        "forms": len(result.forms),
+        "forms_missing_token": sum(form["missing_token"] for form in result.forms),
+        "seen_filter_kib": round(len(crawler.seen.bits) / 1024, 1),
+        "rss_growth_mib": round(after - before, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200000, help="pages on the generated site")
+    parser.add_argument("--fanout", type=int, default=10, help="links to further pages on every page")
+    parser.add_argument("--max-pages", type=int, default=2000)
+    parser.add_argument("--max-depth", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seen-capacity", type=int, default=100000)
+    parser.add_argument("--time-budget", type=float, default=300.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the site waits per request")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = make_self_signed_cert(["localhost"], directory)
+        process, ports = start_targets_process(certfile, keyfile, GeneratedSite(args.pages, args.fanout), args.latency)
+        try:
+            report = asyncio.run(crawl(ports["http"], args))
+        finally:
+            process.terminate()
+
+    print(f"site of {args.pages} pages, budget {args.max_pages} pages / depth {args.max_depth}, "
+          f"concurrency {args.concurrency}")
+    for name, value in report.items():
+        print(f"  {name:<22} {value}")
+
+
+if __name__ == "__main__":
+    main()
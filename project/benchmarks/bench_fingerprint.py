@@ -0,0 +1,111 @@
+"""Fingerprinting throughput on large HTML bodies: indexed engine vs running every pattern.
+
+    python -m benchmarks.bench_fingerprint --size 1048576 --extra 1000
+
+The bundled signatures are extended with ``--extra`` synthetic technologies
+(an ``html`` and a ``scriptSrc`` pattern each) to model a full-size
+signature database. The baseline runs every body and script pattern against
+the response one by one; both must detect the same technologies.
+"""
+import argparse
+import json
+import random
+import string
+import sys
+import time
+
+from src.services.fingerprinter import DEFAULT_SIGNATURES, FingerprintEngine, _SCRIPT_SRC
+
+HEADERS = {"Server": "nginx/1.24.0", "X-Powered-By": "PHP/8.2.12"}
+COOKIES = {"PHPSESSID": "abc"}
+MARKERS = (
+    '<meta name="generator" content="WordPress 6.4.2">'
+    '<link rel="stylesheet" href="/wp-content/themes/site/style.css?ver=6.4.2">'
+    '<script src="https://code.jquery.com/jquery-3.7.1.min.js"></script>'
+    '<script src="https://www.googletagmanager.com/gtag/js?id=G-1"></script>'
+)
+
+
+def signatures(extra: int) -> dict:
+    with open(DEFAULT_SIGNATURES) as bundled:
+        technologies = json.load(bundled)["technologies"]
+    for i in range(extra):
+        technologies[f"Synthetic {i}"] = {
+            "cats": ["javascript_library"],
+            "html": [rf'<div[^>]+class="synth{i}-widget'],
+            "scriptSrc": [rf"/synth{i}/lib-([\d.]+)\.js\;version:\1"],
+        }
+    return technologies
+
+
+def build_body(size: int, extra: int, seed: int = 1) -> str:
+    """Realistic-looking markup with a few known technologies and a handful of synthetic ones."""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(4000)]
+    present = rng.sample(range(extra), min(extra, 5))
+    parts = ["<html><head>", MARKERS]
+    parts += [f'<script src="/synth{i}/lib-1.{i}.js"></script><div class="synth{i}-widget">' for i in present]
+    parts.append("</head><body>")
+    length = sum(map(len, parts))
+    while length < size:
+        words = " ".join(rng.choices(vocabulary, k=12))
+        chunk = (f'<div class="{rng.choice(vocabulary)} {rng.choice(vocabulary)}"><a href="/{rng.choice(vocabulary)}/'
+                 f'{rng.choice(vocabulary)}-{rng.randint(1, 999)}.html">{words}</a></div>\n')
+        parts.append(chunk)
+        length += len(chunk)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def naive(engine: FingerprintEngine, body: str) -> set:
+    """Runs every body and script pattern on its own, like a signature loop without an index."""
+    found = set()
+    sources = _SCRIPT_SRC.findall(body)
+    for group in (engine.html, engine.script_src):
+        patterns = list(group.unanchored) + [p for ps in group.anchored.values() for p in ps]
+        for pattern in patterns:
+            values = [body] if group is engine.html else sources
+            if any(pattern.match(value) for value in values):
+                found.add(pattern.technology)
+    return found
+
+
+def measure(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1024 * 1024, help="HTML body size in bytes")
+    parser.add_argument("--extra", type=int, default=1000, help="synthetic technologies added to the signatures")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    engine = FingerprintEngine(signatures(args.extra))
+    compile_time = time.perf_counter() - started
+    body = build_body(args.size, args.extra)
+
+    detections = engine.analyze(HEADERS, body, COOKIES)
+    indexed = measure(lambda: engine.analyze(HEADERS, body, COOKIES), args.repeat)
+
+    started = time.perf_counter()
+    expected = naive(engine, body)
+    baseline = time.perf_counter() - started  # Once: it takes seconds
+    missing = expected - {d.name for d in detections}
+    print(f"{engine.pattern_count()} patterns compiled in {compile_time * 1000:.0f} ms; body {len(body) / 1024:.0f} KiB")
+    print(f"every pattern:  {baseline * 1000:8.1f} ms per response")
+    print(f"indexed engine: {indexed * 1000:8.1f} ms per response ({baseline / indexed:.1f}x faster)")
+    print("detected: " + ", ".join(f"{d.name} {d.version or ''}".strip() for d in detections if d.implied_by is None))
+    if missing:
+        print(f"FAIL: the engine missed {sorted(missing)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Cold import time of the API (``src.main``) measured with ``python -X importtime``.
+
+    python -m benchmarks.bench_importtime --runs 5 --max-ms 2000
+
+Each run imports the module in a fresh interpreter. The best run is compared
+with ``--max-ms``, and the run also fails if any of the heavy optional
+dependencies, which must only load when a scan stage or report needs them,
+was imported at startup. Exits with status 1 on a regression, so it can
+gate CI.
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Loaded on first use only: PDF rendering/parsing, WHOIS and the old scanner dependencies.
+LAZY_MODULES = ("reportlab", "pdfplumber", "matplotlib", "PIL", "whois", "nmap", "OpenSSL", "cryptography", "bs4")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_CHECK = "import sys, {module}; print(','.join(m for m in {lazy!r} if m in sys.modules))"
+
+
+def import_times(module: str) -> Tuple[int, Dict[str, int]]:
+    """Imports ``module`` in a fresh interpreter; returns its cumulative time and self time per top-level package (us)."""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True).stderr
+    total, packages = 0, defaultdict(int)
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, name = match.groups()
+        packages[name.split(".")[0]] += int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+    return total, packages
+
+
+def eagerly_loaded(module: str) -> List[str]:
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", _CHECK.format(module=module, lazy=LAZY_MODULES)],
+                            capture_output=True, text=True, check=True).stdout.strip()
+    return output.split(",") if output else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=2000, help="fail when the best run is slower")
+    parser.add_argument("--top", type=int, default=10, help="packages to list by self time")
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = [total / 1000 for total, _ in runs]
+    best, packages = min(runs, key=lambda run: run[0])
+
+    print(f"import {args.module}: best {min(totals):.0f} ms, median {statistics.median(totals):.0f} ms "
+          f"over {args.runs} runs (threshold {args.max_ms:.0f} ms)")
+    print("heaviest packages in the best run (self time):")
+    for name, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {name:<24} {self_us / 1000:8.1f} ms")
+
+    failed = False
+    loaded = eagerly_loaded(args.module)
+    if loaded:
+        print(f"FAIL: imported at startup but should load lazily: {', '.join(loaded)}")
+        failed = True
+    if min(totals) > args.max_ms:
+        print(f"FAIL: best import time {min(totals):.0f} ms exceeds {args.max_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""End-to-end ``Scanner`` throughput against local stand-ins for DNS, HTTP(S) and WHOIS.
+
+    python -m benchmarks.bench_scanner --scans 50 --concurrency 10 --latency 0.005
+    python -m benchmarks.bench_scanner --compare bench-scanner-<commit>.json
+
+Every scan runs all stages against loopback: the stub DNS server answers for
+the targets and their subdomains, one HTTP and one HTTPS server (self-signed
+certificate, trusted through ``SSL_CERT_FILE``) plus extra open ports stand
+in for the hosts, and a fake WHOIS server answers WHOIS queries. The stand-ins
+run in their own processes. Results go to a temporary SQLite database.
+
+The report lists scans per second, scan and per-stage latency percentiles and
+peak RSS, and is written as JSON (``--output``) so runs on different commits
+can be compared with ``--compare``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from benchmarks.stubs import make_self_signed_cert, start_dns_process, start_targets_process
+
+SUBDOMAINS = ("www", "api", "mail")
+ROUTES = {
+    "/": b"<html><head><title>stub</title></head><body><a href='/api/v1/users'>users</a>"
+         b"<form method='post' action='/login'><input name='user'></form></body></html>",
+    "/api/v1/resource": b'{"ok": true}',
+    "/api/v1/users": b'{"users": []}',
+}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p90/p99 and max, in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    return {name: round(value * 1000, 2) for name, value in
+            (("p50", rank(50)), ("p90", rank(90)), ("p99", rank(99)), ("max", ordered[-1]))}
+
+
+def peak_rss_mib() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(usage / 1024 / (1024 if sys.platform == "darwin" else 1), 1)  # bytes on macOS, KiB on Linux
+
+
+def configure(directory: str, dns_port: int, ports: dict, certfile: str, wordlist: str):
+    """Points the application settings at the stand-ins; must run before ``src`` is imported."""
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'bench.db')}",
+        "REPORT_PATH": os.path.join(directory, "reports"),
+        "DNS_NAMESERVERS": "127.0.0.1",
+        "DNS_PORT": str(dns_port),
+        "SCAN_HTTP_PORT": str(ports["http"]),
+        "SCAN_HTTPS_PORT": str(ports["https"]),
+        "WHOIS_SERVER": f"127.0.0.1:{ports['whois']}",
+        "PORT_SCAN_PORTS": ",".join(["top-100", *map(str, ports["open"])]),
+        "SUBDOMAIN_WORDLIST": wordlist,
+        "SSL_CERT_FILE": certfile,
+    })
+
+
+async def run_scans(domains: List[str], concurrency: int) -> dict:
+    from src.database import async_session
+    from src.database.init_db import init_db
+    from src.models.scan import Scan
+    from src.services.http_client import http_client
+    from src.services.scanner import Scanner
+    from src.services.status_writer import status_writer
+
+    await init_db()
+    scans = [(str(uuid.uuid4()), domain) for domain in domains]
+    async with async_session() as session:
+        async with session.begin():
+            session.add_all(Scan(id=scan_id, domain=domain, status="pending", progress=0) for scan_id, domain in scans)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    scan_times, stage_times, stage_statuses, failed = [], defaultdict(list), defaultdict(Counter), 0
+
+    async def run(scan_id: str, domain: str):
+        nonlocal failed
+        async with semaphore:
+            scanner = Scanner(domain, scan_id)
+            started = time.perf_counter()
+            try:
+                await scanner.start()
+            except Exception:
+                failed += 1
+                return
+            scan_times.append(time.perf_counter() - started)
+            for name, outcome in scanner.stage_outcomes.items():
+                stage_times[name].append(outcome.duration)
+                stage_statuses[name][outcome.status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run(scan_id, domain) for scan_id, domain in scans))
+    elapsed = time.perf_counter() - started
+    await status_writer.close()
+    await http_client.close()
+
+    return {
+        "scans": len(scans),
+        "failed": failed,
+        "wall_seconds": round(elapsed, 3),
+        "scans_per_second": round(len(scan_times) / elapsed, 2),
+        "scan_latency_ms": percentiles(scan_times),
+        "stages": {name: {"latency_ms": percentiles(times), "statuses": dict(stage_statuses[name])}
+                   for name, times in stage_times.items()},
+    }
+
+
+def print_report(report: dict, previous: Optional[dict] = None):
+    def delta(new, old):
+        return f" ({(new - old) / old * 100:+.0f}%)" if old else ""
+
+    old = previous or {}
+    print(f"{report['scans']} scans ({report['failed']} failed) at concurrency {report['config']['concurrency']}: "
+          f"{report['scans_per_second']} scans/s{delta(report['scans_per_second'], old.get('scans_per_second'))}, "
+          f"peak RSS {report['peak_rss_mib']} MiB{delta(report['peak_rss_mib'], old.get('peak_rss_mib'))}")
+    rows = [("scan", report["scan_latency_ms"], {}, old.get("scan_latency_ms", {}))]
+    rows += [(name, stage["latency_ms"], stage["statuses"], old.get("stages", {}).get(name, {}).get("latency_ms", {}))
+             for name, stage in report["stages"].items()]
+    print(f"{'stage':<20} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10}  statuses")
+    for name, latency, statuses, old_latency in rows:
+        print(f"{name:<20} {latency.get('p50', 0):>10.1f} {latency.get('p90', 0):>10.1f} {latency.get('p99', 0):>10.1f}"
+              f"  {', '.join(f'{status}={count}' for status, count in statuses.items())}"
+              f"{delta(latency.get('p50', 0), old_latency.get('p50'))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scans", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10, help="scans running at the same time")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the HTTP and WHOIS stand-ins wait per request")
+    parser.add_argument("--open-ports", type=int, default=5, help="extra ports accepting connections on the target")
+    parser.add_argument("--words", type=int, default=500, help="subdomain wordlist size")
+    parser.add_argument("--output", help="JSON report path (default bench-scanner-<commit>.json)")
+    parser.add_argument("--compare", help="previous JSON report to show changes against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    domains = [f"site{i}.test" for i in range(args.scans)]
+    with tempfile.TemporaryDirectory() as directory:
+        wordlist = os.path.join(directory, "words.txt")
+        with open(wordlist, "w") as out:
+            out.write("\n".join([*SUBDOMAINS, *(f"miss{i}" for i in range(max(0, args.words - len(SUBDOMAINS))))]))
+        records = {domain: "127.0.0.1" for domain in domains}
+        records.update({f"{sub}.{domain}": "127.0.0.1" for domain in domains for sub in SUBDOMAINS})
+        certfile, keyfile = make_self_signed_cert(domains, directory)
+
+        dns_process, dns_port = start_dns_process(records)
+        targets_process, ports = start_targets_process(certfile, keyfile, ROUTES, args.latency, args.open_ports)
+        try:
+            configure(directory, dns_port, ports, certfile, wordlist)
+            results = asyncio.run(run_scans(domains, args.concurrency))
+        finally:
+            dns_process.terminate()
+            targets_process.terminate()
+
+    report = {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "config": vars(args),
+        **results,
+        "peak_rss_mib": peak_rss_mib(),
+    }
+    previous = None
+    if args.compare:
+        with open(args.compare) as previous_file:
+            previous = json.load(previous_file)
+    print_report(report, previous)
+
+    output = args.output or f"bench-scanner-{(commit or 'unknown')[:8]}.json"
+    with open(output, "w") as out:
+        json.dump(report, out, indent=2)
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Scan result serialization: the old convert-then-json.dumps path vs ``src.utils.serialization``.
+
+    python -m benchmarks.bench_serialization --subdomains 50000 --endpoints 10000
+
+The old path converted the results dict recursively three times (report,
+twice in ``Scanner.start``) and ran ``json.dumps`` on the report and on the
+completion payload. The new path encodes the typed results once for the
+report and once more, split per stage, for the websocket partials.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from src.models.results import Fingerprint, ScanResults, TLSInfo
+from src.utils.serialization import dumps, orjson
+
+
+def build_results(subdomains: int, endpoints: int) -> ScanResults:
+    now = datetime.utcnow()
+    return ScanResults(
+        fingerprint=Fingerprint("nginx", "Django", "Python"),
+        network="Reachable",
+        dns=[f"10.0.{i // 256}.{i % 256}" for i in range(64)],
+        whois={"domain_name": "bench.test", "creation_date": now - timedelta(days=4000),
+               "expiration_date": now + timedelta(days=300), "name_servers": ["ns1.bench.test", "ns2.bench.test"]},
+        ssl_tls=TLSInfo(("TLS_AES_256_GCM_SHA384", "TLSv1.3", 256), "TLSv1.3",
+                        {"subject": ((("commonName", "bench.test"),),), "notAfter": "Jan  1 00:00:00 2030 GMT"}),
+        open_ports=list(range(1, 1025)),
+        subdomains=[f"host-{i}.bench.test" for i in range(subdomains)],
+        api_endpoints=[{"url": f"https://bench.test/api/v1/items/{i}", "status": 200, "seen_at": now}
+                       for i in range(endpoints)],
+        vulnerabilities=[{"title": f"Finding {i}", "severity": "medium", "found_at": now} for i in range(500)],
+    )
+
+
+def legacy_convert(obj):
+    """The recursive ``Scanner.convert_to_serializable`` this module replaced."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, list):
+        return [legacy_convert(i) for i in obj]
+    elif isinstance(obj, dict):
+        return {k: legacy_convert(v) for k, v in obj.items()}
+    return obj
+
+
+def legacy_dict(results: ScanResults) -> dict:
+    """The old untyped results dict (nested structures as plain dicts)."""
+    data = json.loads(dumps(results))
+    data["whois"] = results.whois
+    data["api_endpoints"] = results.api_endpoints
+    data["vulnerabilities"] = results.vulnerabilities
+    return data
+
+
+def legacy_path(results: dict) -> int:
+    report = {"scan_id": "bench", "timestamp": datetime.utcnow().isoformat(), "results": legacy_convert(results)}
+    stored = json.dumps(report)
+    results = legacy_convert(results)
+    payload = json.dumps(legacy_convert(results))
+    return len(stored) + len(payload)
+
+
+def new_path(results: ScanResults) -> int:
+    stored = dumps({"scan_id": "bench", "timestamp": datetime.utcnow(), "results": results})
+    partials = sum(len(dumps({"stage": name, "data": {name: results.get(name)}}))
+                   for name in ScanResults.field_names())
+    return len(stored) + partials
+
+
+def measure(func, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subdomains", type=int, default=50000)
+    parser.add_argument("--endpoints", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = build_results(args.subdomains, args.endpoints)
+    legacy = legacy_dict(results)
+    old = measure(legacy_path, legacy, args.repeat)
+    new = measure(new_path, results, args.repeat)
+    size = len(dumps(results))
+
+    print(f"encoder: {'orjson' if orjson else 'json'}; result size {size / 1024 / 1024:.1f} MiB")
+    print(f"old path (3x convert + 2x json.dumps): {old * 1000:8.1f} ms")
+    print(f"new path (1x report + per-stage partials): {new * 1000:8.1f} ms  ({old / new:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
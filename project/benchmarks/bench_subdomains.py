@@ -0,0 +1,77 @@
+"""Subdomain brute-force throughput against a local stub DNS server.
+
+    python -m benchmarks.bench_subdomains --words 100000 --min-rate 2000
+
+The stub runs in its own process so the measured rate is what the
+brute-forcer achieves on one core. A second run puts the zone behind a
+wildcard record and checks that only the real subdomains are reported.
+"""
+import argparse
+import asyncio
+import os
+import random
+import string
+import sys
+import tempfile
+
+from benchmarks.stubs import start_dns_process
+from src.services.subdomain_bruteforce import SubdomainBruteforcer, iter_wordlist
+
+DOMAIN = "bench.test"
+
+
+def write_wordlist(path: str, count: int, live: int) -> set:
+    """Writes ``count`` random words and returns the ``live`` ones that will resolve."""
+    live_words = set()
+    with open(path, "w") as wordlist:
+        for i in range(count):
+            word = "".join(random.choices(string.ascii_lowercase, k=10)) + str(i)
+            if len(live_words) < live and i % max(1, count // live) == 0:
+                live_words.add(word)
+            wordlist.write(word + "\n")
+    return live_words
+
+
+async def brute_force(port: int, path: str, concurrency: int):
+    found = []
+    bruteforcer = SubdomainBruteforcer("127.0.0.1", port, concurrency=concurrency, rate_limit=0)
+    stats = await bruteforcer.run(DOMAIN, iter_wordlist(path), found.append)
+    return found, stats
+
+
+def run(words: int, live: int, concurrency: int, wildcard: bool):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "wordlist.txt")
+        live_words = write_wordlist(path, words, live)
+        records = {f"{word}.{DOMAIN}": "10.0.0.1" for word in live_words}
+        wildcards = {DOMAIN: "10.9.9.9"} if wildcard else {}
+        process, port = start_dns_process(records, wildcards)
+        try:
+            found, stats = asyncio.run(brute_force(port, path, concurrency))
+        finally:
+            process.terminate()
+
+    rate = stats["queried"] / stats["elapsed"]
+    correct = set(found) == set(records)
+    print(f"{'wildcard' if wildcard else 'plain':>8}: {stats['queried']} names in {stats['elapsed']:.2f}s "
+          f"= {rate:,.0f} names/s, found {len(found)}/{len(records)}, "
+          f"wildcard filtered {stats['wildcard_filtered']}, errors {stats['errors']}, correct={correct}")
+    return rate, correct
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--live", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--min-rate", type=float, default=0, help="fail if the plain run is slower (names/s)")
+    args = parser.parse_args(argv)
+
+    rate, plain_ok = run(args.words, args.live, args.concurrency, wildcard=False)
+    _, wildcard_ok = run(args.words // 10, args.live // 10 or 1, args.concurrency, wildcard=True)
+    if not (plain_ok and wildcard_ok) or rate < args.min_rate:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""Local stand-ins for the network services the scanner talks to.
+
+Benchmarks run these on loopback so they never touch the internet. Servers
+that would compete with the code under test for the CPU are started in a
+separate process.
+"""
+import asyncio
+import datetime
+import multiprocessing
+import os
+import socket
+import ssl
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import dns.rdatatype
+
+
+def free_port(kind: int = socket.SOCK_DGRAM) -> int:
+    """Returns a loopback port that is currently unused."""
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _parse_question(data: bytes):
+    """Returns ``(name, qtype, end_offset)`` of the first question in a DNS query."""
+    labels, offset = [], 12
+    while data[offset]:
+        length = data[offset]
+        labels.append(data[offset + 1:offset + 1 + length].decode("ascii", "ignore").lower())
+        offset += length + 1
+    qtype = int.from_bytes(data[offset + 1:offset + 3], "big")
+    return ".".join(labels), qtype, offset + 5
+
+
+class _StubDNSProtocol(asyncio.DatagramProtocol):
+    """Answers A queries with hand-built packets so the stub is never the bottleneck."""
+
+    def __init__(self, records: Dict[str, str], wildcards: Dict[str, str], ttl: int):
+        self.records = records
+        self.wildcards = wildcards
+        self.ttl = ttl
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def lookup(self, name: str) -> Optional[str]:
+        address = self.records.get(name)
+        if address is None:
+            for zone, wildcard_address in self.wildcards.items():
+                if name.endswith("." + zone):
+                    return wildcard_address
+        return address
+
+    def datagram_received(self, data, addr):
+        try:
+            name, qtype, end = _parse_question(data)
+        except (IndexError, UnicodeError):
+            return
+        address = self.lookup(name)
+        question = data[12:end]
+        if address is None:
+            header = data[:2] + b"\x81\x83" + b"\x00\x01\x00\x00\x00\x00\x00\x00"
+            self.transport.sendto(header + question, addr)
+        elif qtype != dns.rdatatype.A:
+            header = data[:2] + b"\x81\x80" + b"\x00\x01\x00\x00\x00\x00\x00\x00"
+            self.transport.sendto(header + question, addr)
+        else:
+            header = data[:2] + b"\x81\x80" + b"\x00\x01\x00\x01\x00\x00\x00\x00"
+            answer = (b"\xc0\x0c\x00\x01\x00\x01" + self.ttl.to_bytes(4, "big") + b"\x00\x04"
+                      + socket.inet_aton(address))
+            self.transport.sendto(header + question + answer, addr)
+
+
+async def start_dns_server(records: Dict[str, str], wildcards: Optional[Dict[str, str]] = None,
+                           port: int = 0, ttl: int = 300):
+    """Serves A records for ``records`` (and ``*.zone`` for ``wildcards``) on 127.0.0.1; returns the transport."""
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _StubDNSProtocol(records, wildcards or {}, ttl), local_addr=("127.0.0.1", port)
+    )
+    return transport
+
+
+def _serve_dns(records, wildcards, port, ready):
+    async def serve():
+        await start_dns_server(records, wildcards, port)
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def start_dns_process(records: Dict[str, str], wildcards: Optional[Dict[str, str]] = None) -> tuple:
+    """Runs the stub DNS server in its own process; returns ``(process, port)``."""
+    port = free_port()
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    process = context.Process(target=_serve_dns, args=(records, wildcards or {}, port, ready), daemon=True)
+    process.start()
+    if not ready.wait(30):
+        process.terminate()
+        raise RuntimeError("Stub DNS server did not start")
+    return process, port
+
+
+def make_self_signed_cert(hostnames: Sequence[str], directory: str) -> tuple:
+    """Writes a self-signed certificate valid for ``hostnames``; returns ``(certfile, keyfile)``.
+
+    Pointing ``SSL_CERT_FILE`` at the certificate makes the default SSL
+    context trust it, so TLS stages verify it like a real one.
+    """
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, hostnames[0])])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=30))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName(host) for host in hostnames]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    certfile, keyfile = os.path.join(directory, "stub-cert.pem"), os.path.join(directory, "stub-key.pem")
+    with open(certfile, "wb") as out:
+        out.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(keyfile, "wb") as out:
+        out.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                    serialization.NoEncryption()))
+    return certfile, keyfile
+
+
+class GeneratedSite:
+    """Routes of a site with ``pages`` linked pages, ``fanout`` links each, plus a script, forms and a leaked file.
+
+    Page ``n`` links to pages ``n * fanout + 1`` to ``n * fanout + fanout``,
+    so the link graph is a tree that a crawler can only cover within its page
+    budget. Pages are generated on request; nothing is held in memory.
+    """
+
+    HOME = (b'<html><head><script src="/static/app.js"></script></head><body>'
+            b'<form method="post" action="/login"><input name="user"><input type="password" name="password">'
+            b'<input type="hidden" name="csrf_token" value="x"></form>'
+            b'<form method="POST" action="/api/v1/feedback"><textarea name="message"></textarea></form>'
+            b'<form action="/search"><input name="q"></form>'
+            b'<a href="/downloads/site-backup.zip">backup</a>')
+    SCRIPT = (b'const api = "/api/v1/users"; fetch("/api/v1/session");'
+              b'axios.post("/api/v2/orders", {}); const gql = "/graphql";')
+    FILES = {"/downloads/site-backup.zip": ("application/zip", b"PK"), "/.env": ("text/plain", b"SECRET=1")}
+
+    def __init__(self, pages: int, fanout: int = 10):
+        self.pages = pages
+        self.fanout = fanout
+
+    def _links(self, number: int) -> bytes:
+        first = number * self.fanout + 1
+        children = range(first, min(first + self.fanout, self.pages))
+        return b"".join(b'<a href="/p/%d">page %d</a>' % (child, child) for child in children)
+
+    def get(self, path: str):
+        if path == "/":
+            return self.HOME + self._links(0) + b"</body></html>"
+        if path == "/static/app.js":
+            return "application/javascript", self.SCRIPT
+        if path.startswith("/api/"):
+            return "application/json", b'{"ok": true}'
+        if path in self.FILES:
+            return self.FILES[path]
+        if path.startswith("/p/") and path[3:].isdigit() and int(path[3:]) < self.pages:
+            number = int(path[3:])
+            return b'<html><body><a href="/">home</a><a href="/p/%d">up</a>%s</body></html>' % (
+                (number - 1) // self.fanout, self._links(number))
+        return None
+
+
+async def _handle_http(reader, writer, routes, latency: float):
+    """Minimal keep-alive HTTP/1.1 responder: 200 with the route body, 404 otherwise.
+
+    ``routes`` maps a path to a body, or to ``(content_type, body)``; any
+    object with a ``get(path)`` method, such as ``GeneratedSite``, will do.
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            close = False
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+                if header.lower().startswith(b"connection:") and b"close" in header.lower():
+                    close = True
+            method, path = request_line.split(b" ", 2)[:2]
+            if latency:
+                await asyncio.sleep(latency)
+            body = routes.get(path.decode("latin-1").split("?", 1)[0])
+            status = b"200 OK" if body is not None else b"404 Not Found"
+            body = body if body is not None else b"not found"
+            content_type, body = body if isinstance(body, tuple) else ("text/html", body)
+            writer.write(b"HTTP/1.1 " + status + b"\r\nServer: nginx/1.24.0\r\nX-Powered-By: Express\r\n"
+                         b"Content-Type: " + content_type.encode() + b"\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n"
+                         + (b"" if method == b"HEAD" else body))
+            await writer.drain()
+            if close:
+                break
+    except (ConnectionError, ValueError, ssl.SSLError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _handle_whois(reader, writer, latency: float):
+    try:
+        domain = (await reader.readline()).decode("ascii", "ignore").strip()
+        if latency:
+            await asyncio.sleep(latency)
+        writer.write(
+            f"Domain Name: {domain.upper()}\r\n"
+            "Registrar: Stub Registrar\r\n"
+            "Creation Date: 2015-01-01T00:00:00Z\r\n"
+            "Updated Date: 2024-01-01T00:00:00Z\r\n"
+            "Registry Expiry Date: 2030-01-01T00:00:00Z\r\n"
+            f"Name Server: NS1.{domain.upper()}\r\n"
+            f"Name Server: NS2.{domain.upper()}\r\n".encode()
+        )
+        await writer.drain()
+    except (ConnectionError, UnicodeError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _accept_and_close(reader, writer):
+    writer.close()
+
+
+async def start_target_servers(http_port: int, https_port: int, whois_port: int, certfile: str, keyfile: str,
+                               routes, latency: float = 0.0,
+                               open_ports: Iterable[int] = ()) -> List[asyncio.AbstractServer]:
+    """Starts the HTTP, HTTPS and WHOIS stand-ins plus bare listeners on ``open_ports``, all on 127.0.0.1."""
+    tls = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    tls.load_cert_chain(certfile, keyfile)
+
+    def http(reader, writer):
+        return _handle_http(reader, writer, routes, latency)
+
+    servers = [
+        await asyncio.start_server(http, "127.0.0.1", http_port, backlog=1024),
+        await asyncio.start_server(http, "127.0.0.1", https_port, ssl=tls, backlog=1024),
+        await asyncio.start_server(lambda r, w: _handle_whois(r, w, latency), "127.0.0.1", whois_port, backlog=1024),
+    ]
+    for port in open_ports:
+        servers.append(await asyncio.start_server(_accept_and_close, "127.0.0.1", port, backlog=1024))
+    return servers
+
+
+def _serve_targets(kwargs, ready):
+    async def serve():
+        await start_target_servers(**kwargs)
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def start_targets_process(certfile: str, keyfile: str, routes, latency: float = 0.0,
+                          extra_open_ports: int = 0) -> tuple:
+    """Runs the target stand-ins in their own process; returns ``(process, ports)``.
+
+    ``ports`` maps ``http``, ``https`` and ``whois`` to their port and
+    ``open`` to the list of every port that accepts connections.
+    """
+    ports = {name: free_port(socket.SOCK_STREAM) for name in ("http", "https", "whois")}
+    extra = [free_port(socket.SOCK_STREAM) for _ in range(extra_open_ports)]
+    kwargs = {"http_port": ports["http"], "https_port": ports["https"], "whois_port": ports["whois"],
+              "certfile": certfile, "keyfile": keyfile, "routes": routes, "latency": latency, "open_ports": extra}
+    context = multiprocessing.get_context("spawn")
+    ready = context.Event()
+    process = context.Process(target=_serve_targets, args=(kwargs, ready), daemon=True)
+    process.start()
+    if not ready.wait(30):
+        process.terminate()
+        raise RuntimeError("Stub target servers did not start")
+    ports["open"] = [ports["http"], ports["https"], ports["whois"], *extra]
+    return process, ports
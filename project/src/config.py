@@ -4,13 +4,77 @@ from functools import lru_cache
 
 class Settings(BaseSettings):
     database_url: str = "sqlite:///./bug_gpt.db"
+    db_echo: bool = False
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_busy_timeout_ms: int = 5000
+    status_flush_interval_ms: int = 250  # Scan status/progress changes are written in one batch per interval
     scan_timeout: int = 300
     max_concurrent_scans: int = 5
+    scan_queue_max_depth: int = 100
+    scan_batch_max_domains: int = 50000
+    scan_batch_feed_depth: int = 0  # Queue depth batch feeders fill up to, the rest is kept for single scans; 0 is half
+    batch_stream_interval: float = 1.0  # Seconds between status polls of a streamed batch
+    scan_execution: str = "inline"  # "inline" runs scans in the API process, "worker" hands them to src.worker
+    worker_processes: int = 0  # 0 starts one worker process per CPU core
+    worker_lease_seconds: int = 30
+    worker_poll_interval: float = 1.0
+    worker_max_attempts: int = 3
+    progress_emit_interval_ms: int = 250  # Progress updates of one scan are coalesced to one per interval
+    max_concurrent_stages: int = 4
+    stage_timeout: int = 60
+    port_scan_ports: str = "top-100"
+    port_scan_concurrency: int = 500
+    port_scan_timeout: float = 2.0
+    port_scan_retries: int = 1
+    scan_http_port: int = 80  # Ports the HTTP(S) stages connect to on the target
+    scan_https_port: int = 443
+    blocking_io_workers: int = 8
+    cpu_workers: int = 2  # Processes rendering and parsing PDFs
+    upload_max_bytes: int = 100 * 1024 * 1024
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+    result_cache_min_compress_bytes: int = 1024
+    http_max_connections: int = 100
+    http_connections_per_host: int = 8
+    http_timeout: float = 10.0
+    http_max_body_bytes: int = 1048576
+    dns_nameservers: str = ""  # Comma-separated; empty uses the system resolver configuration
+    dns_port: int = 53
+    dns_timeout: float = 5.0
+    dns_cache_max_entries: int = 10000
+    dns_negative_ttl: int = 30
+    dns_max_ttl: int = 3600
+    whois_cache_ttl: int = 86400
+    whois_cache_memory_entries: int = 1024
+    whois_negative_ttl: int = 300  # Seconds before a failed WHOIS query is retried; doubles per failure
+    whois_server: str = ""  # "host[:port]" to query for every domain; empty picks the registry for the TLD
+    subdomain_wordlist: str = ""  # Path to a wordlist; empty uses src/data/subdomains.txt
+    subdomain_concurrency: int = 500
+    subdomain_rate_limit: int = 2000  # Queries per second, 0 for unlimited
+    fingerprints_path: str = ""  # Path to a signature database; empty uses src/data/fingerprints.json
+    crawl_max_pages: int = 200  # Requests per crawl, scripts and redirects included
+    crawl_max_depth: int = 3
+    crawl_concurrency: int = 8
+    crawl_seen_capacity: int = 100000  # URLs the duplicate filter is sized for; it never grows
+    crawl_max_body_bytes: int = 524288
+    crawl_time_budget: float = 30.0  # Seconds; keep below stage_timeout so the crawl can report what it found
     report_path: str = "./reports"
     vite_api_url: str = "http://127.0.0.1:8000"
     socket_url: str = "http://127.0.0.1:8000"
 
-    @field_validator('scan_timeout', 'max_concurrent_scans', mode="before")
+    @field_validator('db_pool_size', 'db_max_overflow', 'db_busy_timeout_ms', 'status_flush_interval_ms',
+                     'scan_timeout', 'max_concurrent_scans', 'scan_queue_max_depth', 'scan_batch_max_domains',
+                     'scan_batch_feed_depth', 'progress_emit_interval_ms', 'max_concurrent_stages',
+                     'worker_processes', 'worker_lease_seconds', 'worker_max_attempts', 'stage_timeout',
+                     'port_scan_concurrency', 'port_scan_retries', 'scan_http_port', 'scan_https_port',
+                     'blocking_io_workers', 'cpu_workers', 'upload_max_bytes',
+                     'result_cache_max_bytes', 'result_cache_min_compress_bytes',
+                     'http_max_connections', 'http_connections_per_host', 'http_max_body_bytes',
+                     'dns_port', 'dns_cache_max_entries', 'dns_negative_ttl', 'dns_max_ttl',
+                     'whois_cache_ttl', 'whois_cache_memory_entries', 'whois_negative_ttl',
+                     'subdomain_concurrency', 'subdomain_rate_limit', 'crawl_max_pages', 'crawl_max_depth', 'crawl_concurrency',
+                     'crawl_seen_capacity', 'crawl_max_body_bytes', mode="before")
     @classmethod
     def validate_int_values(cls, value):
         return int(value)
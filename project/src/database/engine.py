@@ -1,12 +1,60 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
-DATABASE_URL = "sqlite+aiosqlite:///./bug_gpt.db"
+from src.config import settings
 
-# Create async database engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+# Sync drivers named in DATABASE_URL and the asyncio drivers used instead.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> URL:
+    """Returns ``url`` with its driver swapped for the matching asyncio driver."""
+    url = make_url(url)
+    if url.drivername in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.drivername])
+    return url
+
+
+DATABASE_URL = async_database_url(settings.database_url)
+IS_SQLITE = DATABASE_URL.get_backend_name() == "sqlite"
+
+
+def _engine_options() -> dict:
+    options = {"echo": settings.db_echo}
+    if IS_SQLITE and DATABASE_URL.database in (None, "", ":memory:"):
+        return options  # In-memory databases use a single static connection
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    if IS_SQLITE:
+        options["connect_args"] = {"timeout": settings.db_busy_timeout_ms / 1000}
+    else:
+        options["pool_pre_ping"] = True
+    return options
+
+
+# The one engine of the process, shared by the API, the scanners and the workers.
+engine = create_async_engine(DATABASE_URL, **_engine_options())
+
+if IS_SQLITE:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        """WAL lets readers run alongside the writer; busy_timeout waits for locks instead of failing."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.db_busy_timeout_ms)}")
+        cursor.close()
 
 # Create session factory
-async_session = sessionmaker(
+async_session = async_sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
 )
@@ -1,15 +1,10 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.future import select
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine
+from .engine import engine
+from .models import Base
 
-DATABASE_URL = "sqlite+aiosqlite:///./bug_gpt.db"
-
-engine = create_async_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
-Base = declarative_base()
 
 async def init_db():
+    """Create any missing tables for the registered models."""
+    import src.models.scan  # noqa: F401  (registers the models on Base)
+
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
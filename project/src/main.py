@@ -1,22 +1,46 @@
-from fastapi import FastAPI, UploadFile
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
 from contextlib import asynccontextmanager
 import socketio
-import pdfplumber
-import matplotlib.pyplot as plt
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-import os
-import json
-import datetime
-
-sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins=["http://localhost:5173"])
+import asyncio
+from src.services.blocking_io import shutdown_executor
+from src.services.cpu_pool import shutdown_process_pool
+from src.services.http_client import http_client
+from src.services import scan_batch
+from src.services.scan_queue import scan_queue
+from src.services.status_writer import status_writer
+from src.services.events import relay_worker_events
+from src.services.progress_throttle import ProgressThrottle
+from src.database import init_db, async_session
+from src.models.scan import Scan
+from src.config import settings
+from src.utils.logger import logger
+from src.utils.metrics import EMIT_DURATION, EMIT_ERRORS, track
+from src.utils.serialization import SocketJSON
+
+sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins=["http://localhost:5173"], json=SocketJSON)
 socket_app = socketio.ASGIApp(sio)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await init_db()
+    await http_client.start()
+    await scan_queue.start()
+    relay = None
+    if settings.scan_execution == "worker":
+        relay = asyncio.create_task(relay_worker_events())
+    else:
+        await scan_batch.resume_batches()
     yield
+    if relay:
+        relay.cancel()
+    await scan_queue.stop()
+    await status_writer.close()
+    if settings.scan_execution != "worker":
+        await scan_batch.stop_feeders()
+    await http_client.close()
+    shutdown_executor()
+    shutdown_process_pool()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -28,140 +52,84 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from src.routers import scan, report, health
+from src.routers import scan, report, health, findings, metrics
 
 app.include_router(scan.router, prefix="/api/scan", tags=["scan"])
 app.include_router(report.router, prefix="/api/report", tags=["report"])
 app.include_router(health.router, prefix="/api")
+app.include_router(findings.router, prefix="/api/findings", tags=["findings"])
+app.include_router(metrics.router, prefix="/api")
 
-@sio.on('scan_progress')
-async def emit_scan_progress(scan_id, progress, message):
-    """Emit scan progress updates."""
-    print(f"📡 Emitting scan progress: {scan_id} - {progress}% - {message}")
-    await sio.emit('scan_progress', {'id': scan_id, 'progress': progress, 'message': message})
-
-@sio.on('scan_complete')
-async def emit_scan_complete(scan_id, results):
-    """Emit scan completion notifications."""
-    try:
-        # Convert datetime objects to ISO format
-        def serialize(obj):
-            if isinstance(obj, datetime.datetime):
-                return obj.isoformat()
-            elif isinstance(obj, list):
-                return [serialize(item) for item in obj]
-            elif isinstance(obj, dict):
-                return {key: serialize(value) for key, value in obj.items()}
-            return obj
-
-        serialized_results = serialize(results)
-        print(f"🎯 Scan complete for {scan_id}. Sending results: {serialized_results}")
-        await sio.emit('scan_complete', {'id': scan_id, 'results': serialized_results})
-    except Exception as e:
-        print(f"Error serializing scan results: {e}")
-
-# Add a new function to trigger scan completion and emit results
-async def trigger_scan_complete(scan_id, results):
-    """Trigger scan completion and notify frontend."""
-    print(f"🔔 Triggering scan complete for {scan_id} with results.")
-    await emit_scan_complete(scan_id, results)
+def scan_room(scan_id):
+    """Socket.IO room of the clients following one scan."""
+    return f"scan:{scan_id}"
 
-app.mount("/", socket_app)
+async def _emit(event, payload, scan_id):
+    """Sends an event to the scan's room, timing it for /api/metrics."""
+    with track(EMIT_DURATION, event, errors=EMIT_ERRORS):
+        await sio.emit(event, payload, room=scan_room(scan_id))
 
-@sio.on('connect')
-async def connect(sid, environ):
-    print(f"✅ Client connected: {sid}")
+async def _send_progress(scan_id, payload):
+    await _emit('scan_progress', payload, scan_id)
 
-@sio.on('disconnect')
-async def disconnect(sid):
-    print(f"❌ Client disconnected: {sid}")
+progress_throttle = ProgressThrottle(_send_progress, settings.progress_emit_interval_ms / 1000)
+
+async def emit_scan_progress(scan_id, progress, message, final=False):
+    """Emit scan progress updates to the scan's room, at most once per progress_emit_interval_ms."""
+    await progress_throttle.publish(scan_id, {'id': scan_id, 'progress': progress, 'message': message}, force=final)
+    if final:
+        progress_throttle.finish(scan_id)
+
+def results_url(scan_id):
+    return f"/api/scan/results/{scan_id}"
+
+async def emit_scan_partial(scan_id, stage, status, data):
+    """Emit the findings of one finished stage (already JSON-serializable)."""
+    await _emit('scan_partial', {'id': scan_id, 'stage': stage, 'status': status, 'data': data}, scan_id)
+
+async def emit_scan_complete(scan_id, summary):
+    """Emit scan completion notifications; the full results are fetched from results_url."""
+    progress_throttle.finish(scan_id)
+    logger.info("Scan complete for %s", scan_id)
+    await _emit('scan_complete', {'id': scan_id, 'summary': summary, 'results_url': results_url(scan_id)}, scan_id)
 
 app.mount("/", socket_app)
 
 @sio.on('connect')
 async def connect(sid, environ):
-    print(f"✅ Client connected: {sid}")
+    logger.debug("Client connected: %s", sid)
 
 @sio.on('disconnect')
 async def disconnect(sid):
-    print(f"❌ Client disconnected: {sid}")
-
-# Extract data from the OWASP PDF
-def extract_data_from_pdf(pdf_path):
-    with pdfplumber.open(pdf_path) as pdf:
-        text = "\n".join([page.extract_text() for page in pdf.pages if page.extract_text()])
-    
-    # Extract Risk Levels
-    risk_levels = {
-        "Critical": text.count("CRITICAL"),
-        "High": text.count("HIGH"),
-        "Medium": text.count("MEDIUM"),
-        "Low": text.count("LOW"),
-        "Best Practice": text.count("BEST PRACTICE"),
-        "Information": text.count("INFORMATION"),
-    }
-    
-    return text, risk_levels
-
-# Generate Risk Level Chart
-def generate_chart(risk_levels):
-    labels = list(risk_levels.keys())
-    values = list(risk_levels.values())
-
-    plt.figure(figsize=(6, 4))
-    plt.bar(labels, values, color=['red', 'orange', 'yellow', 'green', 'blue', 'gray'])
-    plt.xlabel("Risk Level")
-    plt.ylabel("Number of Issues")
-    plt.title("Vulnerabilities Breakdown")
-    
-    chart_path = "risk_chart.png"
-    plt.savefig(chart_path)
-    plt.close()
-    
-    return chart_path
-
-# Generate PDF Report
-def generate_pdf(summary_text, risk_levels):
-    pdf_path = "OWASP_Report.pdf"
-    c = canvas.Canvas(pdf_path, pagesize=letter)
-    width, height = letter
-
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(30, height - 50, "OWASP Vulnerability Report")
-    
-    c.setFont("Helvetica", 12)
-    y_position = height - 80
-    for line in summary_text.split("\n")[:15]:  # Limit summary text
-        c.drawString(30, y_position, line)
-        y_position -= 20
-
-    # Insert Chart
-    chart_path = generate_chart(risk_levels)
-    c.drawImage(chart_path, 100, y_position - 150, width=300, height=200)
-    
-    c.save()
-    os.remove(chart_path)
-    
-    return pdf_path
-
-@app.post("/api/report/generate")
-async def generate_report(file: UploadFile):
-    try:
-        # Save uploaded file temporarily
-        temp_file_path = f"temp_{file.filename}"
-        with open(temp_file_path, "wb") as temp_file:
-            temp_file.write(await file.read())
-
-        # Extract data and generate report
-        summary_text, risk_levels = extract_data_from_pdf(temp_file_path)
-        pdf_file = generate_pdf(summary_text, risk_levels)
-
-        # Clean up temporary file
-        os.remove(temp_file_path)
-
-        return FileResponse(pdf_file, media_type="application/pdf", filename="OWASP_Report.pdf")
-    except Exception as e:
-        return {"error": str(e)}
+    logger.debug("Client disconnected: %s", sid)
+
+@sio.on('join_scan')
+async def join_scan(sid, scan_id):
+    """Subscribes a client to one scan's events and sends it the scan's current state."""
+    if not isinstance(scan_id, str):
+        return
+    joined = sio.enter_room(sid, scan_room(scan_id))
+    if asyncio.iscoroutine(joined):  # enter_room is a coroutine in newer python-socketio releases
+        await joined
+
+    state = progress_throttle.state(scan_id)
+    if state is None:
+        async with async_session() as session:
+            scan = await session.get(Scan, scan_id)
+        if scan is None:
+            return
+        state = {'id': scan_id, 'progress': scan.progress, 'message': f"Scan {scan.status}"}
+        if scan.status == "completed":
+            await sio.emit('scan_progress', state, to=sid)
+            await sio.emit('scan_complete', {'id': scan_id, 'results_url': results_url(scan_id)}, to=sid)
+            return
+    await sio.emit('scan_progress', state, to=sid)
+
+@sio.on('leave_scan')
+async def leave_scan(sid, scan_id):
+    left = sio.leave_room(sid, scan_room(scan_id))
+    if asyncio.iscoroutine(left):
+        await left
 
 if __name__ == "__main__":
     import uvicorn
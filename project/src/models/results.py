@@ -0,0 +1,67 @@
+"""Typed scan results.
+
+Every stage writes one or more fields of ``ScanResults``. A stage that fails
+stores its error message (a ``str``) in place of its value and re-raises, so
+the scheduler records it as failed. The structures
+are serialized by ``src.utils.serialization.dumps`` without any intermediate
+conversion.
+"""
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# A stage's value, or the error message it failed with.
+Error = str
+
+
+@dataclass(slots=True)
+class TLSInfo:
+    cipher: Optional[Tuple[str, str, int]] = None
+    version: Optional[str] = None
+    peer_cert: Optional[Dict[str, Any]] = None
+
+
+@dataclass(slots=True)
+class Fingerprint:
+    web_server: Optional[str] = None
+    framework: Optional[str] = None
+    language: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ScanResults:
+    fingerprint: Union[Fingerprint, Dict[str, Any], Error, None] = None
+    network: Optional[str] = None
+    dns: Union[List[str], Error, None] = None
+    whois: Union[Dict[str, Any], Error, None] = None
+    ssl_tls: Union[TLSInfo, Dict[str, Any], Error, None] = None
+    vulnerabilities: Union[List[Any], Error] = field(default_factory=list)
+    components: Union[List[Any], Error] = field(default_factory=list)
+    session_management: Any = None
+    authentication: Any = None
+    error_codes: Union[List[Any], Error] = field(default_factory=list)
+    xss: Union[List[Any], Error] = field(default_factory=list)
+    sql_injection: Union[List[Any], Error] = field(default_factory=list)
+    csrf: Any = None
+    headers: Union[Dict[str, str], Error, None] = None
+    open_ports: Union[List[int], Error, None] = None
+    subdomains: Union[List[str], Error] = field(default_factory=list)
+    cookies: Any = None
+    api_endpoints: Union[List[Any], Error] = field(default_factory=list)
+    file_exposure: Union[List[Any], Error] = field(default_factory=list)
+    server_info: Any = None
+    outdated_components: Union[List[Any], Error] = field(default_factory=list)
+    security_misconfigs: Union[List[Any], Error] = field(default_factory=list)
+
+    def get(self, name: str):
+        return getattr(self, name)
+
+    def set(self, name: str, value):
+        setattr(self, name, value)
+
+    def pick(self, names) -> Dict[str, Any]:
+        """Returns the given fields as a dict (values are not converted)."""
+        return {name: getattr(self, name) for name in names}
+
+    @classmethod
+    def field_names(cls) -> Tuple[str, ...]:
+        return tuple(f.name for f in fields(cls))
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.sql import func
+from datetime import datetime
 from src.database import Base
 
 class Scan(Base):
@@ -15,3 +16,111 @@ class ScanResult(Base):
     scan_id = Column(String, ForeignKey("scans.id"), primary_key=True)
     results = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ScanBatch(Base):
+    """A group of scans submitted together through the batch API."""
+    __tablename__ = "scan_batches"
+    id = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False)
+    priority = Column(Integer, default=0, nullable=False)
+    incremental = Column(Boolean, default=False, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ScanBatchItem(Base):
+    """Membership of a scan in a batch."""
+    __tablename__ = "scan_batch_items"
+    batch_id = Column(String, ForeignKey("scan_batches.id"), primary_key=True)
+    scan_id = Column(String, ForeignKey("scans.id"), primary_key=True)
+
+class ScanJob(Base):
+    """A scan waiting for (or leased by) a worker process."""
+    __tablename__ = "scan_jobs"
+    scan_id = Column(String, ForeignKey("scans.id"), primary_key=True)
+    domain = Column(String(255), nullable=False)
+    priority = Column(Integer, default=0, nullable=False)
+    incremental = Column(Boolean, default=False, nullable=False)
+    status = Column(String, default="queued", nullable=False, index=True)  # queued, running, done, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    worker_id = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)  # Sub-second precision keeps FIFO order
+
+class ScanEvent(Base):
+    """Socket.IO event published by a worker process, relayed to clients by the API process."""
+    __tablename__ = "scan_events"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scan_id = Column(String, index=True, nullable=False)
+    event = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class WhoisRecord(Base):
+    """Serialized WHOIS data for a registrable domain, shared by every scan of its subdomains."""
+    __tablename__ = "whois_records"
+    domain = Column(String(255), primary_key=True)
+    data = Column(Text, nullable=False)
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+
+# Normalized findings, written in bulk when a scan completes. Each row repeats
+# the scanned domain and the scan time so queries never touch scan_results.
+
+class PortFinding(Base):
+    __tablename__ = "port_findings"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scan_id = Column(String, ForeignKey("scans.id"), nullable=False, index=True)
+    domain = Column(String(255), nullable=False)
+    port = Column(Integer, nullable=False)
+    found_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    __table_args__ = (
+        Index("ix_port_findings_port_domain", "port", "domain"),
+        Index("ix_port_findings_domain_found_at", "domain", "found_at"),
+    )
+
+class SubdomainFinding(Base):
+    __tablename__ = "subdomain_findings"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scan_id = Column(String, ForeignKey("scans.id"), nullable=False, index=True)
+    domain = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, index=True)
+    found_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    __table_args__ = (Index("ix_subdomain_findings_domain_found_at", "domain", "found_at"),)
+
+class EndpointFinding(Base):
+    __tablename__ = "endpoint_findings"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scan_id = Column(String, ForeignKey("scans.id"), nullable=False, index=True)
+    domain = Column(String(255), nullable=False)
+    kind = Column(String(32), nullable=False)  # api, file_exposure
+    url = Column(Text, nullable=False)
+    found_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    __table_args__ = (
+        Index("ix_endpoint_findings_kind_domain", "kind", "domain"),
+        Index("ix_endpoint_findings_domain_found_at", "domain", "found_at"),
+    )
+
+class VulnerabilityFinding(Base):
+    __tablename__ = "vulnerability_findings"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scan_id = Column(String, ForeignKey("scans.id"), nullable=False, index=True)
+    domain = Column(String(255), nullable=False)
+    title = Column(String(255), nullable=False, index=True)
+    severity = Column(String(16), nullable=True)
+    found_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    __table_args__ = (
+        Index("ix_vulnerability_findings_severity_domain", "severity", "domain"),
+        Index("ix_vulnerability_findings_domain_found_at", "domain", "found_at"),
+    )
+
+class TLSCertificate(Base):
+    __tablename__ = "tls_certificates"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scan_id = Column(String, ForeignKey("scans.id"), nullable=False, index=True)
+    domain = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=True)
+    issuer = Column(String(255), nullable=True)
+    not_before = Column(DateTime(timezone=True), nullable=True)
+    not_after = Column(DateTime(timezone=True), nullable=True, index=True)
+    protocol = Column(String(16), nullable=True)
+    cipher = Column(String(64), nullable=True)
+    found_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    __table_args__ = (Index("ix_tls_certificates_domain_found_at", "domain", "found_at"),)
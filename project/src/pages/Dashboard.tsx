@@ -13,17 +13,24 @@ function Dashboard() {
   const [securityData, setSecurityData] = useState<any>(null);
 
   useEffect(() => {
+    const scanId = "your_scan_id_here"; // Define scanId variable
     const socket = io('http://localhost:8000'); // Initialize Socket.IO client
 
-    socket.on('scan_complete', (data) => {
-      setSecurityData(data.results); // Update state with scan results
+    // Events are only sent to clients that joined the scan's room
+    socket.on('connect', () => {
+      socket.emit('join_scan', scanId);
+    });
+
+    socket.on('scan_complete', async (data) => {
+      // The event only carries a summary; fetch the full results once
+      const report = await api.getScanResults(data.id);
+      setSecurityData(report.results); // Update state with scan results
       setLoading(false); // Set loading to false
     });
 
     // Fetch initial data from the API if needed
     const fetchData = async () => {
       try {
-        const scanId = "your_scan_id_here"; // Define scanId variable
     const response = await api.getScanResults(scanId); // Fetch scan results using the correct API method
     console.error('Error fetching scan results:', error); // Log the error for better diagnostics
         setSecurityData(response.data);
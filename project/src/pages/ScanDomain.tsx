@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import ScanProgress from '../components/ScanProgress';
 import ScanReport from '../components/ScanReport';
@@ -12,11 +12,15 @@ function ScanDomain() {
   const [progress, setProgress] = useState(0);
   const [currentTask, setCurrentTask] = useState('');
   const [results, setResults] = useState<any | null>(null);
+  const [summary, setSummary] = useState<any | null>(null);
+  const stagesReceived = useRef<Set<string>>(new Set());
 
   useEffect(() => {
     if (scanId) {
       const socket = io('http://localhost:8000');
       
+      // Subscribe to this scan only; also re-joins after a reconnect and
+      // brings the progress bar up to date with the current state
       socket.on('connect', () => {
         socket.emit('join_scan', scanId);
       });
@@ -26,9 +30,25 @@ function ScanDomain() {
         setCurrentTask(data.message); // Updated to use "message" from the backend
       });
 
-      socket.on('scan_complete', async () => {
+      // Each finished stage sends its own findings; merge them as they arrive
+      socket.on('scan_partial', (data) => {
+        stagesReceived.current.add(data.stage);
+        setResults((previous: any) => ({ ...(previous || {}), ...data.data }));
+      });
+
+      // The completion event only carries a summary. Results are fetched once,
+      // unless every stage it lists already arrived as a partial; stages that
+      // finished before join_scan reached the room are never resent.
+      socket.on('scan_complete', async (data) => {
+        setSummary(data.summary || null);
+        setProgress(100);
+        const stages = Object.keys(data.summary?.stages || {});
+        if (stages.length > 0 && stages.every((stage) => stagesReceived.current.has(stage))) {
+          setScanning(false);
+          return;
+        }
         try {
-          const response = await axios.get(`http://localhost:8000/api/scan/results/${scanId}`);
+          const response = await axios.get(`http://localhost:8000${data.results_url}`);
           setResults(response.data.results); // Ensure "results" is correctly accessed
           setScanning(false);
         } catch (err) {
@@ -49,6 +69,8 @@ function ScanDomain() {
     setError(null);
     setScanning(true);
     setResults(null);
+    setSummary(null);
+    stagesReceived.current = new Set();
     setProgress(0);
     setCurrentTask('Initializing scan...');
 
@@ -112,6 +134,13 @@ function ScanDomain() {
           </div>
         )}
 
+        {summary && !scanning && (
+          <div className="mt-8 text-sm text-gray-700">
+            {summary.open_ports} open ports, {summary.subdomains} subdomains, {summary.api_endpoints} API endpoints,{' '}
+            {summary.total_vulnerabilities} vulnerabilities
+          </div>
+        )}
+
         {results && (
           <div className="mt-8">
             <ScanReport results={results} />
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_session
+from src.services.findings import FINDING_TYPES, query_findings
+from src.utils.serialization import dumps
+
+router = APIRouter()
+
+@router.get("/{finding_type}")
+async def list_findings(
+    finding_type: str,
+    domain: Optional[str] = None,
+    scan_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    port: Optional[int] = None,
+    name: Optional[str] = None,
+    kind: Optional[str] = None,
+    title: Optional[str] = None,
+    severity: Optional[str] = None,
+    issuer: Optional[str] = None,
+    cursor: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_session)
+):
+    """Filtered findings of one type (ports, subdomains, endpoints, vulnerabilities, tls), newest first.
+
+    Pass the returned ``next_cursor`` as ``cursor`` to get the next page,
+    e.g. ``/api/findings/ports?port=3389`` lists every scan that found RDP open.
+    """
+    if finding_type not in FINDING_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown finding type '{finding_type}'")
+    filters = {key: value for key, value in {
+        "port": port, "name": name, "kind": kind, "title": title, "severity": severity, "issuer": issuer,
+    }.items() if value is not None}
+    unsupported = set(filters) - set(FINDING_TYPES[finding_type][1])
+    if unsupported:
+        raise HTTPException(status_code=400,
+                            detail=f"Filter(s) {', '.join(sorted(unsupported))} do not apply to {finding_type}")
+
+    page = await query_findings(session, finding_type, filters, domain=domain, scan_id=scan_id,
+                                since=since, until=until, cursor=cursor, limit=limit)
+    return Response(content=dumps(page), media_type="application/json")
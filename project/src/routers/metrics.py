@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.services.scan_queue import scan_queue
+from src.utils import metrics
+
+router = APIRouter()
+
+QUEUE_DEPTH = metrics.Gauge("bug_gpt_scan_queue_depth", "Scans waiting in the in-process queue.")
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus scrape endpoint."""
+    QUEUE_DEPTH.set(scan_queue.depth)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
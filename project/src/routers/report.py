@@ -1,132 +1,65 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile
-from fastapi.responses import FileResponse
-import pdfplumber
-import matplotlib.pyplot as plt
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from src.schemas.scan import ScanResult
-import json
-import os
+from fastapi import APIRouter, HTTPException, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+import io
 
-try:
-    from src.utils.report_generator import ReportGenerator
-except ImportError as e:
-    raise ImportError(f"Failed to import ReportGenerator: {e}")
+from src.services.owasp_pdf import UploadTooLargeError, analyze_upload
+from src.services.report_renderer import report_renderer
+from src.services.result_cache import result_cache
 
 router = APIRouter()
 
-@router.get("/generate/{scan_id}")
-async def generate_report(scan_id: str, background_tasks: BackgroundTasks):
-    try:
-        # Get scan results
-        result = await get_scan_results(scan_id)
-        if not result:
-            raise HTTPException(status_code=404, detail="Scan results not found")
-
-        # Create reports directory if it doesn't exist
-        os.makedirs("reports", exist_ok=True)
-        report_path = f"reports/{scan_id}.pdf"
+def _report_links(scan_id: str) -> dict:
+    return {"status_url": f"/api/report/status/{scan_id}", "download_url": f"/api/report/download/{scan_id}"}
 
-        # Generate report in background
-        background_tasks.add_task(
-            generate_report_pdf,
-            result,
-            report_path
-        )
-
-        return {
-            "success": True,
-            "message": "Report generation started",
-            "report_path": report_path
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.get("/generate/{scan_id}")
+async def generate_report(scan_id: str):
+    """Starts rendering the scan's PDF unless it is cached already; poll status_url, then fetch download_url."""
+    entry = await result_cache.load(scan_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Scan results not found")
+    key = report_renderer.key(entry)
+    report_renderer.start(key, entry)
+    state = report_renderer.state(key)
+    return {
+        "success": True,
+        "message": "Report ready" if state["status"] == "ready" else "Report generation started",
+        "report_key": key,
+        "report_path": report_renderer.path(key),
+        **state,
+        **_report_links(scan_id),
+    }
 
-def generate_report_pdf(scan_results: dict, output_path: str):
-    """Generate PDF report using ReportGenerator."""
+@router.get("/status/{scan_id}")
+async def report_status(scan_id: str):
+    """Whether the scan's PDF is ready, rendering, failed or not requested yet."""
+    entry = await result_cache.load(scan_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Scan results not found")
+    key = report_renderer.key(entry)
+    return {"scan_id": scan_id, "report_key": key, **report_renderer.state(key), **_report_links(scan_id)}
+
+@router.get("/download/{scan_id}")
+async def download_report(scan_id: str):
+    """Returns the scan's PDF, waiting for (or starting) its render if it is not cached yet."""
     try:
-        generator = ReportGenerator(scan_results)
-        generator.generate(output_path)
+        path = await report_renderer.ensure(scan_id)
     except Exception as e:
-        print(f"Error generating report: {str(e)}")
-        raise e
-
-# Extract data from the OWASP PDF
-def extract_data_from_pdf(pdf_path):
-    with pdfplumber.open(pdf_path) as pdf:
-        text = "\n".join([page.extract_text() for page in pdf.pages if page.extract_text()])
-    
-    # Extract Risk Levels
-    risk_levels = {
-        "Critical": text.count("CRITICAL"),
-        "High": text.count("HIGH"),
-        "Medium": text.count("MEDIUM"),
-        "Low": text.count("LOW"),
-        "Best Practice": text.count("BEST PRACTICE"),
-        "Information": text.count("INFORMATION"),
-    }
-    
-    return text, risk_levels
-
-# Generate Risk Level Chart
-def generate_chart(risk_levels):
-    labels = list(risk_levels.keys())
-    values = list(risk_levels.values())
-
-    plt.figure(figsize=(6, 4))
-    plt.bar(labels, values, color=['red', 'orange', 'yellow', 'green', 'blue', 'gray'])
-    plt.xlabel("Risk Level")
-    plt.ylabel("Number of Issues")
-    plt.title("Vulnerabilities Breakdown")
-    
-    chart_path = "risk_chart.png"
-    plt.savefig(chart_path)
-    plt.close()
-    
-    return chart_path
-
-# Generate PDF Report
-def generate_pdf(summary_text, risk_levels):
-    pdf_path = "OWASP_Report.pdf"
-    c = canvas.Canvas(pdf_path, pagesize=letter)
-    width, height = letter
-
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(30, height - 50, "OWASP Vulnerability Report")
-    
-    c.setFont("Helvetica", 12)
-    y_position = height - 80
-    for line in summary_text.split("\n")[:15]:  # Limit summary text
-        c.drawString(30, y_position, line)
-        y_position -= 20
-
-    # Insert Chart
-    chart_path = generate_chart(risk_levels)
-    c.drawImage(chart_path, 100, y_position - 150, width=300, height=200)
-    
-    c.save()
-    os.remove(chart_path)
-    
-    return pdf_path
+        raise HTTPException(status_code=500, detail=f"Report rendering failed: {str(e)}")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Scan results not found")
+    return FileResponse(path, media_type="application/pdf", filename=f"report-{scan_id}.pdf")
 
 @router.post("/generate")
-async def generate_report(file: UploadFile):
+async def generate_owasp_report(file: UploadFile):
+    """Summarizes an uploaded OWASP/pentest PDF and streams the summary PDF back."""
     try:
-        # Save uploaded file temporarily
-        temp_file_path = f"temp_{file.filename}"
-        with open(temp_file_path, "wb") as temp_file:
-            temp_file.write(await file.read())
-
-        # Extract data and generate report
-        summary_text, risk_levels = extract_data_from_pdf(temp_file_path)
-        pdf_file = generate_pdf(summary_text, risk_levels)
-
-        # Clean up temporary file
-        os.remove(temp_file_path)
-
-        return FileResponse(pdf_file, media_type="application/pdf", filename="OWASP_Report.pdf")
+        pdf = await analyze_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        io.BytesIO(pdf),
+        media_type="application/pdf",
+        headers={"Content-Disposition": 'attachment; filename="OWASP_Report.pdf"'},
+    )
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.database.db import get_session
-from src.schemas.scan import ScanRequest, ScanResponse, ScanStatus, ScanResult
-from src.models.scan import Scan
+from src.database import get_session
+from src.schemas.scan import ScanRequest, ScanResponse, ScanStatus, ScanBatchRequest, ScanBatchResponse
+from src.models.scan import Scan, ScanBatch, ScanResult as ScanResultRecord
 from src.services.scanner import Scanner
+from src.services.scan_queue import scan_queue, QueueFullError
+from src.services.result_cache import result_cache
+from src.services import job_queue
+from src.services.scan_diff import diff_results
+from src.services.scan_batch import create_batch, parse_domain_list, stream_batch, validate_domains
+from src.config import settings
 from src.models.scan import Scan
 import uuid
-import json
+from typing import Optional
+from src.utils.logger import logger
+from src.utils.serialization import loads
 from pydantic import BaseModel
 
 #from routers import scan, report
@@ -23,9 +32,15 @@ def read_root():
 @router.post("/start", response_model=ScanResponse)
 async def start_scan(
     request: ScanRequest,
-    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session)
 ):
+    # Checked before the Scan row exists so that rejected requests leave nothing behind
+    if settings.scan_execution == "worker":
+        full = await job_queue.depth(session) >= settings.scan_queue_max_depth
+    else:
+        full = scan_queue.full()
+    if full:
+        raise HTTPException(status_code=429, detail="Too many scans queued, please retry later")
     try:
         scan_id = str(uuid.uuid4())
         
@@ -36,22 +51,102 @@ async def start_scan(
             status="pending"
         )
         session.add(scan)
+
+        if settings.scan_execution == "worker":
+            # Hand the scan to the worker processes (python -m src.worker)
+            await job_queue.enqueue(session, scan_id, request.domain, request.priority, request.incremental)
+            await session.commit()
+            return ScanResponse(
+                scan_id=scan_id,
+                success=True,
+                message="Scan queued for a worker"
+            )
+
         await session.commit()
 
-        # Start scan process in background
-        scanner = Scanner(request.domain, scan_id)
-        background_tasks.add_task(scanner.start)
+        # Queue the scan; a worker starts it once a slot is free
+        scanner = Scanner(request.domain, scan_id, incremental=request.incremental)
+        try:
+            position = scan_queue.submit(scanner, priority=request.priority)
+        except QueueFullError as e:
+            # Filled up while the row was being stored; the scan never existed for the client
+            await session.delete(scan)
+            await session.commit()
+            raise HTTPException(status_code=429, detail=str(e))
 
         return ScanResponse(
             scan_id=scan_id,
             success=True,
-            message="Scan started successfully"
+            message=f"Scan queued at position {position}"
         )
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error starting scan: {e}")  # Log the error
+        logger.exception("Error starting scan")
         raise HTTPException(status_code=500, detail=f"Error starting scan: {str(e)}")
 
 
+@router.post("/batch", response_model=ScanBatchResponse)
+async def start_batch(request: Request):
+    """Starts scans for many domains at once.
+
+    Accepts either a JSON ``ScanBatchRequest`` or a multipart upload with a
+    ``file`` field holding one domain per line (``priority`` and
+    ``incremental`` may be sent as form fields).
+    """
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Upload the domain list in a 'file' field")
+        candidates = parse_domain_list((await upload.read()).decode("utf-8", errors="ignore"))
+        try:
+            priority = int(form.get("priority", 0))
+        except ValueError:
+            raise HTTPException(status_code=422, detail="priority must be an integer")
+        incremental = str(form.get("incremental", "false")).lower() in ("1", "true", "yes")
+    else:
+        try:
+            body = ScanBatchRequest(**await request.json())
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        candidates, priority, incremental = body.domains, body.priority, body.incremental
+
+    if len(candidates) > settings.scan_batch_max_domains:
+        raise HTTPException(status_code=413, detail=f"A batch may hold at most {settings.scan_batch_max_domains} domains")
+    domains, invalid, duplicates = validate_domains(candidates)
+    if not domains:
+        raise HTTPException(status_code=400, detail="No valid domains in the batch")
+
+    try:
+        batch_id = await create_batch(domains, priority, incremental)
+    except Exception as e:
+        logger.exception("Error starting batch")
+        raise HTTPException(status_code=500, detail=f"Error starting batch: {str(e)}")
+
+    return ScanBatchResponse(
+        batch_id=batch_id,
+        accepted=len(domains),
+        duplicates=duplicates,
+        invalid=invalid,
+        stream_url=f"/api/scan/batch/{batch_id}/stream",
+    )
+
+
+@router.get("/batch/{batch_id}/stream")
+async def stream_batch_status(
+    batch_id: str,
+    session: AsyncSession = Depends(get_session)
+):
+    """Streams per-domain status changes of a batch as NDJSON until all of its scans finish."""
+    if not await session.get(ScanBatch, batch_id):
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return StreamingResponse(
+        stream_batch(batch_id, settings.batch_stream_interval),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.get("/status/{scan_id}", response_model=ScanStatus)
 async def get_scan_status(
     scan_id: str,
@@ -63,36 +158,70 @@ async def get_scan_status(
     
     return ScanStatus(
         status=scan.status,
-        progress=scan.progress
+        progress=scan.progress,
+        queue_position=(
+            await job_queue.position(session, scan_id)
+            if settings.scan_execution == "worker"
+            else scan_queue.position(scan_id)
+        )
     )
 
-class ScanResultResponse(BaseModel):
-    scan_id: str
-    results: dict
-
-@router.get("/results/{scan_id}", response_model=ScanResultResponse)
-async def get_scan_results(
+@router.get("/diff/{scan_id}")
+async def get_scan_diff(
     scan_id: str,
+    against: Optional[str] = None,
     session: AsyncSession = Depends(get_session)
 ):
-    try:
-        # Fetch scan result from the database
-        scan_result = await session.get(ScanResult, scan_id)
-        if not scan_result:
-            raise HTTPException(status_code=404, detail="Scan results not found")
+    """What changed since the previous scan, or since scan ``against`` when given."""
+    record = await session.get(ScanResultRecord, scan_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Scan results not found")
+    report = loads(record.results)
 
-        # Deserialize results from JSON
-        try:
-            results_dict = json.loads(scan_result.results) if isinstance(scan_result.results, str) else scan_result.results
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=500, detail="Error decoding scan results JSON")
+    if against is None:
+        if "diff" not in report:
+            raise HTTPException(status_code=404, detail="Scan was not compared with a previous scan")
+        return {"scan_id": scan_id, **report["diff"]}
 
-        # Ensure results_dict is a dictionary and validate with Pydantic
-        if not isinstance(results_dict, dict):
-            raise HTTPException(status_code=500, detail="Invalid scan results structure")
-        validated_results = ScanResult(**results_dict)
+    previous = await session.get(ScanResultRecord, against)
+    if not previous:
+        raise HTTPException(status_code=404, detail="Scan results to compare against not found")
+    return {
+        "scan_id": scan_id,
+        "previous_scan_id": against,
+        "changes": diff_results(loads(previous.results).get("results", {}), report.get("results", {})),
+    }
 
-        # Return the validated Pydantic model as a dictionary
-        return validated_results.dict()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching scan results: {str(e)}")
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+@router.get("/results/{scan_id}")
+async def get_scan_results(scan_id: str, request: Request):
+    """Returns the stored scan report.
+
+    Finished reports are immutable, so they are served from an in-memory
+    cache with an ETag (304 when the client already has it) and
+    precompressed brotli/gzip bodies.
+    """
+    entry = await result_cache.load(scan_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Scan results not found")
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match", ""), entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    accept_encoding = request.headers.get("accept-encoding", "")
+    if entry.br is not None and _accepts(accept_encoding, "br"):
+        return Response(content=entry.br, media_type="application/json", headers={**headers, "Content-Encoding": "br"})
+    if entry.gzip is not None and _accepts(accept_encoding, "gzip"):
+        return Response(content=entry.gzip, media_type="application/json", headers={**headers, "Content-Encoding": "gzip"})
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -5,6 +5,8 @@ from typing import Optional, Dict, Any, List
 
 class ScanRequest(BaseModel):
     domain: str
+    priority: int = 0  # Higher priorities leave the queue first
+    incremental: bool = False  # Reuse still-fresh stage results of the previous scan of this domain
 
     @validator('domain')
     def validate_domain(cls, v):
@@ -12,6 +14,18 @@ class ScanRequest(BaseModel):
             raise ValueError('Invalid domain name')
         return v
 
+class ScanBatchRequest(BaseModel):
+    domains: List[str]  # Validated in bulk by the batch endpoint
+    priority: int = 0
+    incremental: bool = False
+
+class ScanBatchResponse(BaseModel):
+    batch_id: str
+    accepted: int
+    duplicates: int
+    invalid: List[str]
+    stream_url: str
+
 class ScanResponse(BaseModel):
     scan_id: str
     success: bool
@@ -20,6 +34,7 @@ class ScanResponse(BaseModel):
 class ScanStatus(BaseModel):
     status: str
     progress: int
+    queue_position: Optional[int] = None  # 1-based while queued, 0 while running
 
 class Vulnerability(BaseModel):
     title: str
@@ -0,0 +1,33 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+from src.config import settings
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Returns the dedicated pool for libraries that only offer blocking calls (WHOIS, etc.)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.blocking_io_workers,
+            thread_name_prefix="scanner-io",
+        )
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Runs a blocking call in the scanner I/O pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_executor():
+    """Stops the I/O pool; called from the application lifespan."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,408 @@
+"""Bounded same-site crawler feeding the API discovery, file exposure and CSRF checks.
+
+Pages are fetched by a fixed number of workers through the shared
+``http_client``, whose connector also caps the connections per host. URLs
+already seen are remembered in a fixed-size Bloom filter and the frontier
+only ever holds as many URLs as the page budget still allows, so memory stays
+flat however many links a site has. Markup and scripts are scanned with
+regular expressions for the few tags and strings that matter instead of being
+parsed into a tree.
+"""
+import asyncio
+import hashlib
+import math
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from src.services.http_client import http_client
+from src.services.whois_cache import registrable_domain
+
+# Per kind of finding; further ones are dropped.
+MAX_FINDINGS = 500
+# Files referenced by the site that are checked on top of COMMON_EXPOSURES.
+MAX_FILE_PROBES = 50
+# Redirects followed from a start URL before the crawled hosts are fixed.
+MAX_START_REDIRECTS = 5
+# Share of the time budget kept for the file checks after the page crawl.
+FILE_CHECK_SHARE = 0.25
+
+COMMON_EXPOSURES = (
+    "/.env", "/.git/HEAD", "/.git/config", "/.svn/entries", "/.DS_Store", "/.htpasswd",
+    "/backup.zip", "/backup.sql", "/dump.sql", "/config.json", "/phpinfo.php", "/server-status",
+)
+
+_TAG = re.compile(r"<(/?)(a|area|link|script|iframe|frame|form|input|button|select|textarea|base)\b([^>]*)>", re.I)
+_SCRIPT_END = re.compile(r"</script\s*>", re.I)
+_ATTRIBUTE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+# Quoted absolute URLs and paths in scripts; template parameters are kept as written.
+_JS_STRING = re.compile(r"""["'`]((?:https?:)?//[^"'`\s<>]{1,300}|/[^"'`\s<>/][^"'`\s<>]{0,300})["'`]""")
+# URLs handed straight to a request API: fetch(), axios, jQuery, XMLHttpRequest.open().
+_JS_CALL = re.compile(r"""(?:\bfetch|\baxios(?:\.(get|post|put|patch|delete|head))?|\$\.(get|post|ajax|getJSON)|\.open)"""
+                      r"""\(\s*(?:["'](GET|POST|PUT|PATCH|DELETE|HEAD)["']\s*,\s*)?["'`]([^"'`\s<>]{1,300})["'`]""", re.I)
+_API_PATH = re.compile(r"(?:^|/)(?:api|rest|graphql|gql|rpc|v\d+(?:\.\d+)?)(?:/|$)|\.json$", re.I)
+_SENSITIVE_PATH = re.compile(
+    r"(?:^|/)(?:\.env(?:\.[\w-]+)?|\.git/|\.svn/|\.hg/|\.DS_Store|\.htaccess|\.htpasswd|\.npmrc|web\.config|"
+    r"wp-config\.php|phpinfo\.php|server-status|id_[rd]sa)|"
+    r"\.(?:bak|backup|old|orig|swp|sql|sqlite3?|db|dump|log|tar|tgz|gz|zip|7z|rar|pem|key|p12|pfx)$|~$", re.I)
+_CSRF_NAME = re.compile(r"csrf|xsrf|authenticity_token|requestverificationtoken|anti.?forgery|_token$|^nonce$", re.I)
+# Fetched for links, never parsed.
+_SKIP_PATH = re.compile(r"\.(?:png|jpe?g|gif|svg|ico|webp|bmp|css|woff2?|ttf|eot|otf|mp[34]|webm|avi|mov|pdf|docx?|"
+                        r"xlsx?|pptx?|exe|dmg|iso)$", re.I)
+_HTML = ("text/html", "application/xhtml")
+_SCRIPT = ("javascript", "ecmascript")
+
+
+class BloomFilter:
+    """Set membership in a fixed bit array; false positives at ``error_rate`` once ``capacity`` keys were added."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        first, step = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * step) % self.size for index in range(self.hashes))
+
+    def add(self, key: str) -> bool:
+        """Adds ``key``; returns False when it was (probably) there already."""
+        added = False
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        self.count += added
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position // 8] & (1 << position % 8) for position in self._positions(key))
+
+
+def normalize(url: str) -> Optional[str]:
+    """``url`` without its fragment and default port, or None when it is not http(s)."""
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        return None
+    host = parts.hostname
+    if port and port != (443 if scheme == "https" else 80):
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+def _attributes(text: str) -> Dict[str, str]:
+    return {key.lower(): double or single or bare for key, double, single, bare in _ATTRIBUTE.findall(text)}
+
+
+@dataclass
+class Form:
+    page: str
+    action: str
+    method: str
+    inputs: List[str] = field(default_factory=list)
+    csrf_token: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {"page": self.page, "action": self.action, "method": self.method, "inputs": self.inputs,
+                "csrf_token": self.csrf_token, "missing_token": self.method == "POST" and self.csrf_token is None}
+
+
+@dataclass
+class PageLinks:
+    """What one page or script points at."""
+    links: List[str] = field(default_factory=list)
+    scripts: List[str] = field(default_factory=list)
+    forms: List[Form] = field(default_factory=list)
+    calls: List[Tuple[str, str]] = field(default_factory=list)  # (method, url) requested by scripts
+    strings: List[str] = field(default_factory=list)  # Other URLs quoted in scripts
+
+
+def extract_script(base: str, source: str, found: Optional[PageLinks] = None) -> PageLinks:
+    """Collects the URLs a script requests or mentions."""
+    found = found or PageLinks()
+    for call in _JS_CALL.finditer(source):
+        axios_method, jquery_method, open_method, target = call.groups()
+        if call.group(0).startswith(".open") and open_method is None:
+            continue  # window.open() and the like
+        method = (axios_method or open_method or ("POST" if jquery_method == "post" else "GET")).upper()
+        found.calls.append((method, urljoin(base, target)))
+    found.strings.extend(urljoin(base, value) for value in _JS_STRING.findall(source))
+    return found
+
+
+def extract_html(base: str, html: str) -> PageLinks:
+    """Collects links, scripts and forms of a page, plus the URLs used by its inline scripts."""
+    found = PageLinks()
+    form: Optional[Form] = None
+    position = 0
+    while True:
+        tag = _TAG.search(html, position)
+        if tag is None:
+            break
+        position = tag.end()
+        closing, name, attributes = tag.group(1), tag.group(2).lower(), _attributes(tag.group(3))
+        if name == "form":
+            form = None
+            if not closing:
+                action = urljoin(base, attributes.get("action") or base)
+                form = Form(base, action, (attributes.get("method") or "GET").upper())
+                found.forms.append(form)
+        elif name == "base" and attributes.get("href"):
+            base = urljoin(base, attributes["href"])
+        elif name == "script" and not closing:
+            if attributes.get("src"):
+                found.scripts.append(urljoin(base, attributes["src"]))
+            end = _SCRIPT_END.search(html, position)
+            stop = end.start() if end else len(html)
+            if not attributes.get("src") and stop > position:
+                extract_script(base, html[position:stop], found)
+            position = end.end() if end else len(html)
+        elif name in ("input", "button", "select", "textarea") and form is not None and attributes.get("name"):
+            field_name = attributes["name"]
+            form.inputs.append(field_name)
+            if form.csrf_token is None and _CSRF_NAME.search(field_name):
+                form.csrf_token = field_name
+            if attributes.get("formaction"):
+                found.links.append(urljoin(base, attributes["formaction"]))
+        elif not closing:
+            target = attributes.get("href") or attributes.get("src")
+            if target and not target.startswith(("javascript:", "mailto:", "tel:", "data:", "#")):
+                found.links.append(urljoin(base, target))
+    return found
+
+
+@dataclass
+class CrawlResult:
+    api_endpoints: List[dict] = field(default_factory=list)
+    file_exposure: List[dict] = field(default_factory=list)
+    forms: List[dict] = field(default_factory=list)
+    pages: int = 0
+    urls_seen: int = 0
+    out_of_budget: int = 0
+
+
+class Crawler:
+    """Breadth-first crawl of one site within page, depth and time budgets.
+
+    The site is the target host, its ``www.`` twin and whichever host of the
+    same registrable domain the start URL redirects to.
+    """
+
+    def __init__(self, host: str, max_pages: int = 200, max_depth: int = 3, concurrency: int = 8,
+                 seen_capacity: int = 100000, max_body_bytes: int = 512 * 1024, time_budget: float = 45.0,
+                 client=http_client):
+        self.host = host.lower()
+        twin = self.host[4:] if self.host.startswith("www.") else f"www.{self.host}"
+        self.hosts = {self.host, twin}
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.max_body_bytes = max_body_bytes
+        self.time_budget = time_budget
+        self.client = client
+        self.seen = BloomFilter(seen_capacity)
+        self.frontier: asyncio.Queue = asyncio.Queue()
+        self.scheduled = 0
+        self.result = CrawlResult()
+        self._endpoints: Dict[Tuple[str, str], dict] = {}
+        self._forms: Dict[tuple, dict] = {}
+        self._files: Dict[str, str] = {}  # Candidate URL -> how it was found
+        self._deadline = 0.0
+
+    def in_scope(self, url: str) -> bool:
+        return urlsplit(url).hostname in self.hosts
+
+    def schedule(self, url: str, depth: int):
+        """Queues ``url`` for fetching unless it was seen, is off-site, too deep or over budget."""
+        url = normalize(url)
+        if url is None or not self.in_scope(url) or not self.seen.add(url):
+            return
+        path = urlsplit(url).path
+        if _SENSITIVE_PATH.search(path):
+            self._add_file_candidate(url, "link")
+        if _API_PATH.search(path):
+            self._add_endpoint(url, "GET", "link")
+        if depth > self.max_depth or _SKIP_PATH.search(path) or self.scheduled >= self.max_pages:
+            self.result.out_of_budget += 1
+            return
+        self.scheduled += 1
+        self.frontier.put_nowait((url, depth))
+
+    def _add_endpoint(self, url: str, method: str, source: str):
+        key = (method, url)
+        if key not in self._endpoints and len(self._endpoints) < MAX_FINDINGS:
+            self._endpoints[key] = {"url": url, "method": method, "source": source}
+
+    def _add_file_candidate(self, url: str, source: str):
+        if url not in self._files and len(self._files) < MAX_FILE_PROBES:
+            self._files[url] = source
+
+    def _add_form(self, form: Form):
+        key = (form.action, form.method, tuple(form.inputs))
+        if key not in self._forms and len(self._forms) < MAX_FINDINGS:
+            self._forms[key] = form.to_dict()
+
+    def _handle(self, url: str, depth: int, found: PageLinks):
+        for link in found.links:
+            self.schedule(link, depth + 1)
+        for script in found.scripts:
+            self.schedule(script, depth)  # A page's own scripts do not count as a level
+        for form in found.forms:
+            if not self.in_scope(form.action):
+                continue
+            self._add_form(form)
+            if form.method != "GET" or _API_PATH.search(urlsplit(form.action).path):
+                self._add_endpoint(normalize(form.action) or form.action, form.method, "form")
+        for method, target in found.calls:
+            target = normalize(target)
+            if target and self.in_scope(target):
+                self._add_endpoint(target, method, "script")
+        for value in found.strings:
+            target = normalize(value)
+            if target is None or not self.in_scope(target):
+                continue
+            path = urlsplit(target).path
+            if _API_PATH.search(path):
+                self._add_endpoint(target, "GET", "script")
+            elif _SENSITIVE_PATH.search(path):
+                self._add_file_candidate(target, "script")
+
+    async def _get(self, url: str):
+        response = await self.client.fetch(url, max_bytes=self.max_body_bytes, allow_redirects=False)
+        self.result.pages += 1
+        return response
+
+    async def _visit(self, url: str, depth: int):
+        self._process(url, depth, await self._get(url))
+
+    def _process(self, url: str, depth: int, response):
+        if 300 <= response.status < 400 and response.headers.get("Location"):
+            self.schedule(urljoin(url, response.headers["Location"]), depth)
+            return
+        if response.status >= 400:
+            return
+        content_type = response.headers.get("Content-Type", "").lower()
+        if "json" in content_type:
+            self._add_endpoint(url, "GET", "response")
+        elif content_type.startswith(_HTML):
+            self._handle(url, depth, extract_html(url, response.text))
+        elif any(kind in content_type for kind in _SCRIPT) or urlsplit(url).path.endswith(".js"):
+            self._handle(url, depth, extract_script(url, response.text))
+
+    async def _worker(self):
+        while True:
+            url, depth = await self.frontier.get()
+            try:
+                if time.monotonic() < self._deadline:
+                    await self._visit(url, depth)
+            except Exception:
+                pass  # An unreachable page only loses its own links
+            finally:
+                self.frontier.task_done()
+
+    async def _check_file(self, url: str, source: str, semaphore: asyncio.Semaphore) -> Optional[dict]:
+        async with semaphore:
+            try:
+                response = await self.client.probe(url, allow_redirects=False)
+            except Exception:
+                return None
+        if response.status != 200:
+            return None
+        return {"url": url, "status": response.status, "source": source,
+                "content_type": response.headers.get("Content-Type"),
+                "size": response.headers.get("Content-Length")}
+
+    async def check_files(self, root: str, timeout: float) -> List[dict]:
+        """Probes the referenced sensitive files and the usual exposures within ``timeout`` seconds.
+
+        Returns the exposures confirmed in time; nothing when the site answers
+        every path with 200, since the status then proves nothing.
+        """
+        deadline = time.monotonic() + timeout
+        semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            soft_404 = await asyncio.wait_for(
+                self._check_file(urljoin(root, f"/{uuid.uuid4().hex}.bak"), "", semaphore), max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return []
+        if soft_404:
+            return []
+        candidates = dict(self._files)
+        for path in COMMON_EXPOSURES:
+            candidates.setdefault(urljoin(root, path), "common")
+        checks = [asyncio.create_task(self._check_file(url, source, semaphore)) for url, source in candidates.items()]
+        done, pending = await asyncio.wait(checks, timeout=max(0.0, deadline - time.monotonic()))
+        for check in pending:
+            check.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return [check.result() for check in checks if check in done and check.result()][:MAX_FINDINGS]
+
+    async def _start(self, url: str):
+        """Fetches ``url``, following redirects that stay within the target's registrable domain.
+
+        Hosts reached that way join the crawl's scope; returns the final URL
+        and response.
+        """
+        site = registrable_domain(self.host)
+        for _ in range(MAX_START_REDIRECTS):
+            response = await self._get(url)
+            location = response.headers.get("Location")
+            target = normalize(urljoin(url, location)) if 300 <= response.status < 400 and location else None
+            if target is None or registrable_domain(urlsplit(target).hostname) != site:
+                return url, response
+            self.hosts.add(urlsplit(target).hostname)
+            self.seen.add(target)
+            url = target
+        return url, response
+
+    async def crawl(self, start_urls: List[str]) -> CrawlResult:
+        """Crawls from the first of ``start_urls`` that answers, which also roots the file checks.
+
+        Pages are fetched until the budget minus ``FILE_CHECK_SHARE`` of it
+        has passed; fetches still running then are cancelled, so the crawl
+        returns within ``time_budget``.
+        """
+        started = time.monotonic()
+        deadline = started + self.time_budget
+        self._deadline = deadline - self.time_budget * FILE_CHECK_SHARE
+        root = None
+        for url in filter(None, map(normalize, start_urls)):
+            try:
+                self.seen.add(url)
+                self.scheduled += 1
+                url, response = await asyncio.wait_for(self._start(url), max(0.0, self._deadline - time.monotonic()))
+            except Exception:
+                continue
+            root = url
+            self._process(url, 0, response)
+            break
+        if root is None:
+            raise ConnectionError(f"None of {', '.join(start_urls)} could be fetched")
+
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.wait_for(self.frontier.join(), max(0.0, self._deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            pass  # Out of time: keep what was found
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        self.result.file_exposure = await self.check_files(root, deadline - time.monotonic())
+        self.result.api_endpoints = list(self._endpoints.values())
+        self.result.forms = list(self._forms.values())
+        self.result.urls_seen = self.seen.count
+        return self.result
@@ -0,0 +1,209 @@
+import asyncio
+import copy
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+from aiohttp.abc import AbstractResolver
+
+from src.config import settings
+
+# Answers that mean "this name has no such record"; they are cached briefly.
+NEGATIVE_ANSWERS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)
+
+
+class _QueryAbandoned(Exception):
+    """Set on a shared lookup whose owner was cancelled; the waiters query again."""
+
+
+class DNSCache:
+    """Process-wide async DNS cache shared by every scan.
+
+    Positive answers live for their record TTL (capped at ``max_ttl``),
+    NXDOMAIN/NoAnswer results for ``negative_ttl`` seconds. Concurrent
+    lookups of the same name share one query, and the least recently used
+    entries are evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int = 10000, negative_ttl: float = 30, max_ttl: float = 3600,
+                 nameservers: Optional[List[str]] = None, port: int = 53, timeout: float = 5.0):
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self.max_ttl = max_ttl
+        self.nameservers = nameservers
+        self.port = port
+        self.timeout = timeout
+        self._resolver: Optional[dns.asyncresolver.Resolver] = None
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, object]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def resolver(self) -> dns.asyncresolver.Resolver:
+        if self._resolver is None:
+            self._resolver = dns.asyncresolver.Resolver(configure=not self.nameservers)
+            if self.nameservers:
+                self._resolver.nameservers = list(self.nameservers)
+            self._resolver.port = self.port
+            self._resolver.lifetime = self.timeout
+        return self._resolver
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+    def _store(self, key, ttl: float, value):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def _query(self, key) -> Tuple[float, object]:
+        name, rdtype = key
+        try:
+            answer = await self.resolver.resolve(name, rdtype)
+        except NEGATIVE_ANSWERS as e:
+            return self.negative_ttl, e.with_traceback(None)  # Kept as a template, raised as copies
+        records = [record.to_text() for record in answer]
+        return min(answer.rrset.ttl, self.max_ttl), records
+
+    async def resolve(self, name: str, rdtype: str = "A") -> List[str]:
+        """Returns the records of ``name``; raises NXDOMAIN/NoAnswer (possibly from the cache)."""
+        key = (name.lower().rstrip("."), rdtype.upper())
+        value = await self._cached_or_query(key)
+        if isinstance(value, Exception):
+            raise copy.copy(value)  # A fresh exception, so cached answers never accumulate tracebacks
+        return list(value)
+
+    async def _cached_or_query(self, key):
+        while True:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _QueryAbandoned:
+                continue  # The owner was cancelled; look again and query if still needed
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            ttl, value = await self._query(key)
+            self._store(key, ttl, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.set_exception(_QueryAbandoned())
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def resolve_host(self, host: str) -> List[str]:
+        """Returns the addresses to connect to for ``host`` (IPv4 first, then IPv6).
+
+        Names unknown to DNS (e.g. entries from /etc/hosts such as
+        ``localhost``) fall back to the system resolver, cached for
+        ``negative_ttl`` seconds.
+        """
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        for rdtype in ("A", "AAAA"):
+            try:
+                return await self.resolve(host, rdtype)
+            except NEGATIVE_ANSWERS:
+                continue
+            except (dns.resolver.NoNameservers, dns.exception.Timeout):
+                break
+
+        key = (host.lower(), "SYSTEM")
+        entry = self._lookup(key)
+        if entry is not None:
+            self.hits += 1
+            return list(entry[1])
+        self.misses += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._store(key, self.negative_ttl, addresses)
+        return addresses
+
+
+class CachedResolver(AbstractResolver):
+    """aiohttp resolver that answers from the shared DNS cache."""
+
+    def __init__(self, cache: DNSCache):
+        self.cache = cache
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET):
+        addresses = await self.cache.resolve_host(host)
+        results = []
+        for address in addresses:
+            address_family = socket.AF_INET6 if ":" in address else socket.AF_INET
+            if family not in (socket.AF_UNSPEC, address_family):
+                continue
+            results.append({
+                "hostname": host,
+                "host": address,
+                "port": port,
+                "family": address_family,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            })
+        if not results:
+            raise OSError(f"No address for {host}")
+        return results
+
+    async def close(self):
+        pass
+
+
+dns_cache = DNSCache(
+    max_entries=settings.dns_cache_max_entries,
+    negative_ttl=settings.dns_negative_ttl,
+    max_ttl=settings.dns_max_ttl,
+    nameservers=[ns.strip() for ns in settings.dns_nameservers.split(",") if ns.strip()] or None,
+    port=settings.dns_port,
+    timeout=settings.dns_timeout,
+)
@@ -0,0 +1,88 @@
+import asyncio
+
+from sqlalchemy import delete, select
+
+from src.database import async_session
+from src.models.scan import ScanEvent
+from src.utils.logger import logger
+from src.utils.metrics import DB_WRITE_DURATION, DB_WRITE_ERRORS, track
+from src.utils.serialization import dumps_str, loads
+
+# Worker processes have no Socket.IO server of their own, so they write their
+# events to the scan_events table and the API process relays them to clients.
+_use_outbox = False
+
+
+def use_outbox(enabled: bool = True):
+    """Routes scan events through the database instead of emitting them directly."""
+    global _use_outbox
+    _use_outbox = enabled
+
+
+async def _write_event(scan_id: str, event: str, payload: dict):
+    try:
+        with track(DB_WRITE_DURATION, "event_outbox", errors=DB_WRITE_ERRORS):
+            async with async_session() as session:
+                async with session.begin():
+                    session.add(ScanEvent(scan_id=scan_id, event=event, payload=dumps_str(payload)))
+    except Exception as e:
+        logger.error("Failed to publish %s for %s: %s", event, scan_id, e)
+
+
+async def emit_scan_progress(scan_id, progress, message, final=False):
+    """Publishes a progress update for a scan; ``final`` sends it right away and ends the scan's updates."""
+    if _use_outbox:
+        await _write_event(scan_id, "scan_progress", {"progress": progress, "message": message, "final": final})
+        return
+    from src.main import emit_scan_progress as emit
+    await emit(scan_id, progress, message, final)
+
+
+async def emit_scan_partial(scan_id, stage, status, data):
+    """Publishes the findings of one finished stage as soon as it is done."""
+    if _use_outbox:
+        await _write_event(scan_id, "scan_partial", {"stage": stage, "status": status, "data": data})
+        return
+    from src.main import emit_scan_partial as emit
+    await emit(scan_id, stage, status, data)
+
+
+async def emit_scan_complete(scan_id, summary):
+    """Publishes the completion event for a scan, carrying only its summary."""
+    if _use_outbox:
+        await _write_event(scan_id, "scan_complete", {"summary": summary})
+        return
+    from src.main import emit_scan_complete as emit
+    await emit(scan_id, summary)
+
+
+async def relay_worker_events(poll_interval: float = 0.5, batch_size: int = 500):
+    """Forwards events written by worker processes to Socket.IO clients, oldest first."""
+    from src.main import (
+        emit_scan_complete as emit_complete,
+        emit_scan_partial as emit_partial,
+        emit_scan_progress as emit_progress,
+    )
+
+    while True:
+        rows = []
+        try:
+            async with async_session() as session:
+                rows = (await session.execute(
+                    select(ScanEvent).order_by(ScanEvent.id).limit(batch_size)
+                )).scalars().all()
+                for row in rows:
+                    payload = loads(row.payload)
+                    if row.event == "scan_progress":
+                        await emit_progress(row.scan_id, payload["progress"], payload["message"], payload.get("final", False))
+                    elif row.event == "scan_partial":
+                        await emit_partial(row.scan_id, payload["stage"], payload["status"], payload["data"])
+                    elif row.event == "scan_complete":
+                        await emit_complete(row.scan_id, payload["summary"])
+                if rows:
+                    await session.execute(delete(ScanEvent).where(ScanEvent.id <= rows[-1].id))
+                    await session.commit()
+        except Exception:
+            logger.exception("Worker event relay error")
+        if len(rows) < batch_size:
+            await asyncio.sleep(poll_interval)
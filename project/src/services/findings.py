@@ -0,0 +1,117 @@
+import ssl
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.results import ScanResults
+from src.models.scan import EndpointFinding, PortFinding, SubdomainFinding, TLSCertificate, VulnerabilityFinding
+
+# Query name -> (model, {query parameter: column}) for GET /api/findings/{kind}
+FINDING_TYPES = {
+    "ports": (PortFinding, {"port": PortFinding.port}),
+    "subdomains": (SubdomainFinding, {"name": SubdomainFinding.name}),
+    "endpoints": (EndpointFinding, {"kind": EndpointFinding.kind}),
+    "vulnerabilities": (VulnerabilityFinding, {"title": VulnerabilityFinding.title,
+                                               "severity": VulnerabilityFinding.severity}),
+    "tls": (TLSCertificate, {"issuer": TLSCertificate.issuer}),
+}
+
+
+def _items(value) -> list:
+    """A stage's findings, or nothing when the stage stored an error message."""
+    return value if isinstance(value, list) else []
+
+
+def _field(item, name: str):
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+
+def _cert_name(name) -> Optional[str]:
+    """The common name of a getpeercert() subject/issuer (a tuple of RDN tuples)."""
+    for rdn in name or ():
+        for key, value in rdn:
+            if key == "commonName":
+                return value
+    return None
+
+
+def _cert_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.utcfromtimestamp(ssl.cert_time_to_seconds(value)) if value else None
+
+
+def finding_rows(scan_id: str, domain: str, results: ScanResults, found_at: datetime) -> Dict[Any, List[dict]]:
+    """Flattens the results of a scan into rows for each findings table."""
+    common = {"scan_id": scan_id, "domain": domain, "found_at": found_at}
+    rows = {
+        PortFinding: [{**common, "port": port} for port in _items(results.open_ports)],
+        SubdomainFinding: [{**common, "name": name} for name in _items(results.subdomains)],
+        EndpointFinding: [
+            {**common, "kind": kind, "url": item if isinstance(item, str) else _field(item, "url")}
+            for kind, items in (("api", results.api_endpoints), ("file_exposure", results.file_exposure))
+            for item in _items(items)
+        ],
+        VulnerabilityFinding: [
+            {**common, "title": item, "severity": None} if isinstance(item, str)
+            else {**common, "title": _field(item, "title"), "severity": _field(item, "severity")}
+            for item in _items(results.vulnerabilities)
+        ],
+        TLSCertificate: [],
+    }
+
+    tls = results.ssl_tls
+    if tls is not None and not isinstance(tls, str):
+        cert = _field(tls, "peer_cert") or {}
+        cipher = _field(tls, "cipher")
+        rows[TLSCertificate].append({
+            **common,
+            "subject": _cert_name(cert.get("subject")),
+            "issuer": _cert_name(cert.get("issuer")),
+            "not_before": _cert_time(cert.get("notBefore")),
+            "not_after": _cert_time(cert.get("notAfter")),
+            "protocol": _field(tls, "version"),
+            "cipher": cipher[0] if cipher else None,
+        })
+    return rows
+
+
+async def store_findings(session: AsyncSession, scan_id: str, domain: str, results: ScanResults,
+                         found_at: datetime):
+    """Bulk inserts the findings of a scan; the caller owns the transaction."""
+    for model, rows in finding_rows(scan_id, domain, results, found_at).items():
+        rows = [row for row in rows if all(row[key] is not None for key in ("port", "name", "url", "title")
+                                           if key in row)]
+        if rows:
+            await session.execute(insert(model), rows)
+
+
+async def query_findings(session: AsyncSession, finding_type: str, filters: Dict[str, Any],
+                         domain: Optional[str] = None, scan_id: Optional[str] = None,
+                         since: Optional[datetime] = None, until: Optional[datetime] = None,
+                         cursor: Optional[int] = None, limit: int = 100) -> dict:
+    """Returns one page of findings, newest first, plus the cursor of the next page.
+
+    Pages are keyed on the row id (rows are inserted in scan completion
+    order), so deep pages cost the same as the first one.
+    """
+    model, columns = FINDING_TYPES[finding_type]
+    query = select(model)
+    if domain:
+        query = query.where(model.domain == domain)
+    if scan_id:
+        query = query.where(model.scan_id == scan_id)
+    if since:
+        query = query.where(model.found_at >= since)
+    if until:
+        query = query.where(model.found_at < until)
+    for name, value in filters.items():
+        if value is not None:
+            query = query.where(columns[name] == value)
+    if cursor is not None:
+        query = query.where(model.id < cursor)
+
+    rows = (await session.execute(query.order_by(model.id.desc()).limit(limit + 1))).scalars().all()
+    names = [column.key for column in model.__table__.columns]
+    items = [{name: getattr(row, name) for name in names} for row in rows[:limit]]
+    return {"items": items, "next_cursor": rows[limit - 1].id if len(rows) > limit else None}
@@ -0,0 +1,302 @@
+"""Technology fingerprinting against a Wappalyzer-like signature database.
+
+Signatures (``src/data/fingerprints.json`` by default) are compiled once per
+process. Header, cookie and meta patterns are indexed by the header, cookie
+or meta name they apply to, so only the patterns for names a response
+actually carries are tried. Body (``html``) and ``scriptSrc`` patterns are
+indexed by a literal token every match must contain: the response is split
+into tokens in one pass and a regex only runs when its token is present.
+"""
+import bisect
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+DEFAULT_SIGNATURES = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "fingerprints.json")
+
+# Categories that fill the matching field of ``Fingerprint``.
+FINGERPRINT_FIELDS = {"web_server": "web_server", "framework": "framework", "language": "language"}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_META = re.compile(r"<meta\s[^>]*>", re.I)
+_ATTRIBUTE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_SCRIPT_SRC = re.compile(r"""<script[^>]*\ssrc\s*=\s*["']?([^"'\s>]+)""", re.I)
+_MIN_TOKEN = 3
+
+
+def _is_token_char(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+@dataclass
+class Pattern:
+    """One compiled signature pattern of a technology."""
+    technology: str
+    regex: Optional[re.Pattern]  # None matches any value (presence check)
+    version: Optional[str] = None
+    confidence: int = 100
+    anchor: Optional[Tuple[str, bool, bool]] = None  # (token, bounded on the left, bounded on the right)
+
+    def match(self, value: str) -> Optional[Tuple[int, Optional[str]]]:
+        """Returns ``(confidence, version)`` when the pattern matches ``value``."""
+        if self.regex is None:
+            return self.confidence, None
+        found = self.regex.search(value)
+        if found is None:
+            return None
+        version = None
+        if self.version:
+            version = re.sub(r"\\(\d)", lambda ref: found.group(int(ref.group(1))) or "", self.version).strip() or None
+        return self.confidence, version
+
+
+def parse_pattern(technology: str, spec: str) -> Pattern:
+    """Parses ``regex\\;version:\\1\\;confidence:50`` into a compiled, anchored ``Pattern``."""
+    regex, *tags = spec.split("\\;")
+    options = dict(tag.split(":", 1) for tag in tags if ":" in tag)
+    compiled = re.compile(regex, re.I) if regex else None
+    return Pattern(
+        technology=technology,
+        regex=compiled,
+        version=options.get("version"),
+        confidence=int(options.get("confidence", 100)),
+        anchor=required_token(regex) if regex else None,
+    )
+
+
+def _flatten(parsed, items: list):
+    """Appends the pattern's mandatory sequence as characters, "boundary" or "other" markers."""
+    for op, av in parsed:
+        name = str(op)
+        if name == "LITERAL":
+            items.append(chr(av).lower())
+        elif name == "SUBPATTERN":
+            _flatten(av[-1], items)
+        elif name == "AT":
+            items.append("other" if str(av) == "AT_NON_BOUNDARY" else "boundary")
+        elif name == "IN" and all(str(kind) == "LITERAL" and not _is_token_char(chr(value)) for kind, value in av):
+            items.append("boundary")  # A class of separators only, such as [-.]
+        else:
+            items.append("other")
+
+
+def required_token(regex: str) -> Optional[Tuple[str, bool, bool]]:
+    """The best token every match of ``regex`` must contain, or None when there is none.
+
+    Tokens are runs of ASCII letters and digits taken from the mandatory
+    literal parts of the pattern. A token is bounded on a side when the
+    pattern puts a separator or an anchor there, which lets the index check it
+    with an exact or prefix/suffix lookup instead of a substring search.
+    """
+    try:
+        parsed = sre_parse.parse(regex, re.I)
+    except re.error:
+        return None
+    items: list = []
+    _flatten(parsed, items)
+
+    best, best_score = None, None
+    index = 0
+    while index < len(items):
+        if len(items[index]) != 1 or not _is_token_char(items[index]):
+            index += 1
+            continue
+        start = index
+        while index < len(items) and len(items[index]) == 1 and _is_token_char(items[index]):
+            index += 1
+        token = "".join(items[start:index])
+        if len(token) < _MIN_TOKEN:
+            continue
+        left = start > 0 and items[start - 1] != "other"
+        right = index < len(items) and items[index] != "other"
+        score = (left or right, len(token), left + right)  # A bounded side avoids the substring search
+        if best_score is None or score > best_score:
+            best, best_score = (token, left, right), score
+    return best
+
+
+class TokenIndex:
+    """The distinct tokens of a text, answering "does the text contain this token" quickly."""
+
+    def __init__(self, text: str):
+        self.tokens: Set[str] = set(_TOKEN.findall(text.lower()))
+        self._sorted: Optional[List[str]] = None
+        self._reversed: Optional[List[str]] = None
+        self._blob: Optional[str] = None
+
+    @staticmethod
+    def _has_prefix(ordered: List[str], prefix: str) -> bool:
+        position = bisect.bisect_left(ordered, prefix)
+        return position < len(ordered) and ordered[position].startswith(prefix)
+
+    def contains(self, token: str, left: bool, right: bool) -> bool:
+        if left and right:
+            return token in self.tokens
+        if left:
+            if self._sorted is None:
+                self._sorted = sorted(self.tokens)
+            return self._has_prefix(self._sorted, token)
+        if right:
+            if self._reversed is None:
+                self._reversed = sorted(value[::-1] for value in self.tokens)
+            return self._has_prefix(self._reversed, token[::-1])
+        if self._blob is None:
+            self._blob = "\n".join(self.tokens)
+        return token in self._blob
+
+
+@dataclass
+class Detection:
+    name: str
+    categories: List[str]
+    version: Optional[str] = None
+    confidence: int = 0
+    implied_by: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "version": self.version, "categories": self.categories,
+                "confidence": self.confidence, "implied_by": self.implied_by}
+
+
+@dataclass
+class _BodyPatterns:
+    anchored: Dict[Tuple[str, bool, bool], List[Pattern]] = field(default_factory=dict)
+    unanchored: List[Pattern] = field(default_factory=list)
+
+    def add(self, pattern: Pattern):
+        if pattern.anchor is None:
+            self.unanchored.append(pattern)
+        else:
+            self.anchored.setdefault(pattern.anchor, []).append(pattern)
+
+    def candidates(self, index: TokenIndex) -> List[Pattern]:
+        """The patterns whose anchor token occurs in the indexed text, plus those without one."""
+        found = list(self.unanchored)
+        for anchor, patterns in self.anchored.items():
+            if index.contains(*anchor):
+                found.extend(patterns)
+        return found
+
+    def __len__(self):
+        return len(self.unanchored) + sum(map(len, self.anchored.values()))
+
+
+class FingerprintEngine:
+    """Matches HTTP responses against every loaded signature."""
+
+    def __init__(self, technologies: Dict[str, dict]):
+        self.technologies = technologies
+        self.headers: Dict[str, List[Pattern]] = {}
+        self.cookies: Dict[str, List[Pattern]] = {}
+        self.meta: Dict[str, List[Pattern]] = {}
+        self.html = _BodyPatterns()
+        self.script_src = _BodyPatterns()
+        for name, spec in technologies.items():
+            for header, pattern in spec.get("headers", {}).items():
+                self.headers.setdefault(header.lower(), []).append(parse_pattern(name, pattern))
+            for cookie, pattern in spec.get("cookies", {}).items():
+                self.cookies.setdefault(cookie.lower(), []).append(parse_pattern(name, pattern))
+            for meta, patterns in spec.get("meta", {}).items():
+                for pattern in _as_list(patterns):
+                    self.meta.setdefault(meta.lower(), []).append(parse_pattern(name, pattern))
+            for pattern in _as_list(spec.get("html", [])):
+                self.html.add(parse_pattern(name, pattern))
+            for pattern in _as_list(spec.get("scriptSrc", [])):
+                self.script_src.add(parse_pattern(name, pattern))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_SIGNATURES) -> "FingerprintEngine":
+        with open(path, "r", encoding="utf-8") as signatures:
+            return cls(json.load(signatures)["technologies"])
+
+    def pattern_count(self) -> int:
+        keyed = sum(len(patterns) for index in (self.headers, self.cookies, self.meta) for patterns in index.values())
+        return keyed + len(self.html) + len(self.script_src)
+
+    def analyze(self, headers: Dict[str, str], body: str = "", cookies: Optional[Dict[str, str]] = None) -> List[Detection]:
+        """Returns the technologies detected in one response, implied ones included."""
+        hits: Dict[str, Detection] = {}
+
+        def record(pattern: Pattern, value: str):
+            matched = pattern.match(value)
+            if matched is None:
+                return
+            confidence, version = matched
+            detection = hits.get(pattern.technology)
+            if detection is None:
+                detection = hits[pattern.technology] = Detection(
+                    pattern.technology, self.technologies[pattern.technology].get("cats", []))
+            detection.confidence = min(100, detection.confidence + confidence)
+            if version and (detection.version is None or len(version) > len(detection.version)):
+                detection.version = version
+
+        for name, value in headers.items():
+            for pattern in self.headers.get(name.lower(), ()):
+                record(pattern, value)
+        for name, value in (cookies or {}).items():
+            for pattern in self.cookies.get(name.lower(), ()):
+                record(pattern, value)
+
+        if body:
+            for tag in _META.finditer(body):
+                attributes = {key.lower(): double or single or bare
+                              for key, double, single, bare in _ATTRIBUTE.findall(tag.group(0))}
+                meta_name = (attributes.get("name") or attributes.get("property") or "").lower()
+                for pattern in self.meta.get(meta_name, ()):
+                    record(pattern, attributes.get("content", ""))
+
+            sources = "\n".join(_SCRIPT_SRC.findall(body))
+            if sources:
+                source_list = sources.split("\n")
+                for pattern in self.script_src.candidates(TokenIndex(sources)):
+                    for source in source_list:
+                        record(pattern, source)
+
+            for pattern in self.html.candidates(TokenIndex(body)):
+                record(pattern, body)
+
+        self._add_implied(hits)
+        return sorted(hits.values(), key=lambda detection: detection.name)
+
+    def _add_implied(self, hits: Dict[str, Detection]):
+        pending = list(hits.values())
+        while pending:
+            detection = pending.pop()
+            for implied in self.technologies[detection.name].get("implies", []):
+                name = implied.split("\\;", 1)[0]
+                if name in hits or name not in self.technologies:
+                    continue
+                hits[name] = Detection(name, self.technologies[name].get("cats", []), confidence=detection.confidence,
+                                       implied_by=detection.name)
+                pending.append(hits[name])
+
+
+def _as_list(value) -> Sequence[str]:
+    return [value] if isinstance(value, str) else value
+
+
+def summarize(detections: Sequence[Detection]) -> Dict[str, Optional[str]]:
+    """Fills the ``Fingerprint`` fields with the best detection of each category (direct matches before implied ones)."""
+    summary: Dict[str, Optional[str]] = {name: None for name in FINGERPRINT_FIELDS.values()}
+    ranked = sorted(detections, key=lambda item: (item.implied_by is None, item.confidence, item.version is not None),
+                    reverse=True)
+    for detection in ranked:
+        for category in detection.categories:
+            name = FINGERPRINT_FIELDS.get(category)
+            if name and summary[name] is None:
+                summary[name] = f"{detection.name} {detection.version}" if detection.version else detection.name
+    return summary
+
+
+@lru_cache(maxsize=None)
+def get_engine(path: str = "") -> FingerprintEngine:
+    """The engine for ``path`` (the bundled signatures when empty), compiled on first use."""
+    return FingerprintEngine.load(path or DEFAULT_SIGNATURES)
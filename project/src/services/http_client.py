@@ -0,0 +1,128 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from src.config import settings
+from src.services.dns_cache import CachedResolver, dns_cache
+
+# Status codes servers answer with when a route does not support HEAD.
+HEAD_UNSUPPORTED = {405, 501}
+
+
+@dataclass
+class HttpResponse:
+    """Status, headers and (possibly truncated) body of a probed URL."""
+    url: str
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    truncated: bool = False
+    cookies: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+class HttpClient:
+    """Process-wide HTTP client shared by every scanner stage.
+
+    One ``aiohttp`` session and connector are kept for the lifetime of the
+    application so connections are reused (keep-alive) within the per-host
+    limit and host names are resolved through the shared DNS cache. Bodies
+    are read as a stream and cut off at ``max_body_bytes``.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 8, timeout: float = 10.0,
+                 max_body_bytes: int = 1024 * 1024, keepalive_timeout: float = 30.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.max_body_bytes = max_body_bytes
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+
+    def _build_connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            resolver=CachedResolver(dns_cache),
+            use_dns_cache=False,  # The shared cache already honours record TTLs
+            keepalive_timeout=self.keepalive_timeout,
+            ssl=False,  # Targets are probed even when their certificate is invalid
+        )
+
+    async def start(self):
+        """Opens the shared session; safe to call more than once."""
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(
+                    connector=self._build_connector(),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers={"User-Agent": "BugGPT-Scanner/1.0"},
+                )
+
+    async def close(self):
+        """Closes the session and every pooled connection."""
+        async with self._lock:
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Returns the shared session, opening it on first use outside the app lifespan."""
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    async def _read_body(self, response: aiohttp.ClientResponse, max_bytes: int):
+        chunks, size = [], 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                return b"".join(chunks)[:max_bytes], True
+        return b"".join(chunks), False
+
+    async def fetch(self, url: str, method: str = "GET", max_bytes: Optional[int] = None,
+                    allow_redirects: bool = True, **kwargs) -> HttpResponse:
+        """Requests ``url`` and reads at most ``max_bytes`` of the body of the final response."""
+        max_bytes = self.max_body_bytes if max_bytes is None else max_bytes
+        session = await self.get_session()
+        async with session.request(method, url, allow_redirects=allow_redirects, **kwargs) as response:
+            body, truncated = (b"", False)
+            if method != "HEAD" and max_bytes > 0:
+                body, truncated = await self._read_body(response, max_bytes)
+            cookies = {name: morsel.value for name, morsel in response.cookies.items()}
+            return HttpResponse(str(response.url), response.status, dict(response.headers), body, truncated, cookies)
+
+    async def probe(self, url: str, **kwargs) -> HttpResponse:
+        """Checks ``url`` with a HEAD request, falling back to a body-less GET when HEAD is not supported."""
+        response = await self.fetch(url, method="HEAD", **kwargs)
+        if response.status in HEAD_UNSUPPORTED:
+            response = await self.fetch(url, method="GET", max_bytes=0, **kwargs)
+        return response
+
+    async def stream(self, url: str, chunk_size: int = 64 * 1024, max_bytes: Optional[int] = None,
+                     **kwargs) -> AsyncIterator[bytes]:
+        """Yields the body of ``url`` chunk by chunk, stopping at ``max_bytes``."""
+        max_bytes = self.max_body_bytes if max_bytes is None else max_bytes
+        session = await self.get_session()
+        async with session.get(url, **kwargs) as response:
+            remaining = max_bytes
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk[:remaining]
+                remaining -= len(chunk)
+                if remaining <= 0:
+                    break
+
+
+http_client = HttpClient(
+    limit=settings.http_max_connections,
+    limit_per_host=settings.http_connections_per_host,
+    timeout=settings.http_timeout,
+    max_body_bytes=settings.http_max_body_bytes,
+)
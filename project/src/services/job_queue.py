@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import async_session
+from src.models.scan import Scan, ScanEvent, ScanJob
+from src.utils.serialization import dumps_str
+
+# Durable scan queue shared by the API process and `python -m src.worker`.
+# A worker claims a job by taking a time-limited lease on it and keeps the
+# lease alive with heartbeats; a job whose lease runs out (the worker died or
+# was restarted) becomes claimable again.
+
+
+def _claimable(now: datetime):
+    return or_(
+        ScanJob.status == "queued",
+        and_(ScanJob.status == "running", ScanJob.lease_expires_at < now),
+    )
+
+
+async def enqueue(session: AsyncSession, scan_id: str, domain: str, priority: int = 0, incremental: bool = False):
+    """Adds a job to the session; the caller commits it together with its Scan row."""
+    session.add(ScanJob(scan_id=scan_id, domain=domain, priority=priority, incremental=incremental, status="queued"))
+
+
+async def depth(session: AsyncSession) -> int:
+    """Number of jobs waiting for a worker."""
+    return await session.scalar(select(func.count()).select_from(ScanJob).where(ScanJob.status == "queued"))
+
+
+async def claim(worker_id: str, lease_seconds: int, max_attempts: int) -> Optional[ScanJob]:
+    """Leases the next job to ``worker_id``, or returns None when nothing is waiting."""
+    async with async_session() as session:
+        while True:
+            now = datetime.utcnow()
+            job = (await session.execute(
+                select(ScanJob).where(_claimable(now))
+                .order_by(ScanJob.priority.desc(), ScanJob.created_at)
+                .limit(1)
+            )).scalars().first()
+            if job is None:
+                return None
+
+            if job.attempts >= max_attempts:
+                await _give_up(session, job)
+                await session.commit()
+                continue
+
+            # Only one worker can win the conditional update for a given job
+            claimed = await session.execute(
+                update(ScanJob)
+                .where(ScanJob.scan_id == job.scan_id, _claimable(now))
+                .values(
+                    status="running",
+                    worker_id=worker_id,
+                    attempts=ScanJob.attempts + 1,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                )
+            )
+            await session.commit()
+            if claimed.rowcount == 1:
+                await session.refresh(job)
+                return job
+
+
+async def _give_up(session: AsyncSession, job: ScanJob):
+    """Fails a job that used up its attempts, its scan, and tells clients the scan is over."""
+    message = f"Scan failed after {job.attempts} attempts"
+    await session.execute(update(ScanJob).where(ScanJob.scan_id == job.scan_id).values(status="failed"))
+    await session.execute(update(Scan).where(Scan.id == job.scan_id).values(status="failed"))
+    progress = await session.scalar(select(Scan.progress).where(Scan.id == job.scan_id))
+    session.add(ScanEvent(scan_id=job.scan_id, event="scan_progress",
+                          payload=dumps_str({"progress": progress or 0, "message": message, "final": True})))
+
+
+async def heartbeat(scan_id: str, worker_id: str, lease_seconds: int) -> bool:
+    """Extends the lease; returns False if the job now belongs to another worker."""
+    async with async_session() as session:
+        renewed = await session.execute(
+            update(ScanJob)
+            .where(ScanJob.scan_id == scan_id, ScanJob.worker_id == worker_id, ScanJob.status == "running")
+            .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+        )
+        await session.commit()
+        return renewed.rowcount == 1
+
+
+async def finish(scan_id: str, worker_id: str, status: str):
+    """Marks a leased job as done or failed."""
+    async with async_session() as session:
+        await session.execute(
+            update(ScanJob)
+            .where(ScanJob.scan_id == scan_id, ScanJob.worker_id == worker_id)
+            .values(status=status, lease_expires_at=None)
+        )
+        await session.commit()
+
+
+async def position(session: AsyncSession, scan_id: str) -> Optional[int]:
+    """Returns the 1-based position of a queued job, 0 while running, or None if there is no job."""
+    job = await session.get(ScanJob, scan_id)
+    if job is None or job.status in ("done", "failed"):
+        return None
+    if job.status == "running":
+        return 0
+    ahead = await session.scalar(
+        select(func.count()).select_from(ScanJob).where(
+            ScanJob.status == "queued",
+            or_(
+                ScanJob.priority > job.priority,
+                and_(ScanJob.priority == job.priority, ScanJob.created_at < job.created_at),
+            ),
+        )
+    )
+    return ahead + 1
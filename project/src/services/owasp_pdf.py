@@ -0,0 +1,137 @@
+"""Analysis of uploaded OWASP/pentest PDFs.
+
+The upload is spooled to a private temp file, its pages are extracted in
+parallel in the CPU process pool (each chunk counts its risk levels and hands
+back only its leading lines, so the document's text never reaches the API
+process), and the summary PDF is rendered in memory. Nothing is written to
+shared paths, so concurrent uploads cannot interfere.
+"""
+import asyncio
+import io
+import os
+import re
+import tempfile
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from fastapi import UploadFile
+
+from src.config import settings
+from src.services.blocking_io import run_blocking
+from src.services.cpu_pool import run_in_process
+from src.utils.metrics import RENDER_DURATION, RENDER_ERRORS, RENDERS_IN_FLIGHT, track
+
+RISK_LEVELS = {
+    "CRITICAL": "Critical",
+    "HIGH": "High",
+    "MEDIUM": "Medium",
+    "LOW": "Low",
+    "BEST PRACTICE": "Best Practice",
+    "INFORMATION": "Information",
+}
+
+# One pass over the text finds every risk marker (same substring semantics as str.count).
+_RISK_PATTERN = re.compile("|".join(re.escape(marker) for marker in RISK_LEVELS))
+
+_CHUNK_BYTES = 1024 * 1024
+# Lines of extracted text shown on the summary page.
+SUMMARY_LINES = 15
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds ``upload_max_bytes``."""
+
+
+async def spool_upload(upload: UploadFile) -> str:
+    """Copies the upload in chunks to a private temp file and returns its path."""
+    fd, path = tempfile.mkstemp(prefix="owasp-upload-", suffix=".pdf")
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while True:
+                chunk = await upload.read(_CHUNK_BYTES)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > settings.upload_max_bytes:
+                    raise UploadTooLargeError(f"Upload exceeds {settings.upload_max_bytes} bytes")
+                await run_blocking(spool.write, chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def count_risks(text: str) -> Counter:
+    return Counter(match.group(0) for match in _RISK_PATTERN.finditer(text))
+
+
+def page_count(path: str) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pages(path: str, start: int, stop: int, lines: int = SUMMARY_LINES) -> Tuple[List[str], Counter]:
+    """Extracts pages ``start:stop``, returning their first ``lines`` lines and risk counts; runs in the CPU pool."""
+    import pdfplumber
+
+    with pdfplumber.open(path, pages=list(range(start + 1, stop + 1))) as pdf:
+        texts = [text for text in (page.extract_text() for page in pdf.pages) if text]
+    text = "\n".join(texts)
+    return (text.split("\n")[:lines] if text else []), count_risks(text)
+
+
+async def extract_text(path: str, lines: int = SUMMARY_LINES) -> Tuple[List[str], Dict[str, int]]:
+    """Returns the first ``lines`` lines of the PDF and its risk level counts, extracting page ranges in parallel."""
+    pages = await run_in_process(page_count, path)
+    chunks = max(1, min(pages, settings.cpu_workers * 2))
+    bounds = [(pages * i // chunks, pages * (i + 1) // chunks) for i in range(chunks)]
+    parts = await asyncio.gather(*(run_in_process(extract_pages, path, start, stop, lines)
+                                   for start, stop in bounds if stop > start))
+
+    counts = Counter()
+    leading = []
+    for part_lines, part_counts in parts:
+        counts.update(part_counts)
+        leading.extend(part_lines[:lines - len(leading)])
+    return leading, {label: counts.get(marker, 0) for marker, label in RISK_LEVELS.items()}
+
+
+def render_summary_pdf(summary_lines: List[str], risk_levels: Dict[str, int]) -> bytes:
+    """Renders the OWASP summary PDF into memory; runs in the CPU pool."""
+    from reportlab.graphics import renderPDF
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    from src.utils.charts import risk_breakdown_chart
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(30, height - 50, "OWASP Vulnerability Report")
+
+    c.setFont("Helvetica", 12)
+    y_position = height - 80
+    for line in summary_lines:
+        c.drawString(30, y_position, line)
+        y_position -= 20
+
+    chart = risk_breakdown_chart(risk_levels, width=300, height=200)
+    renderPDF.draw(chart, c, 100, y_position - 210)
+    c.save()
+    return buffer.getvalue()
+
+
+async def analyze_upload(upload: UploadFile) -> bytes:
+    """Runs the whole pipeline for one upload and returns the summary PDF."""
+    with track(RENDER_DURATION, "owasp_upload", errors=RENDER_ERRORS, in_flight=RENDERS_IN_FLIGHT):
+        path = await spool_upload(upload)
+        try:
+            summary_lines, risk_levels = await extract_text(path)
+        finally:
+            os.remove(path)
+        return await run_in_process(render_summary_pdf, summary_lines, risk_levels)
@@ -0,0 +1,131 @@
+import asyncio
+import socket
+from typing import Iterable, List, Optional, Union
+
+from src.services.dns_cache import dns_cache
+
+# Commonly open TCP ports, most common first (nmap's top-ports ordering).
+TOP_PORTS = [
+    80, 23, 443, 21, 22, 25, 3389, 110, 445, 139, 143, 53, 135, 3306, 8080, 1723, 111, 995, 993, 5900,
+    1025, 587, 8888, 199, 1720, 465, 548, 113, 81, 6001, 10000, 514, 5060, 179, 1026, 2000, 8443, 8000,
+    32768, 554, 26, 1433, 49152, 2001, 515, 8008, 49154, 1027, 5666, 646, 5000, 5631, 631, 49153, 8081,
+    2049, 88, 79, 5800, 106, 2121, 1110, 49155, 6000, 513, 990, 5357, 427, 49156, 543, 544, 5101, 144,
+    7, 389, 9, 13, 37, 119, 444, 873, 1028, 1029, 1755, 1900, 2717, 3000, 3128, 3986, 4899, 5009, 5051,
+    5190, 5432, 6646, 7070, 8009, 9100, 9999, 49157,
+]
+
+OPEN = "open"
+CLOSED = "closed"
+FILTERED = "filtered"
+
+
+def top_ports(count: int) -> List[int]:
+    """Returns the ``count`` most common ports, padded with the lowest remaining port numbers."""
+    ports = TOP_PORTS[:count]
+    if count > len(ports):
+        known = set(ports)
+        ports += [port for port in range(1, 65536) if port not in known][:count - len(ports)]
+    return ports
+
+
+def parse_ports(spec: Union[str, int, Iterable[Union[str, int]]]) -> List[int]:
+    """Parses a port specification such as ``"22,80,8000-8100,top-100"`` into a de-duplicated port list."""
+    if isinstance(spec, int):
+        items = [spec]
+    elif isinstance(spec, str):
+        items = spec.split(",")
+    else:
+        items = list(spec)
+
+    ports = []
+    for item in items:
+        item = str(item).strip().lower()
+        if not item:
+            continue
+        if item.startswith("top-"):
+            ports.extend(top_ports(int(item[4:])))
+        elif "-" in item:
+            low, high = (int(part) for part in item.split("-", 1))
+            ports.extend(range(low, high + 1))
+        else:
+            ports.append(int(item))
+
+    for port in ports:
+        if not 0 < port < 65536:
+            raise ValueError(f"Invalid port: {port}")
+    return list(dict.fromkeys(ports))
+
+
+class PortScanner:
+    """Non-blocking TCP connect scanner with bounded fan-out.
+
+    Connection timeouts adapt to the round-trip times measured on ports that
+    answer (open or refused), the same way TCP estimates its retransmission
+    timeout. Ports that do not answer at all are retried with the full
+    ``timeout`` (a shorter refined one would just time out again) before
+    being reported as filtered.
+    """
+
+    def __init__(self, concurrency: int = 500, timeout: float = 2.0, min_timeout: float = 0.25, retries: int = 1):
+        self.concurrency = concurrency
+        self.max_timeout = timeout
+        self.min_timeout = min_timeout
+        self.retries = retries
+        self.srtt: Optional[float] = None
+        self.rttvar: Optional[float] = None
+        self.filtered: List[int] = []
+
+    @property
+    def timeout(self) -> float:
+        """Current connect timeout derived from the smoothed RTT."""
+        if self.srtt is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar))
+
+    def _record_rtt(self, rtt: float):
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    async def _probe(self, family: int, address: tuple, semaphore: asyncio.Semaphore,
+                     timeout: Optional[float] = None) -> str:
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            started = loop.time()
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, address), timeout or self.timeout)
+                self._record_rtt(loop.time() - started)
+                return OPEN
+            except ConnectionRefusedError:
+                self._record_rtt(loop.time() - started)
+                return CLOSED
+            except (asyncio.TimeoutError, OSError):
+                return FILTERED
+            finally:
+                sock.close()
+
+    async def _resolve(self, host: str):
+        ip = (await dns_cache.resolve_host(host))[0]
+        return (socket.AF_INET6 if ":" in ip else socket.AF_INET), ip
+
+    async def scan(self, host: str, ports: Iterable[int]) -> List[int]:
+        """Scans ``ports`` on ``host`` and returns the open ones in ascending order."""
+        family, ip = await self._resolve(host)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        open_ports = []
+        pending = list(ports)
+
+        for attempt in range(self.retries + 1):
+            if not pending:
+                break
+            timeout = self.max_timeout if attempt else None  # Retries wait at least as long as the first try could
+            states = await asyncio.gather(*(self._probe(family, (ip, port), semaphore, timeout) for port in pending))
+            open_ports.extend(port for port, state in zip(pending, states) if state == OPEN)
+            pending = [port for port, state in zip(pending, states) if state == FILTERED]
+
+        self.filtered = sorted(pending)
+        return sorted(open_ports)
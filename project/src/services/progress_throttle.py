@@ -0,0 +1,64 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from src.utils.logger import logger
+
+
+class ProgressThrottle:
+    """Coalesces progress updates per scan before they go out to clients.
+
+    Each scan sends at most one update every ``interval`` seconds. Updates that
+    arrive in between replace each other and only the latest one is sent when
+    the interval ends. The latest state of every running scan is kept so that
+    clients subscribing late can be brought up to date.
+    """
+
+    def __init__(self, send: Callable[[str, dict], Awaitable[None]], interval: float = 0.25):
+        self.send = send
+        self.interval = interval
+        self._latest: Dict[str, dict] = {}
+        self._last_sent: Dict[str, float] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._flushes: Set[asyncio.Task] = set()
+
+    def state(self, scan_id: str) -> Optional[dict]:
+        """Returns the last progress update published for a running scan."""
+        return self._latest.get(scan_id)
+
+    async def publish(self, scan_id: str, payload: dict, force: bool = False):
+        """Records ``payload`` as the scan's state and sends it now or once the interval is over."""
+        self._latest[scan_id] = payload
+        wait = self._last_sent.get(scan_id, 0.0) + self.interval - time.monotonic()
+        if force or wait <= 0:
+            self._cancel_timer(scan_id)
+            await self._send(scan_id)
+        elif scan_id not in self._timers:
+            self._timers[scan_id] = asyncio.get_running_loop().call_later(wait, self._flush, scan_id)
+
+    def finish(self, scan_id: str):
+        """Drops a finished scan's state and any update still waiting to be sent."""
+        self._cancel_timer(scan_id)
+        self._latest.pop(scan_id, None)
+        self._last_sent.pop(scan_id, None)
+
+    def _cancel_timer(self, scan_id: str):
+        timer = self._timers.pop(scan_id, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _flush(self, scan_id: str):
+        self._timers.pop(scan_id, None)
+        task = asyncio.create_task(self._send(scan_id))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send(self, scan_id: str):
+        payload = self._latest.get(scan_id)
+        if payload is None:
+            return
+        self._last_sent[scan_id] = time.monotonic()
+        try:
+            await self.send(scan_id, payload)
+        except Exception as e:
+            logger.warning("Failed to send progress for %s: %s", scan_id, e)
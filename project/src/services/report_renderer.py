@@ -0,0 +1,78 @@
+import asyncio
+import os
+from typing import Dict, Optional
+
+from src.config import settings
+from src.services.cpu_pool import run_in_process
+from src.services.result_cache import CachedResult, result_cache
+from src.utils.logger import logger
+from src.utils.metrics import RENDER_DURATION, RENDER_ERRORS, RENDERS_IN_FLIGHT, track
+from src.utils.report_generator import TEMPLATE_VERSION, render_report
+
+
+class ReportRenderer:
+    """Renders scan PDFs in the CPU pool and caches them on disk by content.
+
+    A PDF is stored as ``<result hash>-v<template version>.pdf``, so it is
+    rendered once per distinct result and layout, whichever scan or request
+    asks for it. Requests for a PDF that is being rendered share that render.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._failures: Dict[str, str] = {}
+
+    @staticmethod
+    def key(entry: CachedResult) -> str:
+        digest = entry.etag.strip('"')  # The ETag is the content hash of the stored result
+        return f"{digest}-v{TEMPLATE_VERSION}"
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def state(self, key: str) -> dict:
+        if os.path.exists(self.path(key)):
+            return {"status": "ready"}
+        if key in self._inflight:
+            return {"status": "rendering"}
+        if key in self._failures:
+            return {"status": "failed", "error": self._failures[key]}
+        return {"status": "missing"}
+
+    async def _render(self, key: str, body: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with track(RENDER_DURATION, "scan_report", errors=RENDER_ERRORS, in_flight=RENDERS_IN_FLIGHT):
+                await run_in_process(render_report, body, self.path(key))
+            self._failures.pop(key, None)
+        except Exception as e:
+            self._failures[key] = str(e)
+            logger.exception("Report rendering failed for %s", key)
+            raise
+
+    def start(self, key: str, entry: CachedResult) -> Optional[asyncio.Task]:
+        """Starts rendering unless the PDF exists already; returns the (possibly shared) render."""
+        if os.path.exists(self.path(key)):
+            return None
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._render(key, entry.body), name=f"report:{key}")
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None))
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())  # Consumed by waiters, if any
+        return task
+
+    async def ensure(self, scan_id: str) -> Optional[str]:
+        """Returns the path of the scan's PDF, rendering it first if needed; None if the scan has no results."""
+        entry = await result_cache.load(scan_id)
+        if entry is None:
+            return None
+        key = self.key(entry)
+        task = self.start(key, entry)
+        if task is not None:
+            await asyncio.shield(task)
+        return self.path(key)
+
+
+report_renderer = ReportRenderer(settings.report_path)
@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from src.config import settings
+from src.database import async_session
+from src.models.scan import ScanResult
+from src.services.blocking_io import run_blocking
+
+try:
+    import brotli
+except ImportError:  # Pinned in requirements.txt; without it only gzip is served
+    brotli = None
+
+
+@dataclass(slots=True)
+class CachedResult:
+    """A stored report, ready to send: raw JSON, its ETag and precompressed variants."""
+    body: bytes
+    etag: str
+    gzip: Optional[bytes] = None
+    br: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip or b"") + len(self.br or b"")
+
+
+def _encode(body: bytes, min_compress_bytes: int) -> CachedResult:
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    if len(body) < min_compress_bytes:
+        return CachedResult(body, etag)
+    return CachedResult(
+        body,
+        etag,
+        gzip=gzip.compress(body, compresslevel=6),
+        br=brotli.compress(body, quality=5) if brotli is not None else None,
+    )
+
+
+class ResultCache:
+    """LRU of finished scan reports, bounded by the total size of the cached bytes.
+
+    Results never change once a scan has finished, so entries are only ever
+    evicted, never invalidated. Hashing and compression happen once per
+    entry, in the blocking I/O pool.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, min_compress_bytes: int = 1024):
+        self.max_bytes = max_bytes
+        self.min_compress_bytes = min_compress_bytes
+        self._entries: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, scan_id: str) -> Optional[CachedResult]:
+        entry = self._entries.get(scan_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(scan_id)
+        return entry
+
+    async def put(self, scan_id: str, body: bytes) -> CachedResult:
+        """Encodes ``body`` and caches it (unless it alone exceeds the byte budget)."""
+        entry = await run_blocking(_encode, body, self.min_compress_bytes)
+        if entry.size > self.max_bytes:
+            return entry
+        previous = self._entries.pop(scan_id, None)
+        if previous is not None:
+            self.size -= previous.size
+        self._entries[scan_id] = entry
+        self.size += entry.size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+        return entry
+
+    async def load(self, scan_id: str) -> Optional[CachedResult]:
+        """Returns the cached report of a finished scan, reading it from the database on a miss."""
+        entry = self.get(scan_id)
+        if entry is not None:
+            return entry
+        async with async_session() as session:
+            record = await session.get(ScanResult, scan_id)
+        if record is None:
+            return None
+        return await self.put(scan_id, record.results.encode("utf-8"))
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+
+result_cache = ResultCache(
+    max_bytes=settings.result_cache_max_bytes,
+    min_compress_bytes=settings.result_cache_min_compress_bytes,
+)
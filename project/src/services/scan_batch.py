@@ -0,0 +1,214 @@
+import asyncio
+import re
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Set, Tuple
+from urllib.parse import urlparse
+
+import validators
+from sqlalchemy import insert, select, update
+
+from src.config import settings
+from src.database import async_session
+from src.models.scan import Scan, ScanBatch, ScanBatchItem, ScanJob, ScanResult
+from src.services.scan_queue import scan_queue
+from src.utils.serialization import dumps_str, loads
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+_SEPARATORS = re.compile(r"[\s,;]+")
+
+# Inline-mode feeders; kept so they are not garbage collected and can be cancelled on shutdown.
+_feeders: Set[asyncio.Task] = set()
+
+
+def parse_domain_list(text: str) -> List[str]:
+    """Splits an uploaded asset list into candidates: one or more per line, '#' starts a comment."""
+    candidates = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0]
+        candidates.extend(token for token in _SEPARATORS.split(line) if token)
+    return candidates
+
+
+def validate_domains(candidates: Iterable[str]) -> Tuple[List[str], List[str], int]:
+    """Normalizes candidates (lower case, URLs reduced to their host) and drops repeats.
+
+    Returns ``(valid, invalid, duplicates)`` with the valid domains in input order.
+    """
+    valid, invalid, seen = [], [], set()
+    duplicates = 0
+    for candidate in candidates:
+        domain = candidate.strip().lower()
+        if "://" in domain:
+            domain = urlparse(domain).hostname or ""
+        domain = domain.rstrip(".")
+        if domain in seen:
+            duplicates += 1
+            continue
+        seen.add(domain)
+        if validators.domain(domain):
+            valid.append(domain)
+        else:
+            invalid.append(candidate)
+    return valid, invalid, duplicates
+
+
+async def create_batch(domains: List[str], priority: int = 0, incremental: bool = False) -> str:
+    """Inserts the batch, its Scan rows and (in worker mode) their jobs in one transaction.
+
+    In inline mode the scans are then fed to the in-process queue as it makes
+    room for them, only up to ``feed_depth()`` waiting scans so single scans
+    still find room.
+    """
+    batch_id = str(uuid.uuid4())
+    scans = [(str(uuid.uuid4()), domain) for domain in domains]
+
+    async with async_session() as session:
+        async with session.begin():
+            await session.execute(insert(ScanBatch).values(id=batch_id, total=len(scans), priority=priority,
+                                                           incremental=incremental))
+            await session.execute(
+                insert(Scan),
+                [{"id": scan_id, "domain": domain, "status": "pending", "progress": 0} for scan_id, domain in scans],
+            )
+            await session.execute(
+                insert(ScanBatchItem),
+                [{"batch_id": batch_id, "scan_id": scan_id} for scan_id, _ in scans],
+            )
+            if settings.scan_execution == "worker":
+                now = datetime.utcnow()
+                await session.execute(
+                    insert(ScanJob),
+                    [{"scan_id": scan_id, "domain": domain, "priority": priority, "incremental": incremental,
+                      "status": "queued", "attempts": 0, "created_at": now} for scan_id, domain in scans],
+                )
+
+    if settings.scan_execution != "worker":
+        _start_feeder(batch_id, scans, priority, incremental)
+    return batch_id
+
+
+def feed_depth() -> int:
+    """Waiting scans the batch feeders stop at; the rest of the queue is kept for single scans."""
+    return max(1, settings.scan_batch_feed_depth or scan_queue.max_depth // 2)
+
+
+def _start_feeder(batch_id: str, scans: List[Tuple[str, str]], priority: int, incremental: bool):
+    feeder = asyncio.create_task(_feed(scans, priority, incremental), name=f"batch-feeder:{batch_id}")
+    _feeders.add(feeder)
+    feeder.add_done_callback(_feeders.discard)
+
+
+async def _feed(scans: List[Tuple[str, str]], priority: int, incremental: bool):
+    from src.services.scanner import Scanner
+
+    for scan_id, domain in scans:
+        await scan_queue.put(Scanner(domain, scan_id, incremental=incremental), priority, max_depth=feed_depth())
+
+
+def _unfinished_batch_scans():
+    return (
+        select(Scan.id)
+        .join(ScanBatchItem, ScanBatchItem.scan_id == Scan.id)
+        .where(Scan.status.not_in(TERMINAL_STATUSES))
+    )
+
+
+async def resume_batches() -> int:
+    """Feeds the unfinished scans of every batch again after a restart (inline mode); returns how many."""
+    async with async_session() as session:
+        async with session.begin():
+            rows = (await session.execute(
+                select(ScanBatch.id, ScanBatch.priority, ScanBatch.incremental, Scan.id, Scan.domain)
+                .join(ScanBatchItem, ScanBatchItem.batch_id == ScanBatch.id)
+                .join(Scan, Scan.id == ScanBatchItem.scan_id)
+                .where(Scan.status.not_in(TERMINAL_STATUSES))
+                .order_by(ScanBatch.created_at, Scan.id)
+            )).all()
+            if rows:
+                await session.execute(
+                    update(Scan).where(Scan.id.in_(_unfinished_batch_scans())).values(status="pending", progress=0)
+                    .execution_options(synchronize_session=False)
+                )
+
+    batches: Dict[str, Tuple[int, bool, List[Tuple[str, str]]]] = {}
+    for batch_id, priority, incremental, scan_id, domain in rows:
+        batches.setdefault(batch_id, (priority, incremental, []))[2].append((scan_id, domain))
+    for batch_id, (priority, incremental, scans) in batches.items():
+        _start_feeder(batch_id, scans, priority, incremental)
+    return len(rows)
+
+
+async def stop_feeders():
+    """Cancels the feeders and puts every unfinished batch scan back to "pending" for ``resume_batches``.
+
+    Call once the scan queue and the status writer have stopped, so no scan
+    overwrites the status afterwards.
+    """
+    for feeder in list(_feeders):
+        feeder.cancel()
+    await asyncio.gather(*_feeders, return_exceptions=True)
+    async with async_session() as session:
+        async with session.begin():
+            await session.execute(
+                update(Scan).where(Scan.id.in_(_unfinished_batch_scans())).values(status="pending", progress=0)
+                .execution_options(synchronize_session=False)
+            )
+
+
+async def _summaries(session, scan_ids: List[str]) -> Dict[str, dict]:
+    summaries = {}
+    for start in range(0, len(scan_ids), 500):
+        rows = await session.execute(
+            select(ScanResult.scan_id, ScanResult.results).where(ScanResult.scan_id.in_(scan_ids[start:start + 500]))
+        )
+        for scan_id, results in rows:
+            summaries[scan_id] = loads(results).get("summary")
+    return summaries
+
+
+async def stream_batch(batch_id: str, interval: float = 1.0) -> AsyncIterator[str]:
+    """Yields one NDJSON line per scan status change until every scan of the batch has finished.
+
+    Completed scans carry their report summary. The last line reports the
+    totals with ``"done": true``.
+    """
+    known: Dict[str, Tuple[str, int]] = {}
+    while True:
+        unfinished = [scan_id for scan_id, (status, _) in known.items() if status not in TERMINAL_STATUSES]
+        async with async_session() as session:
+            if not known:
+                rows = (await session.execute(
+                    select(Scan.id, Scan.domain, Scan.status, Scan.progress)
+                    .join(ScanBatchItem, ScanBatchItem.scan_id == Scan.id)
+                    .where(ScanBatchItem.batch_id == batch_id)
+                )).all()
+            else:  # Finished scans never change again
+                rows = []
+                for start in range(0, len(unfinished), 500):
+                    rows += (await session.execute(
+                        select(Scan.id, Scan.domain, Scan.status, Scan.progress)
+                        .where(Scan.id.in_(unfinished[start:start + 500]))
+                    )).all()
+            changed = [row for row in rows if known.get(row.id) != (row.status, row.progress)]
+            summaries = await _summaries(session, [row.id for row in changed if row.status == "completed"])
+
+        for row in changed:
+            known[row.id] = (row.status, row.progress)
+            line = {"scan_id": row.id, "domain": row.domain, "status": row.status, "progress": row.progress}
+            if row.id in summaries:
+                line["summary"] = summaries[row.id]
+            yield dumps_str(line) + "\n"
+
+        if all(status in TERMINAL_STATUSES for status, _ in known.values()):
+            statuses = [status for status, _ in known.values()]
+            yield dumps_str({
+                "batch_id": batch_id,
+                "done": True,
+                "total": len(statuses),
+                "completed": statuses.count("completed"),
+                "failed": statuses.count("failed"),
+            }) + "\n"
+            return
+        await asyncio.sleep(interval)
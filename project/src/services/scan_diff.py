@@ -0,0 +1,29 @@
+import json
+
+
+def _key(item) -> str:
+    return json.dumps(item, sort_keys=True, default=str)
+
+
+def diff_results(previous: dict, current: dict) -> dict:
+    """Returns what changed between two ``results`` dicts, keyed by result field.
+
+    Lists are compared as sets of items (``added``/``removed``); any other
+    value that differs is reported as ``before``/``after``. Unchanged fields
+    are left out, so an empty dict means nothing changed.
+    """
+    changes = {}
+    for field in sorted(set(previous) | set(current)):
+        before, after = previous.get(field), current.get(field)
+        if before == after:
+            continue
+        if isinstance(before, list) and isinstance(after, list):
+            before_keys = {_key(item) for item in before}
+            after_keys = {_key(item) for item in after}
+            changes[field] = {
+                "added": [item for item in after if _key(item) not in before_keys],
+                "removed": [item for item in before if _key(item) not in after_keys],
+            }
+        else:
+            changes[field] = {"before": before, "after": after}
+    return changes
@@ -0,0 +1,123 @@
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.config import settings
+from src.utils.logger import logger
+
+
+class QueueFullError(Exception):
+    """Raised when a scan is submitted while the queue is at its depth limit."""
+
+
+@dataclass(order=True)
+class _Job:
+    sort_key: tuple
+    scanner: object = field(compare=False)
+
+    @property
+    def scan_id(self) -> str:
+        return self.scanner.scan_id
+
+
+class ScanQueue:
+    """Bounded scan queue drained by a fixed pool of async workers.
+
+    Jobs with a higher ``priority`` run first and jobs of equal priority run
+    in submission order. Every scan is cancelled once it exceeds ``timeout``
+    seconds, and ``submit`` refuses new work once ``max_depth`` scans are
+    waiting so that bursts are pushed back to the client.
+    """
+
+    def __init__(self, workers: int = 5, max_depth: int = 100, timeout: Optional[float] = 300):
+        self.workers = workers
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._waiting: Dict[str, _Job] = {}
+        self._running: Dict[str, object] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._sequence = itertools.count()
+        self._not_full: Optional[asyncio.Condition] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._waiting)
+
+    def full(self) -> bool:
+        return self.depth >= self.max_depth
+
+    async def start(self):
+        """Starts the worker pool; called from the application lifespan."""
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._not_full = asyncio.Condition()
+        self._tasks = [asyncio.create_task(self._worker(), name=f"scan-worker-{i}") for i in range(self.workers)]
+
+    async def stop(self):
+        """Cancels the workers together with the scans they are running."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, scanner, priority: int = 0) -> int:
+        """Queues ``scanner`` and returns its 1-based position in the queue."""
+        if self._queue is None:
+            raise RuntimeError("Scan queue has not been started")
+        if self.full():
+            raise QueueFullError(f"Scan queue is full ({self.max_depth} scans waiting)")
+        job = _Job((-priority, next(self._sequence)), scanner)
+        self._waiting[job.scan_id] = job
+        self._queue.put_nowait(job)
+        return self.position(job.scan_id)
+
+    async def put(self, scanner, priority: int = 0, max_depth: Optional[int] = None) -> int:
+        """Like ``submit``, but waits until fewer than ``max_depth`` (default: the queue limit) scans are waiting."""
+        if self._not_full is None:
+            raise RuntimeError("Scan queue has not been started")
+        limit = min(max_depth or self.max_depth, self.max_depth)
+        async with self._not_full:
+            await self._not_full.wait_for(lambda: self.depth < limit)
+            return self.submit(scanner, priority)
+
+    def position(self, scan_id: str) -> Optional[int]:
+        """Returns the 1-based queue position, 0 while running, or None if the queue does not know the scan."""
+        if scan_id in self._running:
+            return 0
+        job = self._waiting.get(scan_id)
+        if job is None:
+            return None
+        return 1 + sum(1 for other in self._waiting.values() if other.sort_key < job.sort_key)
+
+    async def _run(self, job: _Job):
+        scanner = job.scanner
+        try:
+            await asyncio.wait_for(scanner.start(), self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Scan %s exceeded %ss and was cancelled", job.scan_id, self.timeout)
+            await scanner.fail(f"Scan timed out after {self.timeout} seconds")
+        except Exception as e:
+            logger.error("Scan %s failed in worker: %s", job.scan_id, e)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self._waiting.pop(job.scan_id, None)
+            self._running[job.scan_id] = job.scanner
+            async with self._not_full:
+                self._not_full.notify_all()  # Waiters may be held at different depths
+            try:
+                await self._run(job)
+            finally:
+                self._running.pop(job.scan_id, None)
+                self._queue.task_done()
+
+
+scan_queue = ScanQueue(
+    workers=settings.max_concurrent_scans,
+    max_depth=settings.scan_queue_max_depth,
+    timeout=settings.scan_timeout,
+)
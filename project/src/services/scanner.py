@@ -1,171 +1,169 @@
 import asyncio
+import time
 from datetime import datetime
 from src.database import async_session
 from src.models.scan import Scan, ScanResult
-import json
-import aiohttp
-import nmap
+from src.config import settings
+from src.services.stage_scheduler import Stage, StageScheduler
+from src.services.port_scanner import PortScanner, parse_ports
+from src.services.http_client import http_client
+from src.services.dns_cache import dns_cache
+from src.services.whois_cache import whois_cache
+from src.services.blocking_io import run_blocking
+from src.services.fingerprinter import get_engine, summarize
+from src.services.crawler import Crawler
+from src.services.subdomain_bruteforce import SubdomainBruteforcer, iter_wordlist, DEFAULT_WORDLIST
+from src.services.events import emit_scan_progress, emit_scan_partial, emit_scan_complete
+from src.services.scan_diff import diff_results
+from src.services.findings import store_findings
+from src.services.status_writer import status_writer
+from src.models.results import Fingerprint, ScanResults, TLSInfo
+from src.utils.metrics import DB_WRITE_DURATION, DB_WRITE_ERRORS, SCAN_DURATION, SCANS_IN_FLIGHT, track
+from src.utils.logger import logger
+from src.utils.serialization import dumps, dumps_str, loads
+from sqlalchemy import select
 import ssl
-import socket
-import dns.resolver
-import whois
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-import re
-import subprocess
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import padding
-from OpenSSL import SSL
+
+HOUR = 3600
+
 
 class Scanner:
-    def __init__(self, domain: str, scan_id: str):
+    def __init__(self, domain: str, scan_id: str, incremental: bool = False):
         self.domain = domain
         self.scan_id = scan_id
-        self.results = {
-            "fingerprint": None,
-            "network": None,
-            "dns": None,
-            "whois": None,
-            "ssl_tls": None,
-            "vulnerabilities": [],
-            "components": [],
-            "session_management": None,
-            "authentication": None,
-            "error_codes": [],
-            "xss": [],
-            "sql_injection": [],
-            "csrf": None,
-            "headers": None,
-            "open_ports": None,
-            "subdomains": [],
-            "cookies": None,
-            "api_endpoints": [],
-            "file_exposure": [],
-            "server_info": None,
-            "outdated_components": [],
-            "security_misconfigs": []
-        }
-
-    def convert_to_serializable(self, obj):
-        """Convert datetime objects to ISO format for JSON serialization"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, list):
-            return [self.convert_to_serializable(i) for i in obj]
-        elif isinstance(obj, dict):
-            return {k: self.convert_to_serializable(v) for k, v in obj.items()}
-        return obj
+        self.incremental = incremental
+        self.results = ScanResults()
+        self.progress = 0
+        self.scheduler = None
+        self.stage_outcomes = {}
+        self.stage_completed_at = {}
+        self.previous_report = None
+        self.reused = {}
+        self.timings = {"progress_updates": 0.0}
 
     async def whois_lookup(self):
-        """Performs a WHOIS lookup for the given domain."""
-        await self.update_progress(20)  # Update progress to 20%
+        """Performs a WHOIS lookup for the given domain's registrable domain (cached)."""
         try:
-            whois_info = whois.whois(self.domain)
-            self.results["whois"] = whois_info  # Store as is for serialization
+            self.results.whois = await whois_cache.lookup(self.domain)
         except Exception as e:
-            self.results["whois"] = str(e)
+            self.results.whois = str(e)
+            raise
 
     async def ssl_tls_analysis(self):
         """Performs SSL/TLS analysis for the given domain."""
-        await self.update_progress(30)  # Update progress to 30%
         try:
             context = ssl.create_default_context()
-            with socket.create_connection((self.domain, 443)) as sock:
-                with context.wrap_socket(sock, server_hostname=self.domain) as ssock:
-                    self.results["ssl_tls"] = {
-                        "cipher": ssock.cipher(),
-                        "version": ssock.version(),
-                        "peer_cert": ssock.getpeercert()
-                    }
+            address = (await dns_cache.resolve_host(self.domain))[0]
+            reader, writer = await asyncio.open_connection(address, settings.scan_https_port, ssl=context, server_hostname=self.domain)
+            try:
+                ssock = writer.get_extra_info("ssl_object")
+                self.results.ssl_tls = TLSInfo(
+                    cipher=ssock.cipher(),
+                    version=ssock.version(),
+                    peer_cert=ssock.getpeercert()
+                )
+            finally:
+                writer.close()
         except Exception as e:
-            self.results["ssl_tls"] = str(e)
+            self.results.ssl_tls = str(e)
+            raise
 
     async def dns_enumeration(self):
         """Performs DNS enumeration for the given domain."""
-        await self.update_progress(10)  # Update progress to 10%
         try:
-            resolver = dns.resolver.Resolver()
-            answers = resolver.resolve(self.domain, 'A')
-            self.results["dns"] = [answer.to_text() for answer in answers]  # Store as is for serialization
+            self.results.dns = await dns_cache.resolve(self.domain, 'A')  # Store as is for serialization
         except Exception as e:
-            self.results["dns"] = str(e)
+            self.results.dns = str(e)
+            raise
+
+    def url(self, scheme: str, path: str = "/") -> str:
+        """URL of ``path`` on the target, using the configured HTTP(S) port."""
+        port, default = (settings.scan_https_port, 443) if scheme == "https" else (settings.scan_http_port, 80)
+        host = self.domain if port == default else f"{self.domain}:{port}"
+        return f"{scheme}://{host}{path}"
 
     async def fingerprint(self):
-        """Performs technology fingerprinting for the given domain."""
-        await self.update_progress(40)  # Update progress to 40%
+        """Identifies the technologies behind the home page from its headers, cookies and markup."""
         try:
-            # Example implementation (this should be replaced with actual fingerprinting logic)
-            self.results["fingerprint"] = {
-                "web_server": "Apache",
-                "framework": "Django",
-                "language": "Python"
-            }
+            response = None
+            for scheme in ("https", "http"):
+                try:
+                    response = await http_client.fetch(self.url(scheme))
+                    break
+                except Exception as e:
+                    error = e
+            if response is None:
+                raise error
+
+            engine = await run_blocking(get_engine, settings.fingerprints_path)  # Compiled once per process
+            detections = await run_blocking(engine.analyze, response.headers, response.text, response.cookies)
+            self.results.components = [detection.to_dict() for detection in detections]
+            self.results.fingerprint = Fingerprint(**summarize(detections))
         except Exception as e:
-            self.results["fingerprint"] = str(e)
+            self.results.fingerprint = str(e)
+            self.results.components = str(e)
+            raise
 
     async def network_test(self):
         """Performs a basic network test for the given domain."""
-        await self.update_progress(40)  # Update progress to 40%
         try:
             # Example implementation of a network test (ping)
-            process = await asyncio.create_subprocess_shell(
-                f'ping -c 1 {self.domain}',
+            address = (await dns_cache.resolve_host(self.domain))[0]
+            process = await asyncio.create_subprocess_exec(
+                'ping', '-c', '1', address,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
             stdout, stderr = await process.communicate()
             if process.returncode == 0:
-                self.results["network"] = "Reachable"  # Ensure this is a string
+                self.results.network = "Reachable"  # Ensure this is a string
             else:
-                self.results["network"] = "Unreachable"
+                self.results.network = "Unreachable"
         except Exception as e:
-            self.results["network"] = str(e)
+            self.results.network = str(e)
+            raise
 
     async def enumerate_subdomains(self):
-        """Enumerates subdomains for the given domain."""
-        await self.update_progress(50)  # Update progress to 50%
+        """Brute forces subdomains of the given domain from the configured wordlist."""
         try:
-            # Example implementation of subdomain enumeration
-            subdomains = []
-            common_subdomains = ["www", "mail", "blog", "api", "dev"]
-            for sub in common_subdomains:
-                full_domain = f"{sub}.{self.domain}"
-                try:
-                    # Attempt to resolve the subdomain
-                    resolver = dns.resolver.Resolver()
-                    answers = resolver.resolve(full_domain, 'A')
-                    subdomains.append(full_domain)
-                except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
-                    continue  # Subdomain does not exist
-            self.results["subdomains"] = subdomains  # Store as is for serialization
+            self.results.subdomains = []  # Filled incrementally as names are found
+            bruteforcer = SubdomainBruteforcer(
+                nameserver=dns_cache.resolver.nameservers[0],
+                port=dns_cache.port,
+                concurrency=settings.subdomain_concurrency,
+                rate_limit=settings.subdomain_rate_limit,
+                timeout=settings.dns_timeout,
+            )
+            words = iter_wordlist(settings.subdomain_wordlist or DEFAULT_WORDLIST)
+            await bruteforcer.run(self.domain, words, self.results.subdomains.append)
         except Exception as e:
-            self.results["subdomains"] = str(e)
+            self.results.subdomains = str(e)
+            raise
 
-    async def discover_api_endpoints(self):
-        """Discovers API endpoints for the given domain."""
-        await self.update_progress(70)  # Update progress to 70%
+    async def crawl(self):
+        """Crawls the site for API endpoints, exposed files and forms (checked for CSRF tokens)."""
         try:
-            # Example implementation of API discovery
-            api_endpoints = []
-            # Here you would typically make requests to the domain and parse the responses
-            # For demonstration, we will add a few common API endpoints
-            common_endpoints = ["/api/v1/resource", "/api/v2/resource", "/api/v1/users"]
-            for endpoint in common_endpoints:
-                full_url = f"http://{self.domain}{endpoint}"
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(full_url) as response:
-                            if response.status == 200:
-                                api_endpoints.append(full_url)
-                except Exception as e:
-                    continue  # If the request fails, skip to the next endpoint
-            self.results["api_endpoints"] = api_endpoints  # Store as is for serialization
+            crawler = Crawler(
+                self.domain,
+                max_pages=settings.crawl_max_pages,
+                max_depth=settings.crawl_max_depth,
+                concurrency=settings.crawl_concurrency,
+                seen_capacity=settings.crawl_seen_capacity,
+                max_body_bytes=settings.crawl_max_body_bytes,
+                time_budget=settings.crawl_time_budget,
+            )
+            found = await crawler.crawl([self.url("https"), self.url("http")])
+            self.results.api_endpoints = found.api_endpoints
+            self.results.file_exposure = found.file_exposure
+            self.results.csrf = found.forms
         except Exception as e:
-            self.results["api_endpoints"] = str(e)
+            self.results.api_endpoints = str(e)
+            self.results.file_exposure = str(e)
+            self.results.csrf = str(e)
+            raise
 
     async def vulnerability_scan(self):
         """Scans for common vulnerabilities in the target domain."""
-        await self.update_progress(80)  # Update progress to 80%
         try:
             # Example implementation of vulnerability scanning
             vulnerabilities = []
@@ -174,13 +172,13 @@ class Scanner:
             common_vulnerabilities = ["SQL Injection", "Cross-Site Scripting (XSS)", "Remote Code Execution"]
             for vulnerability in common_vulnerabilities:
                 vulnerabilities.append(vulnerability)
-            self.results["vulnerabilities"] = vulnerabilities  # Store as is for serialization
+            self.results.vulnerabilities = vulnerabilities  # Store as is for serialization
         except Exception as e:
-            self.results["vulnerabilities"] = str(e)
+            self.results.vulnerabilities = str(e)
+            raise
 
     async def check_security_misconfigs(self):
         """Checks for common security misconfigurations in the target domain."""
-        await self.update_progress(90)  # Update progress to 90%
         try:
             # Example implementation of checking security misconfigurations
             misconfigurations = []
@@ -189,149 +187,247 @@ class Scanner:
             common_misconfigurations = ["Default Credentials", "Open Ports", "Unrestricted File Upload"]
             for misconfiguration in common_misconfigurations:
                 misconfigurations.append(misconfiguration)
-            self.results["security_misconfigs"] = misconfigurations  # Store as is for serialization
+            self.results.security_misconfigs = misconfigurations  # Store as is for serialization
         except Exception as e:
-            self.results["security_misconfigs"] = str(e)
+            self.results.security_misconfigs = str(e)
+            raise
+
+    def build_stages(self):
+        """Declares the scan stages and the stages each one has to wait for."""
+        return [
+            Stage("dns", self.dns_enumeration, message="Performing DNS lookup...",
+                  outputs=("dns",), max_age=6 * HOUR),
+            Stage("whois", self.whois_lookup, message="Performing WHOIS lookup...",
+                  outputs=("whois",), max_age=24 * HOUR),
+            Stage("ssl_tls", self.ssl_tls_analysis, message="Analyzing SSL/TLS configuration...",
+                  outputs=("ssl_tls",), max_age=12 * HOUR),
+            Stage("fingerprint", self.fingerprint, message="Fingerprinting technologies...",
+                  outputs=("fingerprint", "components"), max_age=6 * HOUR),
+            Stage("network", self.network_test, message="Testing network reachability...",
+                  outputs=("network",)),
+            Stage("ports", self.port_scan, message="Scanning ports...",
+                  outputs=("open_ports",)),
+            Stage("subdomains", self.enumerate_subdomains, message="Enumerating subdomains...",
+                  outputs=("subdomains",), max_age=12 * HOUR),
+            Stage("crawl", self.crawl, depends_on=("dns",), message="Crawling for API endpoints and exposed files...",
+                  outputs=("api_endpoints", "file_exposure", "csrf"), max_age=HOUR),
+            Stage("vulnerabilities", self.vulnerability_scan, depends_on=("fingerprint", "ports"),
+                  message="Scanning for vulnerabilities...", outputs=("vulnerabilities",)),
+            Stage("security_misconfigs", self.check_security_misconfigs, depends_on=("ports", "ssl_tls"),
+                  message="Checking security configurations...", outputs=("security_misconfigs",)),
+        ]
+
+    async def _load_previous_report(self):
+        """Returns the most recent stored report for this domain, if any."""
+        async with async_session() as session:
+            previous = (await session.execute(
+                select(ScanResult)
+                .join(Scan, Scan.id == ScanResult.scan_id)
+                .where(Scan.domain == self.domain, Scan.id != self.scan_id)
+                .order_by(ScanResult.created_at.desc())
+                .limit(1)
+            )).scalars().first()
+        return loads(previous.results) if previous else None
+
+    def _reuse_fresh_stages(self, stages):
+        """Copies still-fresh stage outputs from the previous report and swaps their runs for no-ops.
+
+        Only stages that completed are reused; an output holding an error
+        message (reports stored before stages re-raised their errors) means
+        the stage failed and is run again.
+        """
+        previous = self.previous_report
+        now = datetime.utcnow()
+        completed_at = previous.get("stage_completed_at", {})
+        outcomes = previous.get("stages", {})
+
+        async def reused():
+            pass
+
+        for stage in stages:
+            finished = completed_at.get(stage.name)
+            outcome = outcomes.get(stage.name, {})
+            if not stage.max_age or not finished or outcome.get("status") not in ("completed", "reused"):
+                continue
+            if outcome.get("error") or any(isinstance(previous["results"].get(field), str) for field in stage.outputs):
+                continue
+            if (now - datetime.fromisoformat(finished)).total_seconds() > stage.max_age:
+                continue
+            for field in stage.outputs:
+                self.results.set(field, previous["results"].get(field))
+            self.stage_completed_at[stage.name] = finished
+            self.reused[stage.name] = {"scan_id": previous["scan_id"], "completed_at": finished}
+            stage.run = reused
+        return stages
+
+    async def _on_stage_done(self, outcome, completed, total):
+        """Reports progress from the number of stages that have finished (report generation is the last 10%)."""
+        stage = self.scheduler.stages[outcome.name]
+        if outcome.name in self.reused:
+            outcome.status = "reused"
+        elif outcome.status == "completed":
+            self.stage_completed_at[outcome.name] = datetime.utcnow().isoformat()
+        await emit_scan_partial(
+            self.scan_id, outcome.name, outcome.status,
+            self.results.pick(stage.outputs),
+        )
+        message = stage.message if outcome.status == "completed" else f"{outcome.name} {outcome.status}: {outcome.error}"
+        await self.update_progress(int(completed * 90 / total), message)
 
     async def start(self):
+        SCANS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        status = "failed"
+        try:
+            await self._run(started)
+            status = "completed"
+        finally:
+            SCANS_IN_FLIGHT.dec()
+            SCAN_DURATION.labels(status).observe(time.perf_counter() - started)
+
+    async def _run(self, started: float):
         try:
-            from src.main import emit_scan_progress, emit_scan_complete
-            
             await self._update_status("scanning", 0)
             await emit_scan_progress(self.scan_id, 0, "Initializing scan...")
 
-            # DNS and WHOIS (10%)
-            await self.dns_enumeration()
-            await self.whois_lookup()
-            await emit_scan_progress(self.scan_id, 10, "Performing DNS and WHOIS lookup...")
-
-            # SSL/TLS Analysis (20%)
-            await self.ssl_tls_analysis()
-            await emit_scan_progress(self.scan_id, 20, "Analyzing SSL/TLS configuration...")
-
-            # Fingerprinting (30%)
-            await self.fingerprint()
-            await emit_scan_progress(self.scan_id, 30, "Fingerprinting technologies...")
-
-            # Network and Port Scanning (40%)
-            await self.network_test()
-            await self.port_scan()
-            await emit_scan_progress(self.scan_id, 40, "Scanning network and ports...")
-
-            # Subdomain Enumeration (50%)
-            await self.enumerate_subdomains()
-            await emit_scan_progress(self.scan_id, 50, "Enumerating subdomains...")
-
-            # API Discovery (70%)
-            await self.discover_api_endpoints()
-            await emit_scan_progress(self.scan_id, 70, "Discovering API endpoints...")
-
-            # Vulnerability Scanning (80%)
-            await self.vulnerability_scan()
-            await emit_scan_progress(self.scan_id, 80, "Scanning for vulnerabilities...")
-
-            # Security Misconfiguration (90%)
-            await self.check_security_misconfigs()
-            await emit_scan_progress(self.scan_id, 90, "Checking security configurations...")
+            stages = self.build_stages()
+            if self.incremental:
+                self.previous_report = await self._load_previous_report()
+                if self.previous_report:
+                    stages = self._reuse_fresh_stages(stages)
+
+            self.scheduler = StageScheduler(
+                stages,
+                max_concurrency=settings.max_concurrent_stages,
+                default_timeout=settings.stage_timeout,
+                on_stage_done=self._on_stage_done,
+            )
+            stages_started = time.perf_counter()
+            self.stage_outcomes = await self.scheduler.run()
+            self.timings["stages"] = time.perf_counter() - stages_started
+            self.timings["until_report"] = time.perf_counter() - started
 
             # Report Generation (100%)
             await self.generate_report()
-            await emit_scan_progress(self.scan_id, 100, "Scan complete!")
-
-            # Emit scan complete event
-            self.results = self.convert_to_serializable(self.results)
-            serialized_results = json.dumps(self.convert_to_serializable(self.results))  # Convert to JSON
-            await emit_scan_complete(self.scan_id, serialized_results)
 
+            # Store the final status before telling clients the scan is complete
             await self._update_status("completed", 100)
+            await emit_scan_complete(self.scan_id, self.completion_summary())
 
         except Exception as e:
-            print(f"Scan error: {str(e)}")
+            logger.exception("Scan %s of %s failed", self.scan_id, self.domain)
             await self._update_status("failed", 0, str(e))
-            raise e
+            await emit_scan_progress(self.scan_id, self.progress, f"Scan failed: {str(e)}", final=True)
+            raise
 
     async def generate_report(self):
-        try:
-            report = {
-                "scan_id": self.scan_id,
-                "domain": self.domain,
-                "timestamp": datetime.utcnow().isoformat(),
-                "results": self.convert_to_serializable(self.results),  # Ensure results are serialized
-                "summary": self.generate_summary()
-            }
-
+        """Stores the report and its findings; raises when they cannot be saved, which fails the scan."""
+        completed_at = datetime.utcnow()
+        report = {
+            "scan_id": self.scan_id,
+            "domain": self.domain,
+            "timestamp": completed_at.isoformat(),
+            "results": self.results,
+            "summary": self.generate_summary(),
+            "stages": {name: outcome.to_dict() for name, outcome in self.stage_outcomes.items()},
+            "stage_completed_at": self.stage_completed_at,
+            "timings": self.timing_breakdown(),
+        }
+        if self.incremental:
+            report["reused"] = self.reused
+            if self.previous_report:
+                report["diff"] = {
+                    "previous_scan_id": self.previous_report["scan_id"],
+                    "changes": diff_results(self.previous_report.get("results", {}), loads(dumps(self.results))),
+                }
+
+        with track(DB_WRITE_DURATION, "scan_result", errors=DB_WRITE_ERRORS):
             async with async_session() as session:
                 async with session.begin():
                     scan_result = ScanResult(
                         scan_id=self.scan_id,
-                        results=json.dumps(report)  # Ensure results are serialized as JSON
+                        results=dumps_str(report)  # Single-pass encoding of the typed results
                     )
                     session.add(scan_result)
-                await session.commit()
-        except Exception as e:
-            print(f"Error generating report: {str(e)}")
+                    await store_findings(session, self.scan_id, self.domain, self.results, completed_at)
+
+    def timing_breakdown(self):
+        """Seconds spent per stage and in the scan's bookkeeping, stored with the report."""
+        stages = {name: round(outcome.duration, 3) for name, outcome in self.stage_outcomes.items()}
+        return {
+            "until_report": round(self.timings.get("until_report", 0.0), 3),
+            "stages_wall": round(self.timings.get("stages", 0.0), 3),
+            "stages": stages,
+            "slowest_stage": max(stages, key=stages.get) if stages else None,
+            "progress_updates": round(self.timings["progress_updates"], 3),
+        }
 
     def generate_summary(self):
         """Generates a summary of the scan results."""
         summary = {
-            "total_vulnerabilities": len(self.results["vulnerabilities"]),
-            "open_ports": self.results["open_ports"] if self.results["open_ports"] else [],
-            "subdomains": self.results["subdomains"] if self.results["subdomains"] else [],
-            "api_endpoints": self.results["api_endpoints"] if self.results["api_endpoints"] else [],
+            "total_vulnerabilities": len(self.results.vulnerabilities),
+            "open_ports": self.results.open_ports if self.results.open_ports else [],
+            "subdomains": self.results.subdomains if self.results.subdomains else [],
+            "api_endpoints": self.results.api_endpoints if self.results.api_endpoints else [],
         }
         return summary
 
-    async def _save_results_to_db(self):
-        """Save scan results to the database"""
-        try:
-            scan_result = ScanResult(scan_id=self.scan_id, results=json.dumps(self.convert_to_serializable(self.results)))
-            async with async_session() as session:
-                async with session.begin():
-                    session.add(scan_result)
-                await session.commit()
-            print(f"✅ Scan results saved successfully for {self.scan_id}")  # 🔹 Debugging log
-        except Exception as e:
-            print(f"❌ Failed to save scan results: {str(e)}")
+    def completion_summary(self):
+        """Small summary sent with the completion event; clients already got the findings stage by stage."""
+        def count(value):
+            return len(value) if isinstance(value, list) else 0
+
+        return {
+            "total_vulnerabilities": count(self.results.vulnerabilities),
+            "open_ports": count(self.results.open_ports),
+            "subdomains": count(self.results.subdomains),
+            "api_endpoints": count(self.results.api_endpoints),
+            "stages": {name: outcome.status for name, outcome in self.stage_outcomes.items()},
+        }
 
     async def _update_status(self, status: str, progress: int = 0, error_message: str = None):
-        """Update scan status in the database and log errors if any."""
+        """Update scan status through the batched status writer and log errors if any.
+
+        Final statuses wait until they are committed so that clients told the
+        scan is over find it finished in the database.
+        """
         try:
-            async with async_session() as session:
-                async with session.begin():
-                    scan = await session.get(Scan, self.scan_id)
-                    if scan:
-                        scan.status = status
-                        scan.progress = progress
-                        scan.updated_at = datetime.utcnow()
-                        if error_message:
-                            scan.error_message = error_message  # Add error logging to DB (ensure `error_message` column exists)
-                        await session.commit()
-            print(f"🔴 Scan {self.scan_id} failed: {error_message}" if error_message else f"✅ Scan {self.scan_id} updated to {status}")
-        except Exception as e:
-            print(f"Database update failed: {str(e)}")
+            await status_writer.update(self.scan_id, status, progress, wait=status in ("completed", "failed"))
+            if error_message:
+                logger.error("Scan %s failed: %s", self.scan_id, error_message)
+            else:
+                logger.info("Scan %s updated to %s", self.scan_id, status)
+        except Exception:
+            logger.exception("Could not store status %s for scan %s", status, self.scan_id)
 
-    async def update_progress(self, value):
+    async def fail(self, message: str):
+        """Marks the scan as failed from outside the scan itself (e.g. when the queue cancels it)."""
+        await self._update_status("failed", self.progress, message)
+        await emit_scan_progress(self.scan_id, self.progress, message, final=True)
+
+    async def update_progress(self, value, message="Scanning in progress"):
         """Updates progress and sends it via WebSockets."""
         self.progress = value
-        from src.main import emit_scan_progress  # Ensure correct import
-        await emit_scan_progress(self.scan_id, self.progress, "Scanning in progress")
-        print(f"Scanning Progress: {self.progress}%")  # Debugging log
+        started = time.perf_counter()
+        await status_writer.update(self.scan_id, "scanning", value)
+        await emit_scan_progress(self.scan_id, self.progress, message)
+        self.timings["progress_updates"] += time.perf_counter() - started
 
     async def port_scan(self):
-        """Scans common ports on the target domain."""
-        await self.update_progress(30)  # 30% Done
-        ports = [21, 22, 23, 25, 53, 80, 110, 443, 3389]
-        open_ports = []
-        for port in ports:
-            try:
-                with socket.create_connection((self.domain, port), timeout=2):
-                    open_ports.append(port)
-            except (socket.timeout, ConnectionRefusedError):
-                pass
-        self.results["ports"] = open_ports  # Store as is for serialization
+        """Scans the configured ports on the target domain with a non-blocking connect scan."""
+        try:
+            scanner = PortScanner(
+                concurrency=settings.port_scan_concurrency,
+                timeout=settings.port_scan_timeout,
+                retries=settings.port_scan_retries,
+            )
+            self.results.open_ports = await scanner.scan(self.domain, parse_ports(settings.port_scan_ports))
+        except Exception as e:
+            self.results.open_ports = str(e)
+            raise
 
     def get_results(self):
         """Returns the scan results."""
-        return self.convert_to_serializable(self.results)
+        return self.results
 
 
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from src.utils.metrics import STAGE_DURATION, STAGE_ERRORS, STAGES_IN_FLIGHT
+
+
+@dataclass
+class Stage:
+    """A single unit of scan work and the stages it has to wait for.
+
+    ``outputs`` names the result fields the stage fills in and ``max_age``
+    how many seconds those fields stay fresh enough to be reused by an
+    incremental rescan (``None`` means always run again).
+    """
+    name: str
+    run: Callable[[], Awaitable[None]]
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    message: str = ""
+    outputs: Tuple[str, ...] = ()
+    max_age: Optional[float] = None
+
+
+@dataclass
+class StageOutcome:
+    """How a stage finished: completed, reused, failed or timeout."""
+    name: str
+    status: str
+    duration: float
+    error: Optional[str] = None
+
+    def to_dict(self):
+        return {"status": self.status, "duration": round(self.duration, 3), "error": self.error}
+
+
+@dataclass
+class StageScheduler:
+    """Runs stages concurrently while respecting their declared dependencies.
+
+    A stage starts as soon as every stage it depends on has finished, whatever
+    the outcome, so one failing stage never stops unrelated work. At most
+    ``max_concurrency`` stages run at the same time and each one is bounded by
+    its own timeout (or ``default_timeout``).
+    """
+    stages: Iterable[Stage]
+    max_concurrency: int = 4
+    default_timeout: Optional[float] = None
+    on_stage_done: Optional[Callable[[StageOutcome, int, int], Awaitable[None]]] = None
+    outcomes: Dict[str, StageOutcome] = field(default_factory=dict, init=False)
+
+    def __post_init__(self):
+        self.stages = {stage.name: stage for stage in self.stages}
+        self._validate()
+
+    def _validate(self):
+        """Reject unknown dependencies and dependency cycles up front."""
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    @property
+    def progress(self) -> int:
+        """Percentage of stages that have finished."""
+        if not self.stages:
+            return 100
+        return int(len(self.outcomes) * 100 / len(self.stages))
+
+    async def _run_stage(self, stage: Stage, semaphore: asyncio.Semaphore) -> StageOutcome:
+        async with semaphore:
+            in_flight = STAGES_IN_FLIGHT.labels(stage.name)
+            in_flight.inc()
+            try:
+                outcome = await self._timed_run(stage)
+            finally:
+                in_flight.dec()
+        STAGE_DURATION.labels(stage.name).observe(outcome.duration)
+        if outcome.status != "completed":
+            STAGE_ERRORS.labels(stage.name, outcome.status).inc()
+        return outcome
+
+    async def _timed_run(self, stage: Stage) -> StageOutcome:
+        timeout = stage.timeout if stage.timeout is not None else self.default_timeout
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(stage.run(), timeout)
+            return StageOutcome(stage.name, "completed", time.perf_counter() - started)
+        except asyncio.TimeoutError:
+            return StageOutcome(stage.name, "timeout", time.perf_counter() - started,
+                                f"Stage timed out after {timeout}s")
+        except Exception as e:
+            return StageOutcome(stage.name, "failed", time.perf_counter() - started, str(e))
+
+    async def run(self) -> Dict[str, StageOutcome]:
+        """Run every stage and return their outcomes keyed by stage name."""
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        waiting_on = {name: set(stage.depends_on) for name, stage in self.stages.items()}
+        dependents = {name: [] for name in self.stages}
+        for name, stage in self.stages.items():
+            for dependency in stage.depends_on:
+                dependents[dependency].append(name)
+
+        pending = set()
+
+        def launch(name):
+            pending.add(asyncio.create_task(self._run_stage(self.stages[name], semaphore), name=f"stage:{name}"))
+
+        for name, dependencies in waiting_on.items():
+            if not dependencies:
+                launch(name)
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    outcome = task.result()
+                    self.outcomes[outcome.name] = outcome
+                    for dependent in dependents[outcome.name]:
+                        waiting_on[dependent].discard(outcome.name)
+                        if not waiting_on[dependent]:
+                            launch(dependent)
+                    if self.on_stage_done:
+                        await self.on_stage_done(outcome, len(self.outcomes), len(self.stages))
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return self.outcomes
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, update
+
+from src.config import settings
+from src.database import async_session
+from src.models.scan import Scan
+from src.utils.logger import logger
+from src.utils.metrics import DB_WRITE_DURATION, DB_WRITE_ERRORS, track
+
+
+# executemany UPDATE keyed by scan id; scans that no longer exist are skipped.
+_UPDATE_SCAN = (
+    update(Scan.__table__)
+    .where(Scan.__table__.c.id == bindparam("scan_id"))
+    .values(status=bindparam("new_status"), progress=bindparam("new_progress"), updated_at=bindparam("now"))
+)
+
+
+class StatusWriter:
+    """Batches scan status and progress updates into one transaction per interval.
+
+    Every change is kept in memory, a later change of the same scan replacing
+    the earlier one, and a background task writes everything pending with a
+    single executemany UPDATE every ``interval`` seconds. Callers that need
+    the change to be stored (final statuses) can wait for the flush.
+    """
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self._pending: Dict[str, dict] = {}
+        self._waiters: List[asyncio.Future] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="status-writer")
+
+    async def update(self, scan_id: str, status: str, progress: int, wait: bool = False):
+        """Queues a status change; with ``wait`` returns only once it has been committed."""
+        self._ensure_running()
+        self._pending[scan_id] = {"scan_id": scan_id, "new_status": status, "new_progress": progress}
+        if not wait:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        await waiter
+
+    async def close(self):
+        """Writes whatever is still pending and stops the background task."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            await self._flush()
+            if self._closing:
+                return
+
+    async def _flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, []
+        now = datetime.utcnow()
+        try:
+            with track(DB_WRITE_DURATION, "status_flush", errors=DB_WRITE_ERRORS):
+                async with async_session() as session:
+                    async with session.begin():
+                        await session.execute(_UPDATE_SCAN, [{**row, "now": now} for row in batch.values()])
+        except Exception as e:
+            logger.error("Status writer failed to store %d update(s): %s", len(batch), e)
+            for scan_id, row in batch.items():
+                self._pending.setdefault(scan_id, row)  # Retried on the next flush unless superseded
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+status_writer = StatusWriter(interval=settings.status_flush_interval_ms / 1000)
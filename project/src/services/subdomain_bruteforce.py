@@ -0,0 +1,267 @@
+import asyncio
+import os
+import random
+import re
+import socket
+import string
+import time
+from typing import Callable, Iterable, Iterator, List, Optional, Set
+
+DEFAULT_WORDLIST = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "subdomains.txt")
+
+# RCODE of "the name does not exist"; any other nonzero code is a server failure.
+NXDOMAIN = 3
+
+_LABEL = re.compile(r"^[a-z0-9_]([a-z0-9_-]{0,61}[a-z0-9_])?(\.[a-z0-9_]([a-z0-9_-]{0,61}[a-z0-9_])?)*$")
+
+
+def iter_wordlist(path: str) -> Iterator[str]:
+    """Streams candidate labels from a wordlist file, one per line, skipping blanks, comments and invalid labels."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as wordlist:
+        for line in wordlist:
+            word = line.strip().lower()
+            if word and not word.startswith("#") and _LABEL.match(word):
+                yield word
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` acquisitions per second (0 disables the limit)."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate / 10)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class DNSServerError(Exception):
+    """The nameserver answered with a failure RCODE (SERVFAIL, REFUSED...) rather than an answer."""
+
+    def __init__(self, name: str, rcode: int):
+        super().__init__(f"DNS server failed to resolve {name} (RCODE {rcode})")
+        self.rcode = rcode
+
+
+class _DNSProtocol(asyncio.DatagramProtocol):
+    def __init__(self, pending: dict):
+        self.pending = pending
+
+    def datagram_received(self, data, addr):
+        if len(data) < 12:
+            return
+        future = self.pending.pop(int.from_bytes(data[:2], "big"), None)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc):
+        pass
+
+
+def _encode_question(name: str) -> bytes:
+    """Wire format of the question ``name IN A``."""
+    wire = bytearray()
+    for label in name.rstrip(".").encode("idna").split(b"."):
+        wire.append(len(label))
+        wire += label
+    return bytes(wire) + b"\x00\x00\x01\x00\x01"
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    while True:
+        length = data[offset]
+        if length == 0:
+            return offset + 1
+        if length & 0xC0 == 0xC0:  # Compression pointer
+            return offset + 2
+        offset += length + 1
+
+
+def _parse_a_answers(data: bytes, question: bytes) -> Optional[List[str]]:
+    """Returns the A addresses of a response, [] for NXDOMAIN/NoAnswer, None if it does not answer ``question``.
+
+    Raises ``DNSServerError`` for any other failure RCODE.
+    """
+    if data[12:12 + len(question)].lower() != question.lower():
+        return None
+    rcode = data[3] & 0x0F
+    if rcode == NXDOMAIN:
+        return []
+    if rcode != 0:
+        raise DNSServerError(question.decode("ascii", "replace"), rcode)
+    answers = int.from_bytes(data[6:8], "big")
+    offset = 12 + len(question)
+    addresses = []
+    for _ in range(answers):
+        offset = _skip_name(data, offset)
+        rdtype = int.from_bytes(data[offset:offset + 2], "big")
+        rdlength = int.from_bytes(data[offset + 8:offset + 10], "big")
+        offset += 10
+        if rdtype == 1 and rdlength == 4:
+            addresses.append(socket.inet_ntoa(data[offset:offset + 4]))
+        offset += rdlength
+    return addresses
+
+
+class UDPResolver:
+    """Minimal A-record client multiplexing many in-flight queries over one UDP socket.
+
+    dnspython builds a socket and full message objects per query; at
+    brute-force volumes that overhead dominates, so queries are encoded by
+    hand, sent over one socket and matched to responses by message ID.
+    """
+
+    def __init__(self, nameserver: str, port: int = 53, timeout: float = 2.0, retries: int = 2):
+        self.nameserver = nameserver
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self._pending = {}
+        self._transport = None
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DNSProtocol(self._pending), remote_addr=(self.nameserver, self.port)
+        )
+        sock = self._transport.get_extra_info("socket")
+        for option in (socket.SO_RCVBUF, socket.SO_SNDBUF):
+            sock.setsockopt(socket.SOL_SOCKET, option, 4 * 1024 * 1024)
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def _next_id(self) -> int:
+        while True:
+            query_id = random.getrandbits(16)
+            if query_id not in self._pending:
+                return query_id
+
+    async def query_a(self, name: str) -> List[str]:
+        """Returns the A records of ``name`` (empty for NXDOMAIN/NoAnswer).
+
+        Timeouts and server failures are retried; after the last attempt the
+        last ``DNSServerError``, or a TimeoutError, is raised.
+        """
+        question = _encode_question(name)
+        loop = asyncio.get_running_loop()
+        failure = None
+        for attempt in range(self.retries + 1):
+            if failure is not None:
+                await asyncio.sleep(min(self.timeout, 0.1 * 2 ** attempt))  # Give a struggling server room
+            query_id = self._next_id()
+            future = loop.create_future()
+            self._pending[query_id] = future
+            timer = loop.call_later(self.timeout, future.cancel)
+            self._transport.sendto(query_id.to_bytes(2, "big") + b"\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00" + question)
+            try:
+                data = await future
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                continue  # Timed out
+            finally:
+                timer.cancel()
+                self._pending.pop(query_id, None)
+            try:
+                addresses = _parse_a_answers(data, question)
+            except DNSServerError as e:
+                failure = DNSServerError(name, e.rcode)
+                continue
+            if addresses is not None:
+                return addresses
+        if failure is not None:
+            raise failure
+        raise asyncio.TimeoutError(f"No DNS answer for {name}")
+
+
+class SubdomainBruteforcer:
+    """Resolves ``<word>.<domain>`` for every word of a (possibly huge) wordlist.
+
+    Words are pulled lazily from the iterable into a bounded queue, so memory
+    stays flat whatever the wordlist size. Before brute forcing, a few random
+    labels are resolved: if the zone answers them (wildcard DNS), names that
+    only resolve to those wildcard addresses are discarded.
+    """
+
+    def __init__(self, nameserver: str, port: int = 53, concurrency: int = 500, rate_limit: float = 0,
+                 timeout: float = 2.0, retries: int = 1, wildcard_probes: int = 3):
+        self.resolver = UDPResolver(nameserver, port, timeout, retries)
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate_limit)
+        self.wildcard_probes = wildcard_probes
+        self.wildcard_addresses: Set[str] = set()
+        self.stats = {"queried": 0, "found": 0, "wildcard_filtered": 0, "errors": 0, "server_errors": 0, "elapsed": 0.0}
+
+    async def detect_wildcard(self, domain: str) -> Set[str]:
+        """Returns the addresses random (non-existent) labels resolve to; empty when there is no wildcard."""
+        addresses = set()
+        for _ in range(self.wildcard_probes):
+            label = "".join(random.choices(string.ascii_lowercase + string.digits, k=16))
+            try:
+                addresses.update(await self.resolver.query_a(f"{label}.{domain}"))
+            except (asyncio.TimeoutError, DNSServerError):
+                continue
+        return addresses
+
+    async def _worker(self, domain: str, queue: asyncio.Queue, on_found: Callable[[str], None]):
+        while True:
+            word = await queue.get()
+            if word is None:
+                return
+            name = f"{word}.{domain}"
+            await self.limiter.acquire()
+            self.stats["queried"] += 1
+            try:
+                addresses = await self.resolver.query_a(name)
+            except DNSServerError:
+                self.stats["server_errors"] += 1  # SERVFAIL/REFUSED: unknown, not missing
+                continue
+            except Exception:
+                self.stats["errors"] += 1
+                continue
+            if not addresses:
+                continue
+            if self.wildcard_addresses and set(addresses) <= self.wildcard_addresses:
+                self.stats["wildcard_filtered"] += 1
+                continue
+            self.stats["found"] += 1
+            on_found(name)
+
+    async def run(self, domain: str, words: Iterable[str], on_found: Callable[[str], None]) -> dict:
+        """Brute forces ``domain`` with ``words``, calling ``on_found`` for every live subdomain as it is found."""
+        started = time.perf_counter()
+        await self.resolver.open()
+        try:
+            self.wildcard_addresses = await self.detect_wildcard(domain)
+            queue = asyncio.Queue(maxsize=self.concurrency * 2)
+            workers = [asyncio.create_task(self._worker(domain, queue, on_found)) for _ in range(self.concurrency)]
+            try:
+                for word in words:
+                    await queue.put(word)
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+        finally:
+            self.resolver.close()
+            self.stats["elapsed"] = time.perf_counter() - started
+        self.stats["wildcard"] = sorted(self.wildcard_addresses)
+        return self.stats
@@ -0,0 +1,178 @@
+import asyncio
+import socket
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from src.config import settings
+from src.database import async_session
+from src.models.scan import WhoisRecord
+from src.services.blocking_io import run_blocking
+from src.utils.logger import logger
+from src.utils.serialization import dumps_str, loads
+
+
+@lru_cache(maxsize=1)
+def _suffix_extractor():
+    import tldextract  # Loaded on the first lookup only
+
+    # The Public Suffix List snapshot bundled with tldextract; never fetched or cached on disk.
+    return tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+
+def registrable_domain(domain: str) -> str:
+    """Returns the registrable domain (eTLD+1), e.g. ``a.b.example.co.uk`` -> ``example.co.uk``.
+
+    Names without a known public suffix (or that are one) are returned whole,
+    so unrelated hosts never share a cache entry.
+    """
+    host = domain.lower().strip(".")
+    return _suffix_extractor()(host).top_domain_under_public_suffix or host
+
+
+def serialize_whois(entry) -> dict:
+    """Converts a python-whois result into plain JSON-compatible data."""
+    def convert(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, (list, tuple, set)):
+            return [convert(item) for item in value]
+        if isinstance(value, dict):
+            return {str(key): convert(item) for key, item in value.items()}
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        return str(value)
+
+    return convert(dict(entry))
+
+
+def query_whois_server(server: str, domain: str, timeout: float = 10) -> str:
+    """Sends a plain WHOIS query to ``server`` ("host[:port]") and returns the raw response."""
+    host, _, port = server.partition(":")
+    response = bytearray()
+    with socket.create_connection((host, int(port or 43)), timeout=timeout) as sock:
+        sock.sendall(domain.encode("idna") + b"\r\n")
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            response += chunk
+    return response.decode("utf-8", "replace")
+
+
+class WhoisCache:
+    """Two-tier WHOIS cache keyed by registrable domain.
+
+    A bounded in-memory LRU sits in front of the ``whois_records`` table.
+    Entries older than ``ttl`` are still served, but trigger one background
+    refresh; only a complete miss waits for the WHOIS server. Concurrent
+    lookups of the same domain share one query. A failed query is not retried
+    for ``negative_ttl`` seconds, doubling with every further failure up to
+    ``ttl``; misses fail fast and stale entries are served without a refresh
+    in the meantime.
+    """
+
+    def __init__(self, ttl: int = 86400, memory_entries: int = 1024, server: Optional[str] = None,
+                 negative_ttl: int = 300):
+        self.ttl = timedelta(seconds=ttl)
+        self.memory_entries = memory_entries
+        self.server = server
+        self.negative_ttl = timedelta(seconds=negative_ttl)
+        self._memory: "OrderedDict[str, Tuple[datetime, dict]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._failures: Dict[str, Tuple[datetime, int, str]] = {}  # key -> (retry after, failures, message)
+
+    def _remember(self, key: str, fetched_at: datetime, data: dict):
+        self._memory[key] = (fetched_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    async def _load(self, key: str) -> Optional[Tuple[datetime, dict]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        async with async_session() as session:
+            record = await session.get(WhoisRecord, key)
+            if record is None:
+                return None
+            entry = (record.fetched_at, loads(record.data))
+        self._remember(key, *entry)
+        return entry
+
+    def _backing_off(self, key: str) -> Optional[str]:
+        """The last error for ``key`` while its queries are being held back, else None."""
+        failure = self._failures.get(key)
+        if failure is None or datetime.utcnow() >= failure[0]:
+            return None
+        return failure[2]
+
+    def _record_failure(self, key: str, error: Exception):
+        count = self._failures.get(key, (None, 0, ""))[1] + 1
+        delay = min(self.negative_ttl * 2 ** (count - 1), max(self.ttl, self.negative_ttl))
+        self._failures[key] = (datetime.utcnow() + delay, count, str(error) or type(error).__name__)
+        while len(self._failures) > self.memory_entries:
+            self._failures.pop(next(iter(self._failures)))
+
+    async def _fetch(self, key: str) -> dict:
+        try:
+            data = await self._query(key)
+        except Exception as e:
+            self._record_failure(key, e)
+            raise
+        self._failures.pop(key, None)
+        return data
+
+    async def _query(self, key: str) -> dict:
+        import whois  # Only needed on a cache miss
+
+        if self.server:
+            text = await run_blocking(query_whois_server, self.server, key)
+            data = serialize_whois(whois.parser.WhoisEntry.load(key, text))
+        else:
+            data = serialize_whois(await run_blocking(whois.whois, key))
+        fetched_at = datetime.utcnow()
+        async with async_session() as session:
+            async with session.begin():
+                await session.merge(WhoisRecord(domain=key, data=dumps_str(data), fetched_at=fetched_at))
+        self._remember(key, fetched_at, data)
+        return data
+
+    def _fetch_once(self, key: str) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None))
+        return task
+
+    def _refresh_in_background(self, key: str):
+        def report(task):
+            if not task.cancelled() and task.exception():
+                logger.warning("Background WHOIS refresh for %s failed: %s", key, task.exception())
+
+        self._fetch_once(key).add_done_callback(report)
+
+    async def lookup(self, domain: str) -> dict:
+        """Returns WHOIS data for the registrable domain of ``domain``."""
+        key = registrable_domain(domain)
+        entry = await self._load(key)
+        failed = self._backing_off(key)
+        if entry is None:
+            if failed is not None:
+                raise LookupError(f"WHOIS lookup for {key} failed recently: {failed}")
+            return await asyncio.shield(self._fetch_once(key))
+        fetched_at, data = entry
+        if datetime.utcnow() - fetched_at > self.ttl and failed is None:
+            self._refresh_in_background(key)
+        return data
+
+
+whois_cache = WhoisCache(
+    ttl=settings.whois_cache_ttl,
+    memory_entries=settings.whois_cache_memory_entries,
+    server=settings.whois_server or None,
+    negative_ttl=settings.whois_negative_ttl,
+)
@@ -0,0 +1,133 @@
+"""Report charts drawn as reportlab vector graphics.
+
+Every function returns a ``Drawing`` that can be placed on a canvas
+(``renderPDF.draw``), added to a platypus story as a flowable, or turned
+into bytes with ``to_bytes``. No global state and no files are involved,
+so charts can be built from any thread or process.
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from reportlab.graphics import renderPDF, renderSVG
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+
+RISK_COLORS = {
+    "Critical": colors.red,
+    "High": colors.orange,
+    "Medium": colors.yellow,
+    "Low": colors.green,
+    "Best Practice": colors.blue,
+    "Information": colors.gray,
+}
+
+# Well-known ports grouped for the port summary; anything else is "Other".
+PORT_GROUPS = {
+    "Web": {80, 443, 8000, 8008, 8080, 8081, 8443, 8888},
+    "Remote access": {22, 23, 3389, 5900, 5901},
+    "Mail": {25, 110, 143, 465, 587, 993, 995},
+    "Database": {1433, 1521, 3306, 5432, 6379, 9200, 11211, 27017},
+    "File sharing": {20, 21, 69, 111, 135, 137, 139, 445, 2049},
+    "DNS": {53},
+}
+
+_PALETTE = [colors.HexColor(value) for value in
+            ("#2563eb", "#dc2626", "#16a34a", "#d97706", "#7c3aed", "#0891b2", "#6b7280")]
+
+
+def _title(drawing: Drawing, text: str):
+    drawing.add(String(drawing.width / 2, drawing.height - 14, text, fontName="Helvetica-Bold",
+                       fontSize=11, textAnchor="middle"))
+
+
+def _value_max(values: Iterable[float]) -> float:
+    return max([1, *values])
+
+
+def risk_breakdown_chart(risk_levels: Dict[str, int], width: float = 400, height: float = 220,
+                         title: str = "Vulnerabilities Breakdown") -> Drawing:
+    """Bar chart of issue counts per risk level, each bar in its level's color."""
+    drawing = Drawing(width, height)
+    chart = VerticalBarChart()
+    chart.x, chart.y = 40, 40
+    chart.width, chart.height = width - 60, height - 70
+    labels = list(risk_levels)
+    chart.data = [[risk_levels[label] for label in labels]]
+    chart.categoryAxis.categoryNames = labels
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = _value_max(risk_levels.values())
+    chart.valueAxis.labels.fontSize = 7
+    chart.bars.strokeWidth = 0
+    for index, label in enumerate(labels):
+        chart.bars[(0, index)].fillColor = RISK_COLORS.get(label, _PALETTE[index % len(_PALETTE)])
+    drawing.add(chart)
+    _title(drawing, title)
+    return drawing
+
+
+def group_ports(open_ports: Iterable[int]) -> Dict[str, int]:
+    counts = {group: 0 for group in PORT_GROUPS}
+    counts["Other"] = 0
+    for port in open_ports:
+        group = next((name for name, ports in PORT_GROUPS.items() if port in ports), "Other")
+        counts[group] += 1
+    return {group: count for group, count in counts.items() if count}
+
+
+def port_summary_chart(open_ports: Sequence[int], width: float = 400, height: float = 220,
+                       title: str = "Open Ports by Service") -> Drawing:
+    """Pie chart of open ports grouped by the kind of service usually behind them."""
+    drawing = Drawing(width, height)
+    groups = group_ports(open_ports)
+    if not groups:
+        drawing.add(String(width / 2, height / 2, "No open ports", fontName="Helvetica", fontSize=10,
+                           textAnchor="middle"))
+        _title(drawing, title)
+        return drawing
+    pie = Pie()
+    size = min(width, height) - 60
+    pie.x, pie.y = (width - size) / 2, 20
+    pie.width = pie.height = size
+    pie.data = list(groups.values())
+    pie.labels = [f"{group} ({count})" for group, count in groups.items()]
+    pie.slices.strokeWidth = 0.5
+    pie.slices.fontSize = 7
+    for index in range(len(pie.data)):
+        pie.slices[index].fillColor = _PALETTE[index % len(_PALETTE)]
+    drawing.add(pie)
+    _title(drawing, title)
+    return drawing
+
+
+def trend_chart(points: List[Tuple[str, Dict[str, int]]], width: float = 400, height: float = 220,
+                title: str = "Findings Over Time") -> Drawing:
+    """Line chart of several series over time; ``points`` is ``[(label, {series: value})]`` oldest first."""
+    drawing = Drawing(width, height)
+    series = list(dict.fromkeys(name for _, values in points for name in values))
+    chart = HorizontalLineChart()
+    chart.x, chart.y = 40, 40
+    chart.width, chart.height = width - 60, height - 70
+    chart.data = [[values.get(name, 0) for _, values in points] for name in series] or [[0]]
+    chart.categoryAxis.categoryNames = [label for label, _ in points] or [""]
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = _value_max(value for values in chart.data for value in values)
+    chart.valueAxis.labels.fontSize = 7
+    for index, name in enumerate(series):
+        chart.lines[index].strokeColor = RISK_COLORS.get(name, _PALETTE[index % len(_PALETTE)])
+        chart.lines[index].strokeWidth = 1.5
+    drawing.add(chart)
+    _title(drawing, title)
+    return drawing
+
+
+def to_bytes(drawing: Drawing, fmt: str = "pdf") -> bytes:
+    """Renders a chart on its own into an in-memory PDF or SVG document."""
+    if fmt == "pdf":
+        return renderPDF.drawToString(drawing)
+    if fmt == "svg":
+        return renderSVG.drawToString(drawing).encode("utf-8")
+    raise ValueError(f"Unsupported chart format '{fmt}'")
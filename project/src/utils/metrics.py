@@ -0,0 +1,184 @@
+"""In-process counters, gauges and histograms exposed in Prometheus text format.
+
+Metrics are plain Python objects updated from the event loop, so recording
+a value is a dict lookup plus an addition. ``render()`` produces the text
+served at ``GET /api/metrics``. Every process keeps its own values; scans run
+by ``src.worker`` processes are not included in the API's metrics.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Seconds; covers fast DB writes and emits up to slow stages and renders.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+REGISTRY: List["Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        REGISTRY.append(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """The series for these label values (positional, in ``labelnames`` order)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {child.value}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _render_child(self, values, child) -> List[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.buckets, "+Inf"), child.counts):
+            cumulative += count
+            bucket = f'le="{bound}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, bucket)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {child.sum}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+@contextmanager
+def track(histogram: Histogram, *labels, errors: Optional[Counter] = None, in_flight: Optional[Gauge] = None):
+    """Times the block into ``histogram``; counts exceptions in ``errors`` and the open blocks in ``in_flight``."""
+    gauge = in_flight.labels(*labels) if in_flight is not None else None
+    if gauge is not None:
+        gauge.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        if errors is not None:
+            errors.labels(*labels).inc()
+        raise
+    finally:
+        histogram.labels(*labels).observe(time.perf_counter() - started)
+        if gauge is not None:
+            gauge.dec()
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+SCAN_DURATION = Histogram("bug_gpt_scan_duration_seconds", "Wall time of whole scans.", ("status",))
+SCANS_IN_FLIGHT = Gauge("bug_gpt_scans_in_flight", "Scans currently running in this process.")
+STAGE_DURATION = Histogram("bug_gpt_stage_duration_seconds", "Wall time of scan stages.", ("stage",))
+STAGE_ERRORS = Counter("bug_gpt_stage_errors_total", "Scan stages that failed or timed out.", ("stage", "status"))
+STAGES_IN_FLIGHT = Gauge("bug_gpt_stages_in_flight", "Scan stages currently running.", ("stage",))
+DB_WRITE_DURATION = Histogram("bug_gpt_db_write_duration_seconds", "Time spent in database write transactions.",
+                              ("operation",))
+DB_WRITE_ERRORS = Counter("bug_gpt_db_write_errors_total", "Database write transactions that failed.", ("operation",))
+EMIT_DURATION = Histogram("bug_gpt_socket_emit_duration_seconds", "Time spent sending Socket.IO events.", ("event",))
+EMIT_ERRORS = Counter("bug_gpt_socket_emit_errors_total", "Socket.IO events that could not be sent.", ("event",))
+RENDER_DURATION = Histogram("bug_gpt_report_render_duration_seconds", "Time to render PDF reports.", ("kind",))
+RENDER_ERRORS = Counter("bug_gpt_report_render_errors_total", "PDF renders that failed.", ("kind",))
+RENDERS_IN_FLIGHT = Gauge("bug_gpt_report_renders_in_flight", "PDF renders currently running.", ("kind",))
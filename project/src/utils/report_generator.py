@@ -1,23 +1,23 @@
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.charts.piecharts import Pie
-from reportlab.graphics.charts.linecharts import HorizontalLineChart
-from reportlab.graphics.charts.barcharts import VerticalBarChart
-from reportlab.pdfgen import canvas
-from datetime import datetime
 import os
 import json
 
+# Bump whenever the PDF layout changes; cached reports are keyed on it.
+TEMPLATE_VERSION = "2"
+
 class ReportGenerator:
     def __init__(self, scan_results):
         self.scan_results = scan_results
 
     def generate(self, output_path):
         """Generate a simple PDF report."""
+        # reportlab is imported here so that the API can import this module
+        # for TEMPLATE_VERSION without paying for it; renders run in the CPU pool.
+        from reportlab.graphics import renderPDF
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+
+        from src.utils.charts import port_summary_chart, risk_breakdown_chart
+
         c = canvas.Canvas(output_path, pagesize=letter)
         c.setFont("Helvetica-Bold", 16)
         c.drawString(100, 750, "Security Assessment Report")
@@ -25,4 +25,33 @@ class ReportGenerator:
         c.drawString(100, 720, f"Domain: {self.scan_results.get('domain', 'N/A')}")
         c.drawString(100, 700, f"Scan ID: {self.scan_results.get('scan_id', 'N/A')}")
         c.drawString(100, 680, f"Risk Score: {self.scan_results.get('summary', {}).get('risk_score', 'N/A')}")
-        c.save()
\ No newline at end of file
+
+        results = self.scan_results.get('results', {})
+        renderPDF.draw(risk_breakdown_chart(self.severity_counts(results.get('vulnerabilities'))), c, 100, 420)
+        open_ports = results.get('open_ports')
+        renderPDF.draw(port_summary_chart(open_ports if isinstance(open_ports, list) else []), c, 100, 160)
+        c.save()
+
+    @staticmethod
+    def severity_counts(vulnerabilities):
+        """Counts findings per risk level; findings without a severity are listed as information."""
+        counts = {"Critical": 0, "High": 0, "Medium": 0, "Low": 0, "Information": 0}
+        for item in vulnerabilities if isinstance(vulnerabilities, list) else []:
+            severity = str(item.get("severity") or "") if isinstance(item, dict) else ""
+            level = severity.title() if severity.title() in counts else "Information"
+            counts[level] += 1
+        return counts
+
+def render_report(report_json: bytes, output_path: str):
+    """Renders a stored scan report to ``output_path``; runs in the CPU process pool.
+
+    The PDF is written next to its destination and moved into place, so a
+    cached file is never seen half written.
+    """
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        ReportGenerator(json.loads(report_json)).generate(temp_path)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,63 @@
+"""One JSON encoder for scan data, shared by the DB, Socket.IO and REST layers.
+
+Scan results hold dataclasses, datetimes, tuples and sets. ``dumps`` turns
+all of them into JSON in a single pass, with orjson when it is installed
+and the standard library otherwise.
+"""
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _default(obj: Any):
+    """Encodes the types neither encoder handles natively."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    return str(obj)
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Serializes ``obj`` to JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    loads = orjson.loads
+else:
+    _encoder = json.JSONEncoder(default=_default, separators=(",", ":"), ensure_ascii=False)
+
+    def dumps(obj: Any) -> bytes:
+        """Serializes ``obj`` to JSON bytes."""
+        return _encoder.encode(obj).encode("utf-8")
+
+    loads = json.loads
+
+
+def dumps_str(obj: Any) -> str:
+    """Serializes ``obj`` to a JSON string (for Text columns)."""
+    return dumps(obj).decode("utf-8")
+
+
+class SocketJSON:
+    """``json`` module replacement for python-socketio, so event payloads go through ``dumps`` too."""
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        return dumps_str(obj)
+
+    @staticmethod
+    def loads(data, **kwargs):
+        return loads(data)
@@ -0,0 +1,151 @@
+"""Standalone scan workers.
+
+Run ``python -m src.worker --processes 4`` next to the API with
+``SCAN_EXECUTION=worker``. Each process claims jobs from the scan_jobs table,
+runs them with the regular Scanner and publishes progress through the
+scan_events table, which the API process relays to Socket.IO clients. Scans
+therefore survive API restarts and spread across every core of the machine.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+
+from src.config import settings
+from src.utils.logger import logger
+
+
+async def _keep_lease(scan_id: str, worker_id: str, scan_task: asyncio.Task, lost: asyncio.Event):
+    """Renews the job lease until the scan ends; cancels the scan if the lease was lost."""
+    from src.services import job_queue
+
+    while True:
+        await asyncio.sleep(settings.worker_lease_seconds / 3)
+        try:
+            renewed = await job_queue.heartbeat(scan_id, worker_id, settings.worker_lease_seconds)
+        except Exception as e:
+            logger.warning("Heartbeat for %s failed: %s", scan_id, e)
+            continue
+        if not renewed:
+            logger.warning("Lost lease on scan %s, cancelling it", scan_id)
+            lost.set()
+            scan_task.cancel()
+            return
+
+
+async def _run_job(job, worker_id: str):
+    from src.services import job_queue
+    from src.services.scanner import Scanner
+
+    scanner = Scanner(job.domain, job.scan_id, incremental=job.incremental)
+    scan_task = asyncio.create_task(asyncio.wait_for(scanner.start(), settings.scan_timeout))
+    lost = asyncio.Event()
+    keep_lease = asyncio.create_task(_keep_lease(job.scan_id, worker_id, scan_task, lost))
+    status = "failed"
+    try:
+        await scan_task
+        status = "done"
+    except asyncio.TimeoutError:
+        await scanner.fail(f"Scan timed out after {settings.scan_timeout} seconds")
+    except asyncio.CancelledError:
+        if not lost.is_set():
+            raise
+        return  # Another worker owns the job now
+    except Exception:
+        logger.exception("Scan %s failed in worker %s", job.scan_id, worker_id)
+    finally:
+        keep_lease.cancel()
+    await job_queue.finish(job.scan_id, worker_id, status)
+
+
+async def run_worker(worker_id: str, concurrency: int):
+    """Claims and runs jobs until SIGINT/SIGTERM, then lets running scans finish."""
+    from src.database import init_db
+    from src.services import job_queue
+    from src.services.blocking_io import shutdown_executor
+    from src.services.events import use_outbox
+    from src.services.http_client import http_client
+    from src.services.status_writer import status_writer
+
+    use_outbox()
+    await init_db()
+    await http_client.start()
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    slots = asyncio.Semaphore(concurrency)
+    running = set()
+
+    def on_done(task):
+        running.discard(task)
+        slots.release()
+
+    logger.info("Worker %s started with %d scan slots", worker_id, concurrency)
+    try:
+        while not stopping.is_set():
+            await slots.acquire()
+            job = None
+            if not stopping.is_set():
+                try:
+                    job = await job_queue.claim(worker_id, settings.worker_lease_seconds, settings.worker_max_attempts)
+                except Exception:
+                    logger.exception("Worker %s failed to claim a job", worker_id)
+            if job is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(stopping.wait(), settings.worker_poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(_run_job(job, worker_id), name=f"scan:{job.scan_id}")
+            running.add(task)
+            task.add_done_callback(on_done)
+
+        logger.info("Worker %s stopping, waiting for %d running scan(s)", worker_id, len(running))
+        await asyncio.gather(*running, return_exceptions=True)
+    finally:
+        await status_writer.close()
+        await http_client.close()
+        shutdown_executor()
+
+
+def _process_main(concurrency: int):
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    asyncio.run(run_worker(worker_id, concurrency))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run BugGPT scan worker processes.")
+    parser.add_argument("--processes", type=int, default=settings.worker_processes or os.cpu_count(),
+                        help="number of worker processes (default: one per CPU core)")
+    parser.add_argument("--concurrency", type=int, default=settings.max_concurrent_scans,
+                        help="concurrent scans per process")
+    args = parser.parse_args(argv)
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_process_main, args=(args.concurrency,), name=f"scan-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()